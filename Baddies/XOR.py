@@ -5,7 +5,7 @@
 # This software comes with ABSOLUTELY NO WARRANTY.
 # See GPLv3.txt for details.
 
-import sys, os, random, math, pygame
+import sys, os, math, pygame
 
 # Add parent directory to path so can get Classes
 sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
@@ -29,6 +29,9 @@ class XOR(Baddie):
         targets
     """
 
+    # Moves with _step_movement() (see Baddie)
+    batch_movement = True
+
     def __init__(self, kwargs):
 
         images = {'neutral': 'XOR_move_00.png',
@@ -52,10 +55,20 @@ class XOR(Baddie):
         self._c_rect = self.rect.copy().inflate(-18, -18)
         self.radius = 15
 
-    # Movement characteristics
         self._speed = 1
+        self.reset(kwargs["centerx"], kwargs["centery"])
+
+
+    def reset(self, centerx, centery):
+        """
+        Reset this XOR (see Baddie.reset()).
+        """
+
+        Baddie.reset(self, centerx, centery)
+
+    # Movement characteristics
         # XOR only moves left, right, up, or down
-        self._dir = math.radians(random.randint(0, 3) * 90)
+        self._dir = math.radians(self._owner.rng.randint(0, 3) * 90)
         # When XOR hits a barrier, it stops for a bit and doesn't fire
         self._stop_timer = 0
 
@@ -91,22 +104,9 @@ class XOR(Baddie):
         if self._firing and self._box.avail_projectiles() < 4:
             self._firing = False
 
-        (dxf, dyf) = self._get_movement()
-
-        # Check for collisions with obstacles. Don't care which obstacles were
-        #   hit.
-        # dxf and dxy values passed to collision detection have the drift
-        #   between the FP center and int center added to prevent Baddies from
-        #   slowly passing through barriers
-        ddx, ddy, _, _ = self._basic_obstacle_collision(
-            dxf + self._xf - self.rect.centerx,
-            dyf + self._yf - self.rect.centery)
-
-        self._move(dxf + ddx, dyf + ddy)
-
-        # If collision detected
-        if ddx != 0 or ddy != 0:
-            self._dir = math.radians(random.randint(0, 3) * 90)
+        # Move, and bounce off any barrier hit
+        if self._step_movement():
+            self._dir = math.radians(self._owner.rng.randint(0, 3) * 90)
             self._stop_timer = 60
 
 
@@ -5,7 +5,7 @@
 # This software comes with ABSOLUTELY NO WARRANTY.
 # See GPLv3.txt for details.
 
-import sys, os, random, math, pygame
+import sys, os, math, pygame
 
 # Add parent directory to path so can get Classes
 sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
@@ -28,6 +28,9 @@ class Kreutzwald(Baddie):
         targets
     """
 
+    # Moves with _step_movement() (see Baddie)
+    batch_movement = True
+
     def __init__(self, kwargs):
 
         images = {'neutral': 'Kreutzwald_move_00.png',
@@ -49,7 +52,17 @@ class Kreutzwald(Baddie):
 
     # Movement characteristics
         self._speed = 1.0                   # Absolute speed
-        self._dir = math.radians(random.randint(0, 359))
+        self.reset(kwargs["centerx"], kwargs["centery"])
+
+
+    def reset(self, centerx, centery):
+        """
+        Reset this Kreutzwald (see Baddie.reset()).
+        """
+
+        Baddie.reset(self, centerx, centery)
+
+        self._dir = math.radians(self._owner.rng.randint(0, 359))
                                             # Direction of movement (degrees)
 
     def update(self):
@@ -63,21 +76,7 @@ class Kreutzwald(Baddie):
         if not self.active:
             return
 
-        (dxf, dyf) = self._get_movement()
-
-
-        # Check for collisions with obstacles. Don't care which obstacles were
-        #   hit.
-        # dxf and dxy values passed to collision detection have the drift
-        #   between the FP center and int center added to prevent Baddies from
-        #   slowly passing through barriers
-        ddx, ddy, _, _ = self._basic_obstacle_collision(
-            dxf + self._xf - self.rect.centerx,
-            dyf + self._yf - self.rect.centery)
-
-        self._move(dxf + ddx, dyf + ddy)
-
-        # If collision detected
-        if ddx != 0 or ddy != 0:
-            self._dir = math.radians(random.randint(0, 359))
+        # Move, and bounce off any barrier hit
+        if self._step_movement():
+            self._dir = math.radians(self._owner.rng.randint(0, 359))
 
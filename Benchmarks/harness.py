@@ -0,0 +1,155 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+"""
+Helpers shared by the benchmark scripts.
+
+Benchmarks run the game's classes directly, without projectile-game.py, on
+SDL's dummy video driver (images still need a display surface to be
+converted to).
+"""
+
+import sys, os, time, json, platform, pygame
+
+# Add parent directory to path so can get Classes
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.heart import Heart
+from Classes.projectileEngine import ProjectileEngine
+from Classes.eventLog import event_log, OFF
+
+def init_pygame():
+    """
+    Start pygame without a window. Returns the (invisible) screen.
+
+    The game's event log is turned off, so logging isn't timed.
+    """
+
+    event_log.level = OFF
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    pygame.init()
+    return pygame.display.set_mode((640, 480))
+
+
+def make_level(level_class, baddie_classes, player_class, seed=0,
+        power_ups=None):
+    """
+    Set up a Level the way projectile-game.py does, with a player in it.
+
+    baddie_classes is a dictionary of Baddie classes by name. power_ups is
+    passed to the Level. The Level's rng is seeded with seed.
+    """
+
+    player_projectile_group = ProjectileEngine()
+    decoration_list = []
+
+    a_level = level_class(baddie_classes, power_ups, player_projectile_group,
+                          decoration_list)
+    a_level.rng.seed(seed)
+
+    p_kwargs = {"owner"             : a_level,
+                "centerx"           : a_level.player_spawn_x,
+                "centery"           : a_level.player_spawn_y,
+                "floors"            : a_level.floors,
+                "l_walls"           : a_level.l_walls,
+                "r_walls"           : a_level.r_walls,
+                "ceilings"          : a_level.ceilings,
+                "barrier_index"     : a_level.barrier_index(),
+                "targets"           : a_level.baddies,
+                "fired_projectiles" : player_projectile_group,
+                "projectile_pools"  : a_level.projectile_pools,
+                "decoration_list"   : decoration_list}
+    a_level.set_player(player_class(p_kwargs))
+
+    return a_level
+
+
+def game_power_ups(projectile_classes, player_classes=()):
+    """
+    Power-ups dictionary like the one projectile-game.py gives a Level.
+    """
+
+    return {'players': list(player_classes),
+            'projectiles': list(projectile_classes),
+            'health': [Heart]}
+
+
+def measure(fn, number, repeat=5, setup=None):
+    """
+    Time fn().
+
+    fn is called number times in a row, repeat times. setup() (if given) is
+    called before each repeat and isn't timed.
+
+    Returns a dictionary with the number of calls and the best and mean time
+    per call in seconds. The best time is the one to compare; the others are
+    mostly noise from the rest of the machine.
+    """
+
+    times = []
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for j in range(number):
+            fn()
+        times.append((time.perf_counter() - start) / number)
+
+    return {"calls": number * repeat,
+            "best": min(times),
+            "mean": sum(times) / len(times)}
+
+
+def result_key(result):
+    """
+    Key that identifies the same benchmark across runs.
+    """
+
+    return (result["name"], json.dumps(result["params"], sort_keys=True))
+
+
+def describe(result):
+    """
+    Benchmark name and parameters as one string.
+    """
+
+    params = ["{}={}".format(k, result["params"][k])
+              for k in sorted(result["params"])]
+    if len(params) == 0:
+        return result["name"]
+    return result["name"] + "[" + ",".join(params) + "]"
+
+
+def write_results(path, suite, results):
+    """
+    Write results to path as JSON, along with what they were run on.
+    """
+
+    data = {"suite": suite,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "machine": platform.platform(),
+            "results": results}
+
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+
+def load_results(path):
+    """
+    Read results written by write_results(). Returns {result_key: result}.
+    """
+
+    with open(path) as f:
+        data = json.load(f)
+
+    return {result_key(r): r for r in data["results"]}
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run micro.py")
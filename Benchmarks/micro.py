@@ -0,0 +1,364 @@
+#! /usr/bin/env python3
+
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+"""
+Microbenchmarks of the simulation's hot paths.
+
+Each benchmark times one thing in isolation, on the game's real levels and
+classes. Run before and after changing the engine:
+
+    $> python3 Benchmarks/micro.py -o before.json
+    ...
+    $> python3 Benchmarks/micro.py -o after.json --compare before.json
+
+Everything random comes from fixed seeds, so two runs do the same work.
+"""
+
+import sys, os, random, pygame
+from optparse import OptionParser
+
+# Add parent directory to path so can get Classes
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Benchmarks.harness import init_pygame, make_level, game_power_ups, \
+                               measure, describe, result_key, \
+                               write_results, load_results
+from Classes.projectileBox import ProjectileBox
+from Classes.projectileEngine import ProjectileEngine
+from Classes.baddieBatch import BaddieBatch
+from Classes.inputSource import ScriptedInput, InputState
+from Levels.zero import Zero
+from Levels.bigRock import BigRock
+from Baddies.XOR import XOR
+from Baddies.kreutzwald import Kreutzwald
+from Characters.fred import Fred
+from Characters.ilmar import Ilmar
+from Projectiles.bb import BB
+from Projectiles.slug import Slug
+from Projectiles.blaster import Blaster
+
+LEVELS = {"Zero": Zero, "BigRock": BigRock}
+BADDIES = {"XOR": XOR, "Kreutzwald": Kreutzwald}
+
+# Input for the full-tick benchmark: run around, jump, and keep firing
+N = InputState.NONE
+TICK_SCRIPT = [(40, N._replace(right=True)), (1, N._replace(fire=True)),
+               (30, N._replace(left=True, jump=True)),
+               (1, N._replace(fire=True, up=True)),
+               (20, N._replace(left=True)), (1, N._replace(fire=True))]
+
+
+def bench_collision(level_name, scale, seed):
+    """
+    PSprite._basic_obstacle_collision() on a level's barriers.
+
+    A player-sized collision box is moved to random places and collided with
+    random moves of up to 8 pixels in each direction.
+    """
+
+    a_level = make_level(LEVELS[level_name], {}, Fred, seed)
+    sprite = a_level.player
+
+    rng = random.Random(seed)
+    cases = []
+    for i in range(1000):
+        cases.append((rng.randint(-20, 640), rng.randint(-30, 480),
+                      rng.randint(-8, 8), rng.randint(-8, 8)))
+    cases = iter(cases * (scale * 5 + 1))
+    c_rect = sprite._c_rect
+    c_rect.size = (20, 30)
+
+    def collide():
+        x, y, dx, dy = next(cases)
+        c_rect.topleft = (x, y)
+        sprite._basic_obstacle_collision(dx, dy)
+
+    return measure(collide, 1000 * scale, 5)
+
+
+def bench_projectile_update(n, t, engine, scale, seed):
+    """
+    One update() of n in-flight Projectiles with t possible targets.
+
+    Before each repeat, t XORs are spawned at random places in Zero and n
+    BBs are fired from random places in random directions. Projectiles that
+    hit things are recycled like in the game, so fewer than n are left in
+    flight by the end of a repeat; in_flight is the average.
+
+    If engine is True, the Projectiles are in a ProjectileEngine (which
+    might still decide not to use NumPy), otherwise in a plain Group.
+    """
+
+    a_level = make_level(Zero, {"XOR": XOR}, Fred, seed)
+    if engine:
+        fired = ProjectileEngine()
+    else:
+        fired = pygame.sprite.RenderUpdates()
+    box = ProjectileBox({"owner"             : a_level.player,
+                         "projectile_class"  : BB,
+                         "max_in_flight"     : n,
+                         "floors"            : a_level.floors,
+                         "l_walls"           : a_level.l_walls,
+                         "r_walls"           : a_level.r_walls,
+                         "ceilings"          : a_level.ceilings,
+                         "barrier_index"     : a_level.barrier_index(),
+                         "targets"           : a_level.baddies,
+                         "fired_projectiles" : fired,
+                         "decoration_list"   : None,
+                         "centerx"           : 0,
+                         "centery"           : 0})
+
+    steps = 8
+    in_flight = []
+
+    def setup():
+        a_level.rng.seed(seed)
+        rng = random.Random(seed)
+        a_level.baddies.empty()
+        for i in range(t):
+            a_level._spawn_random_baddie(rng.randint(40, 600),
+                                         rng.randint(40, 440))
+        for pr in fired.sprites():
+            box.recycle(pr)
+        for pr in box.fire(box.avail_projectiles()):
+            pr.reset(rng.randint(10, 630), rng.randint(10, 470),
+                     rng.randint(0, 3) * 90)
+
+    def update():
+        in_flight.append(len(fired))
+        fired.update()
+
+    result = measure(update, steps, 10 * scale, setup)
+    result["in_flight"] = sum(in_flight) / len(in_flight)
+    return result
+
+
+def bench_baddie_update(n, batch, scale, seed):
+    """
+    One update() of n Kreutzwalds bouncing around Zero.
+
+    Before each repeat, the Kreutzwalds are spawned at random places. If
+    batch is True, their movement is worked out by a BaddieBatch (however
+    few there are), otherwise each Kreutzwald moves itself.
+    """
+
+    a_level = make_level(Zero, {"Kreutzwald": Kreutzwald}, Fred, seed)
+    baddie_batch = BaddieBatch(a_level.barrier_index(), 1 if batch else n + 1)
+
+    def setup():
+        a_level.rng.seed(seed)
+        rng = random.Random(seed)
+        a_level.baddies.empty()
+        for i in range(n):
+            a_level._spawn_random_baddie(rng.randint(40, 600),
+                                         rng.randint(40, 440))
+
+    def update():
+        baddie_batch.prepare(a_level.baddies)
+        a_level.baddies.update()
+        baddie_batch.finish()
+
+    return measure(update, 20, 5 * scale, setup)
+
+
+def bench_box_cycle(scale, seed):
+    """
+    ProjectileBox.fire() of one Projectile, reset(), and hit_a_target().
+    """
+
+    a_level = make_level(Zero, {}, Fred, seed)
+    box = ProjectileBox({"owner"             : a_level.player,
+                         "projectile_class"  : BB,
+                         "max_in_flight"     : 10,
+                         "floors"            : a_level.floors,
+                         "l_walls"           : a_level.l_walls,
+                         "r_walls"           : a_level.r_walls,
+                         "ceilings"          : a_level.ceilings,
+                         "barrier_index"     : a_level.barrier_index(),
+                         "targets"           : a_level.baddies,
+                         "fired_projectiles" : pygame.sprite.RenderUpdates(),
+                         "decoration_list"   : None,
+                         "centerx"           : 0,
+                         "centery"           : 0})
+
+    def cycle():
+        pr = box.fire(1)[0]
+        pr.reset(320, 240, 0)
+        box.hit_a_target(pr, None)
+
+    return measure(cycle, 1000 * scale, 5)
+
+
+def bench_spawn(baddie_name, scale, seed):
+    """
+    Level._spawn_random_baddie() with only one kind of Baddie available.
+    """
+
+    a_level = make_level(Zero, {baddie_name: BADDIES[baddie_name]}, Fred,
+                         seed)
+
+    def setup():
+        a_level.baddies.empty()
+        a_level.baddie_projectiles.empty()
+
+    def spawn():
+        a_level._spawn_random_baddie(160, 128)
+
+    return measure(spawn, 20 * scale, 5, setup)
+
+
+def bench_respawn(baddie_name, scale, seed):
+    """
+    Level._spawn_random_baddie() of a Baddie that has gone before, i.e., one
+    reused from the Level's pool.
+    """
+
+    a_level = make_level(Zero, {baddie_name: BADDIES[baddie_name]}, Fred,
+                         seed)
+    a_level._spawn_random_baddie(160, 128)
+    a_level.baddie_gone(a_level.baddies.sprites()[0])
+
+    def respawn():
+        a_level._spawn_random_baddie(160, 128)
+        a_level.baddie_gone(a_level.baddies.sprites()[0])
+
+    return measure(respawn, 20 * scale, 5)
+
+
+def bench_level_tick(level_name, scale, seed):
+    """
+    One full update() of a level with the game's usual assets.
+
+    The player runs around firing (see TICK_SCRIPT). Each repeat starts a
+    fresh level and lets it run 300 frames (untimed) so baddies are in play.
+    """
+
+    power_ups = game_power_ups([BB, Blaster, Slug], [Ilmar])
+    holder = []
+
+    def setup():
+        a_level = make_level(LEVELS[level_name], dict(BADDIES), Fred, seed,
+                             power_ups)
+        a_level.set_input(ScriptedInput(TICK_SCRIPT, repeat=True))
+        for i in range(300):
+            tick(a_level)
+        holder[:] = [a_level]
+
+    def tick(a_level):
+        a_level.input.next_frame()
+        a_level.update()
+
+    return measure(lambda: tick(holder[0]), 300 * scale, 3, setup)
+
+
+def all_benchmarks():
+    """
+    List of (name, params, function(scale, seed)) for every benchmark.
+    """
+
+    benches = []
+    for level in sorted(LEVELS):
+        benches.append(("collision", {"level": level},
+            lambda scale, seed, level=level:
+                bench_collision(level, scale, seed)))
+    for n in (10, 20, 40, 100, 400):
+        for t in (5, 50):
+            benches.append(("projectile_update", {"n": n, "t": t},
+                lambda scale, seed, n=n, t=t:
+                    bench_projectile_update(n, t, False, scale, seed)))
+            benches.append(("projectile_engine", {"n": n, "t": t},
+                lambda scale, seed, n=n, t=t:
+                    bench_projectile_update(n, t, True, scale, seed)))
+    for n in (20, 100, 400):
+        benches.append(("baddie_update", {"n": n},
+            lambda scale, seed, n=n:
+                bench_baddie_update(n, False, scale, seed)))
+        benches.append(("baddie_batch", {"n": n},
+            lambda scale, seed, n=n:
+                bench_baddie_update(n, True, scale, seed)))
+    benches.append(("box_cycle", {}, bench_box_cycle))
+    for baddie in sorted(BADDIES):
+        benches.append(("spawn", {"baddie": baddie},
+            lambda scale, seed, baddie=baddie:
+                bench_spawn(baddie, scale, seed)))
+        benches.append(("respawn", {"baddie": baddie},
+            lambda scale, seed, baddie=baddie:
+                bench_respawn(baddie, scale, seed)))
+    for level in sorted(LEVELS):
+        benches.append(("level_tick", {"level": level},
+            lambda scale, seed, level=level:
+                bench_level_tick(level, scale, seed)))
+
+    return benches
+
+
+def main():
+    OPT = get_options()
+
+    init_pygame()
+
+    baseline = {}
+    if OPT.compare is not None:
+        baseline = load_results(OPT.compare)
+
+    results = []
+    for name, params, fn in all_benchmarks():
+        if len(OPT.bench) > 0 and name not in OPT.bench:
+            continue
+        result = fn(OPT.scale, OPT.seed)
+        result["name"] = name
+        result["params"] = params
+        results.append(result)
+
+        line = "{:36} {:12.2f} us".format(describe(result),
+                                          result["best"] * 1e6)
+        old = baseline.get(result_key(result))
+        if old is not None:
+            line += "  {:6.2f}x".format(old["best"] / result["best"])
+        print(line)
+
+    if OPT.output is not None:
+        write_results(OPT.output, "micro", results)
+
+
+def get_options():
+    """
+    Parse command line options.
+    """
+
+    parser = OptionParser(description="Time the game's hot paths. Times "
+        "are the best time per call.")
+
+    parser.add_option("-o", "--output", action="store", type="string",
+        dest="output", default=None, help="Write results to a JSON file")
+
+    parser.add_option("-b", "--bench", action="append", type="string",
+        dest="bench", default=[],
+        help="Only run benchmarks with this name (can be repeated)")
+
+    parser.add_option("--compare", action="store", type="string",
+        dest="compare", default=None,
+        help="Show speedup over results in a JSON file from --output")
+
+    parser.add_option("--scale", action="store", type="int", dest="scale",
+        default=1, help="Multiply the amount of work done (default: 1)")
+
+    parser.add_option("--seed", action="store", type="int", dest="seed",
+        default=0, help="Seed for random numbers (default: 0)")
+
+    (OPT, _) = parser.parse_args()
+
+    if OPT.scale < 1:
+        parser.error("--scale must be at least 1")
+
+    return OPT
+
+
+if __name__ == '__main__':
+    main()
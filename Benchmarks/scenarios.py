@@ -0,0 +1,250 @@
+#! /usr/bin/env python3
+
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+"""
+Stress benchmarks: whole games with far more going on than usual.
+
+A CountdownLevel normally has at most 5-10 baddies, which hides how the
+engine scales. Each scenario sets up a Level directly with a lot of
+something, runs it headless for a fixed number of frames, and reports
+frames per second, the peak number of sprites, and time per phase of a
+frame (see FrameProfiler).
+
+    $> python3 Benchmarks/scenarios.py -o before.json
+    $> python3 Benchmarks/scenarios.py --compare before.json
+"""
+
+import sys, os, time, collections, pygame
+from optparse import OptionParser
+
+# Add parent directory to path so can get Classes
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Benchmarks.harness import init_pygame, make_level, game_power_ups, \
+                               result_key, write_results, load_results
+from Classes.projectileBox import ProjectileBox
+from Classes.frameProfiler import FrameProfiler
+from Classes.inputSource import ScriptedInput, InputState
+from Levels.zero import Zero
+from Levels.bigRock import BigRock
+from Baddies.XOR import XOR
+from Baddies.kreutzwald import Kreutzwald
+from Characters.fred import Fred
+from Characters.ilmar import Ilmar
+from Projectiles.blaster import Blaster
+
+# level, player: Level and Player classes
+# baddie, count: The level keeps count Baddies of class baddie in play
+# box: Projectile class the player fires (with unlimited ammo), or None to
+#      keep the player's own
+# script: ScriptedInput script for the player (repeated)
+# frames: How many frames to run
+Scenario = collections.namedtuple("Scenario", ["description", "level",
+    "player", "baddie", "count", "box", "script", "frames"])
+
+N = InputState.NONE
+
+SCENARIOS = collections.OrderedDict([
+    ("xor_swarm", Scenario(
+        "10 XORs firing continuously in BigRock",
+        # Ilmar isn't hurt by Projectiles, so the game doesn't end early
+        BigRock, Ilmar, XOR, 10, None, [(1, N)], 1200)),
+    ("kreutzwald_crowd", Scenario(
+        "50 Kreutzwalds bouncing around Zero",
+        Zero, Fred, Kreutzwald, 50, None, [(1, N)], 1200)),
+    ("blaster_hold_fire", Scenario(
+        "A Blaster player running back and forth firing as fast as it can",
+        Zero, Fred, Kreutzwald, 10, Blaster,
+        [(1, N._replace(right=True, fire=True)), (1, N._replace(right=True))]
+            * 20 +
+        [(1, N._replace(left=True, fire=True)), (1, N._replace(left=True))]
+            * 20,
+        1200)),
+])
+
+
+def setup_scenario(scenario, seed):
+    """
+    Make the Level for a Scenario.
+    """
+
+    a_level = make_level(scenario.level, {scenario.baddie.__name__:
+                                          scenario.baddie},
+                         scenario.player, seed, game_power_ups([]))
+
+    # Keep the level full of baddies (the level replaces any that die)
+    a_level._max_baddies = scenario.count
+    for i in range(scenario.count):
+        a_level._spawn_random_baddie(a_level._baddie_spawn_x,
+                                     a_level._baddie_spawn_y)
+    a_level._baddie_timer = 0
+
+    if scenario.box is not None:
+        box = ProjectileBox({"owner"             : a_level.player,
+                             "projectile_class"  : scenario.box,
+                             "max_in_flight"     : 4,
+                             "max_shots"         : -1,
+                             "floors"            : a_level.floors,
+                             "l_walls"           : a_level.l_walls,
+                             "r_walls"           : a_level.r_walls,
+                             "ceilings"          : a_level.ceilings,
+                             "barrier_index"     : a_level.barrier_index(),
+                             "targets"           : a_level.baddies,
+                             "fired_projectiles" :
+                                a_level._player_projectile_group,
+                             "decoration_list"   : None,
+                             "centerx"           : 0,
+                             "centery"           : 0})
+        a_level.player.push_box(box)
+
+    a_level.set_input(ScriptedInput(scenario.script, repeat=True))
+
+    return a_level
+
+
+def run_scenario(scenario, seed, frames, screen=None):
+    """
+    Run a Scenario for frames frames (or until game over).
+
+    If screen is given, the Level is also cleared and drawn every frame.
+    """
+
+    a_level = setup_scenario(scenario, seed)
+    prof = FrameProfiler(window=frames)
+    a_level.profiler = prof
+    player_projectiles = a_level._player_projectile_group
+
+    peak = {"baddies": 0, "baddie_projectiles": 0, "player_projectiles": 0,
+            "sprites": 0}
+
+    if screen is not None:
+        screen.blit(a_level.backdrop, (0, 0))
+
+    n = 0
+    start = time.perf_counter()
+    while n < frames and not a_level.dead:
+        prof.begin_frame()
+        a_level.input.next_frame()
+        prof.lap("events")
+        if screen is not None:
+            a_level.clear(screen)
+            prof.lap("clear")
+        a_level.update()
+        prof.lap("level")
+        if screen is not None:
+            a_level.draw(screen)
+            prof.lap("draw")
+        prof.end_frame()
+        n += 1
+
+        counts = (len(a_level.baddies), len(a_level.baddie_projectiles),
+                  len(player_projectiles))
+        peak["baddies"] = max(peak["baddies"], counts[0])
+        peak["baddie_projectiles"] = max(peak["baddie_projectiles"],
+                                         counts[1])
+        peak["player_projectiles"] = max(peak["player_projectiles"],
+                                         counts[2])
+        peak["sprites"] = max(peak["sprites"], sum(counts) + 1)
+    elapsed = time.perf_counter() - start
+
+    return {"frames": n,
+            "seconds": elapsed,
+            "fps": n / elapsed,
+            "peak": peak,
+            "phases": prof.summary()}
+
+
+def main():
+    OPT = get_options()
+
+    if OPT.list:
+        for name, scenario in SCENARIOS.items():
+            print("{:20} {}".format(name, scenario.description))
+        return
+
+    screen = init_pygame()
+    if not OPT.draw:
+        screen = None
+
+    baseline = {}
+    if OPT.compare is not None:
+        baseline = load_results(OPT.compare)
+
+    results = []
+    for name, scenario in SCENARIOS.items():
+        if len(OPT.scenario) > 0 and name not in OPT.scenario:
+            continue
+        frames = scenario.frames if OPT.frames is None else OPT.frames
+        result = run_scenario(scenario, OPT.seed, frames, screen)
+        result["name"] = name
+        result["params"] = {"frames": frames, "draw": OPT.draw}
+        results.append(result)
+
+        line = "{:20} {:9.1f} fps".format(name, result["fps"])
+        old = baseline.get(result_key(result))
+        if old is not None:
+            line += "  {:6.2f}x".format(result["fps"] / old["fps"])
+        print(line)
+        if result["frames"] < frames:
+            print("    game over after", result["frames"], "frames")
+        print("    peak: " + ", ".join("{} {}".format(k, v)
+                                       for k, v in result["peak"].items()))
+        for phase, stats in result["phases"].items():
+            print("    {:20} mean {:9.1f} us  p99 {:9.1f} us".format(
+                phase, stats["mean"] * 1e6, stats["p99"] * 1e6))
+
+    if OPT.output is not None:
+        write_results(OPT.output, "scenarios", results)
+
+
+def get_options():
+    """
+    Parse command line options.
+    """
+
+    parser = OptionParser(description="Run headless stress scenarios.")
+
+    parser.add_option("-o", "--output", action="store", type="string",
+        dest="output", default=None, help="Write results to a JSON file")
+
+    parser.add_option("-s", "--scenario", action="append", type="string",
+        dest="scenario", default=[],
+        help="Only run this scenario (can be repeated)")
+
+    parser.add_option("-l", "--list", action="store_true", dest="list",
+        default=False, help="List the scenarios and exit")
+
+    parser.add_option("--compare", action="store", type="string",
+        dest="compare", default=None,
+        help="Show speedup over results in a JSON file from --output")
+
+    parser.add_option("--frames", action="store", type="int", dest="frames",
+        default=None, help="Run this many frames instead of each "
+                           "scenario's default")
+
+    parser.add_option("--draw", action="store_true", dest="draw",
+        default=False, help="Also clear and draw every frame")
+
+    parser.add_option("--seed", action="store", type="int", dest="seed",
+        default=0, help="Seed for random numbers (default: 0)")
+
+    (OPT, _) = parser.parse_args()
+
+    for name in OPT.scenario:
+        if name not in SCENARIOS:
+            parser.error("Unknown scenario " + name)
+
+    if OPT.frames is not None and OPT.frames < 1:
+        parser.error("--frames must be at least 1")
+
+    return OPT
+
+
+if __name__ == '__main__':
+    main()
@@ -5,12 +5,13 @@
 # This software comes with ABSOLUTELY NO WARRANTY.
 # See GPLv3.txt for details.
 
-import sys, os, random
+import sys, os
 
 # Add parent directory to path so can get Classes
 sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
 
 from Classes.player import Player
+from Classes.eventLog import event_log, INFO
 from Projectiles.slug import Slug
 
 class Ilmar(Player):
@@ -75,11 +76,11 @@ class Ilmar(Player):
         slugs = self._box.fire(1)
 
         # Ilmar sometimes blows up
-        if random.randint(0, 9) == 0:
+        if self._owner.rng.randint(0, 9) == 0:
             self.hp = 0
             for slug in slugs:
                 self._box.recycle(slug)
-            print("Projectile backfired")
+            event_log.log(INFO, "backfired", type(self).__name__)
             return
 
         direction = 0
@@ -0,0 +1,85 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+class FrameClock():
+    """
+    Counts frames for all animations.
+
+    Level.update() calls tick() once per frame, and each new Level resets
+    the clock to frame 0. Animated sprites remember the frame their current
+    animation started on, rather than each keeping a counter of its own.
+    """
+
+    def __init__(self):
+
+        self.frame = 0
+
+
+    def tick(self):
+        """
+        Move on to the next frame.
+        """
+
+        self.frame += 1
+
+
+    def reset(self):
+        """
+        Go back to frame 0 (for a new game).
+        """
+
+        self.frame = 0
+
+
+# The clock shared by everything in the game
+frame_clock = FrameClock()
+
+
+class Animation():
+    """
+    A sprite class's images, compiled into flat tables of frames.
+
+    Each state (e.g., "walking left, looking up") has an integer id and a
+    table with one entry per frame of the animation (each image repeated
+    fpi times), so picking the image for a frame is one index into a tuple.
+    A looping state starts over at the end of its table; one that doesn't
+    loop stays on its last image.
+
+    @param images: The class's tree of images (see PSprite), kept so images
+                   can still be looked up by name
+    @param series: List of (list of images, loops) by state id
+    @param fpi: Frames per image
+    """
+
+    def __init__(self, images, series, fpi):
+
+        self.images = images
+        self._frames = []
+        self._loops = []
+        for imgs, loops in series:
+            self._frames.append(tuple(img for img in imgs
+                                      for i in range(fpi)))
+            self._loops.append(loops)
+
+
+    def image(self, state, start):
+        """
+        Get the image of state for the current frame, if the state started
+        on frame start (see frame_clock).
+        """
+
+        frames = self._frames[state]
+        t = frame_clock.frame - start
+        if self._loops[state]:
+            return frames[t % len(frames)]
+        if t < len(frames):
+            return frames[t]
+        return frames[-1]
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -0,0 +1,245 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import sys, os, ast, json, importlib
+from collections.abc import MutableMapping
+
+class AssetManifest():
+    """
+    Finds the classes in a directory of asset modules (Characters/, Baddies/,
+    etc.) without importing the modules.
+
+    Each module is read with ast to get the names of its classes and of their
+    base classes. What was found is kept in a manifest in the directory's
+    __pycache__, with each module's mtime and size, so a module is only read
+    again when it changes.
+
+    A class is taken to be a subclass of base if one of its bases is called
+    base.__name__ (or the name of a subclass of base that's already been
+    imported), or is a class in the same directory that is. This is the same
+    as importing the modules and testing with issubclass() as long as asset
+    modules don't give their classes' bases other names. It's checked when
+    the class is imported.
+
+    @param game_dir: Directory that asset directories are in
+    """
+
+    # Bump when the manifest format changes
+    version = 1
+
+    def __init__(self, game_dir):
+
+        self.game_dir = game_dir
+
+
+    def find(self, directory, base):
+        """
+        Get the subclasses of base in directory (not including base itself).
+
+        Returns an AssetClasses of class name -> class, where each class is
+        only imported when it's looked up.
+        """
+
+        path = os.path.join(self.game_dir, directory)
+        modules = self._read_manifest(path)
+        changed = False
+
+        found = {}
+        for f in sorted(os.listdir(path)):
+            if not f.endswith(".py"):
+                continue
+            stat = os.stat(os.path.join(path, f))
+            entry = modules.get(f)
+            if entry is None or entry["mtime"] != stat.st_mtime_ns or \
+                    entry["size"] != stat.st_size:
+                entry = {"mtime"   : stat.st_mtime_ns,
+                         "size"    : stat.st_size,
+                         "classes" : self._scan(os.path.join(path, f))}
+                modules[f] = entry
+                changed = True
+            found[f] = entry
+
+        for f in list(modules):
+            if f not in found:
+                del modules[f]
+                changed = True
+
+        if changed:
+            self._write_manifest(path, modules)
+
+    # Work out which classes descend from base, following bases by name
+        bases = {}
+        module_of = {}
+        for f, entry in found.items():
+            for name, base_names in entry["classes"]:
+                bases[name] = base_names
+                module_of[name] = directory + "." + f[:-len(".py")]
+
+        known = set(c.__name__ for c in self._imported_subclasses(base))
+        known.add(base.__name__)
+        while True:
+            more = set(name for name, base_names in bases.items()
+                       if name not in known and known.intersection(base_names))
+            if len(more) == 0:
+                break
+            known |= more
+
+        return AssetClasses(base, dict((name, module_of[name])
+                                       for name in bases
+                                       if name in known and
+                                       name != base.__name__))
+
+
+    @staticmethod
+    def _scan(filename):
+        """
+        Get [class name, [base names]] for each class defined at the top level
+        of a module.
+        """
+
+        with open(filename, "rb") as f:
+            tree = ast.parse(f.read(), filename)
+
+        classes = []
+        for node in tree.body:
+            if not isinstance(node, ast.ClassDef):
+                continue
+            base_names = []
+            for b in node.bases:
+                if isinstance(b, ast.Name):
+                    base_names.append(b.id)
+                elif isinstance(b, ast.Attribute):
+                    base_names.append(b.attr)
+            classes.append([node.name, base_names])
+
+        return classes
+
+
+    @staticmethod
+    def _imported_subclasses(base):
+        """
+        Get all subclasses of base that have already been imported.
+        """
+
+        found = []
+        todo = list(base.__subclasses__())
+        while len(todo) > 0:
+            cls = todo.pop()
+            found.append(cls)
+            todo.extend(cls.__subclasses__())
+
+        return found
+
+
+    def _read_manifest(self, path):
+        """
+        Get the modules in the manifest of directory path ({} if there's no
+        usable manifest).
+        """
+
+        try:
+            with open(os.path.join(path, "__pycache__", "manifest.json")) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(manifest, dict) or \
+                manifest.get("version") != self.version:
+            return {}
+
+        return manifest["modules"]
+
+
+    def _write_manifest(self, path, modules):
+        """
+        Save the manifest of directory path. Not being able to is fine; the
+        modules will just be read again next time.
+        """
+
+        cache_dir = os.path.join(path, "__pycache__")
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(os.path.join(cache_dir, "manifest.json"), "w") as f:
+                json.dump({"version": self.version, "modules": modules}, f,
+                          indent=1, sort_keys=True)
+        except OSError:
+            pass
+
+
+class AssetClasses(MutableMapping):
+    """
+    Dictionary of class name -> class that imports each class the first time
+    it's looked up (see AssetManifest.find()).
+
+    Listing, counting, and removing classes doesn't import anything.
+
+    Asset modules add the game directory to sys.path when they're imported
+    (so they can find Classes/), but it's already there; the copies they add
+    are taken out again so sys.path doesn't grow with every asset.
+
+    @param base: Base class of the classes
+    @param modules: Dictionary of class name -> name of the module it's in
+    """
+
+    def __init__(self, base, modules):
+
+        self._base = base
+        # Class name -> class, or name of module still to be imported
+        self._classes = dict(modules)
+
+
+    def __getitem__(self, name):
+
+        cls = self._classes[name]
+        if isinstance(cls, str):
+            cls = getattr(self._import(cls), name)
+            if not isinstance(cls, type) or not issubclass(cls, self._base):
+                raise TypeError("{} is not a subclass of {}".format(
+                    name, self._base.__name__))
+            self._classes[name] = cls
+        return cls
+
+
+    def __setitem__(self, name, cls):
+
+        self._classes[name] = cls
+
+
+    def __delitem__(self, name):
+
+        del self._classes[name]
+
+
+    def __iter__(self):
+
+        return iter(self._classes)
+
+
+    def __len__(self):
+
+        return len(self._classes)
+
+
+    @staticmethod
+    def _import(module_name):
+        """
+        Import a module, without letting it add duplicates to sys.path.
+        """
+
+        path = list(sys.path)
+        module = importlib.import_module(module_name)
+        added = []
+        for p in sys.path[len(path):]:
+            if p not in path and p not in added:
+                added.append(p)
+        sys.path[:] = path + added
+
+        return module
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -41,13 +41,26 @@ class Baddie(Character):
                  Baddie might hit
         points: Point value of hitting this Baddie
         ... and whatever is required by Character
+
+    kwargs can contain:
+        projectile_pools: Passed on to the Baddie's ProjectileBox
+
+    class variables:
+        batch_movement: True if the Baddie only moves with _step_movement()
+                        (and doesn't override _get_movement()), so the Level
+                        can work out its movement along with the other
+                        Baddies' (see BaddieBatch)
     """
 
+    batch_movement = False
+
     def __init__(self, kwargs):
 
         Character.__init__(self, kwargs)
 
-        self._populate_images()
+        self._fpi = kwargs["fpi"]
+        self._compile_animation(self._fpi)
+        self.image = self._images['neutral']
 
         self.points = kwargs["points"]
 
@@ -60,13 +73,11 @@ class Baddie(Character):
         # Useful for Baddies that just float and bounce around
         self._speed = 1.0
         self._dir = 0.0
+        # (xf, yf, hit) worked out for this frame by the Level's BaddieBatch,
+        #   or None
+        self._batched_move = None
 
-    # Animation-related variables
-        # TODO: Move animation cycling to PSprite?
-        self._walk_ctr = 0
-        self._fpi = kwargs["fpi"]
-        self._prev_image_series = "none"
-
+    # Getting hit and dying
         # Whether to draw hit decoration
         self._hit_counter = 0
 
@@ -86,6 +97,7 @@ class Baddie(Character):
                     "l_walls"           : kwargs["l_walls"],
                     "r_walls"           : kwargs["r_walls"],
                     "ceilings"          : kwargs["ceilings"],
+                    "barrier_index"     : self._barrier_index,
                     "projectile_class"  : kwargs["projectile_class"],
                     "fired_projectiles" : kwargs["fired_projectiles"],
                     "max_in_flight"     : kwargs["max_in_flight"],
@@ -94,6 +106,8 @@ class Baddie(Character):
                     "centerx"           : 0,
                     "centery"           : 0,
                     "decoration_list"   : kwargs["decoration_list"]}
+        if "projectile_pools" in kwargs:
+            b_kwargs["projectile_pools"] = kwargs["projectile_pools"]
         self._box = ProjectileBox(b_kwargs)
 
     # Decorations
@@ -123,6 +137,36 @@ class Baddie(Character):
         self._update_image()
 
 
+    def reset(self, centerx, centery):
+        """
+        Bring a Baddie that has gone (see Level.baddie_gone()) back to life
+        at (centerx, centery), as if it had just been made.
+
+        Subclasses with their own state should override this (and call it).
+        The Baddie's Projectiles should all be back in its box first (see
+        ProjectileBox.in_flight()), or it won't fire like a new Baddie.
+        """
+
+        self.hp = self._max_hp
+        self.active = True
+
+        self.rect.centerx = centerx
+        self.rect.centery = centery
+        self._c_rect.centerx = self.rect.centerx
+        self._c_rect.centery = self.rect.centery
+        self._xf = float(self.rect.centerx)
+        self._yf = float(self.rect.centery)
+        self._batched_move = None
+
+        self.image = self._images['neutral']
+        self._anim_state = None
+
+        if self._hit_counter > 0:
+            self._hit_counter = 0
+            self._decoration_list.remove(self)
+        self._dead_ctr = 30
+
+
     def got_hit(self, projectile, attacker):
         """
         Signals that this Baddie got hit by a Projectile.
@@ -175,7 +219,7 @@ class Baddie(Character):
 
         self._dec_invinc_rect.centerx = self.rect.centerx
         self._dec_invinc_rect.centery = self.rect.centery
-        screen.blit(self._dec_invinc_surf, self._dec_invinc_rect)
+        return screen.blit(self._dec_invinc_surf, self._dec_invinc_rect)
 
 
     def clear_decoration(self, screen, background):
@@ -183,7 +227,8 @@ class Baddie(Character):
         Clear circle.
         """
 
-        screen.blit(background, self._dec_invinc_rect, self._dec_invinc_rect)
+        return screen.blit(background, self._dec_invinc_rect,
+                           self._dec_invinc_rect)
 
 
     def _populate_images(self):
@@ -199,28 +244,24 @@ class Baddie(Character):
                 self._images[s] = [self._images["neutral"]]
 
 
-    def _update_image(self):
+    def _animation_series(self):
         """
-        Update image.
+        Get the Baddie's animation states (see PSprite._compile_animation()):
+        0 is moving and 1 is dead (stays on the last image).
         """
 
-        if self.active:
-            series = self._images['move']
-        else:
-            series = self._images['dead']
+        return [(self._images['move'], True), (self._images['dead'], False)]
 
-        if series is not self._prev_image_series:
-            self._prev_image_series = series
-            self._walk_ctr = 0
 
-        self.image = series[self._walk_ctr // self._fpi]
+    def _update_image(self):
+        """
+        Update image.
+        """
 
-        if self.hp <= 0:
-            if len(series) * self._fpi - 1 > self._walk_ctr:
-                self._walk_ctr += 1
+        if self.active:
+            self._animate(0)
         else:
-            self._walk_ctr = (self._walk_ctr + 1) % \
-                                (len(self._images['move']) * self._fpi)
+            self._animate(1)
 
 
     def _get_movement(self):
@@ -235,6 +276,40 @@ class Baddie(Character):
                 math.sin(self._dir) * self._speed)
 
 
+    def _step_movement(self):
+        """
+        Move one frame's worth using _speed and _dir, stopping at barriers.
+
+        Returns True if a barrier was hit (the Baddie will then be up against
+        it). Uses the result worked out by the Level's BaddieBatch if there
+        is one.
+        """
+
+        if self._batched_move is not None:
+            self._xf, self._yf, hit = self._batched_move
+            self._batched_move = None
+            self.rect.centerx = round(self._xf)
+            self.rect.centery = round(self._yf)
+            self._c_rect.centerx = self.rect.centerx
+            self._c_rect.centery = self.rect.centery
+            return hit
+
+        (dxf, dyf) = self._get_movement()
+
+        # Check for collisions with obstacles. Don't care which obstacles were
+        #   hit.
+        # dxf and dxy values passed to collision detection have the drift
+        #   between the FP center and int center added to prevent Baddies from
+        #   slowly passing through barriers
+        ddx, ddy, _, _ = self._basic_obstacle_collision(
+            dxf + self._xf - self.rect.centerx,
+            dyf + self._yf - self.rect.centery)
+
+        self._move(dxf + ddx, dyf + ddy)
+
+        return ddx != 0 or ddy != 0
+
+
     def _move(self, dxf, dxy):
         """
         Do all the bookkeeping to move this Baddie.
@@ -0,0 +1,106 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import math
+
+# NumPy is optional; without it, every Baddie moves itself
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class BaddieBatch():
+    """
+    Works out the movement of a Level's Baddies all at once.
+
+    Before the Baddies are updated, prepare() gathers the float positions,
+    speeds, and directions of the active Baddies into NumPy arrays, and
+    moves them all in one step against the Level's BarrierIndex (see
+    BarrierIndex.sweep_all()). Each Baddie is handed its new position and
+    whether it hit a barrier. Baddie._step_movement() then uses those instead
+    of doing its own collision test, and the subclass bounces or stops as
+    usual.
+
+    The new positions are only written back to a Baddie when its own update()
+    gets to _step_movement(). Anything a Baddie does before moving (e.g., XOR
+    firing from where it is) sees the old position, and the Level's rng is
+    used in the same order as before, so the game plays exactly the same.
+    A Baddie that doesn't get to _step_movement() this frame (e.g., a stopped
+    XOR) just doesn't use its result; finish() throws away the leftovers.
+
+    Only Baddies whose class sets batch_movement, and that use the Level's
+    barrier index, are batched. prepare() does nothing if NumPy isn't
+    installed, or if there are fewer than min_baddies Baddies to batch (the
+    overhead of setting up the arrays isn't worth it; on a typical machine
+    the batch only pays off at about 150 Baddies).
+
+    @param barrier_index: The Level's BarrierIndex
+    @param min_baddies: Smallest number of Baddies worth batching
+    """
+
+    def __init__(self, barrier_index, min_baddies):
+
+        self._index = barrier_index
+        self.min_baddies = min_baddies
+        # Baddies given a result by the last prepare()
+        self._prepared = []
+
+
+    def prepare(self, baddies):
+        """
+        Work out where the Baddies in baddies will move this frame.
+
+        Call before baddies.update().
+        """
+
+        if numpy is None or len(baddies) < self.min_baddies:
+            return
+
+        batch = [b for b in baddies
+                 if b.batch_movement and b.active and
+                 b._barrier_index is self._index]
+        if len(batch) < self.min_baddies:
+            return
+
+        np = numpy
+        # Same arithmetic as Baddie._get_movement() (NumPy's cos() and sin()
+        #   can differ from math's in the last bit)
+        xf, yf, dxf, dyf, cx, cy = np.array(
+            [(b._xf, b._yf, math.cos(b._dir) * b._speed,
+              math.sin(b._dir) * b._speed, b.rect.centerx, b.rect.centery)
+             for b in batch], dtype=np.float64).T
+        left, top, width, height = np.array(
+            [tuple(b._c_rect) for b in batch], dtype=np.int64).T
+
+    # Same as Baddie._step_movement(): the drift between the FP center and
+    #   the int center is added before testing for barriers
+        dx = np.rint(dxf + xf - cx).astype(np.int64)
+        dy = np.rint(dyf + yf - cy).astype(np.int64)
+        ddx, ddy, _, _ = self._index.sweep_all(left, top, left + width,
+                                               top + height, dx, dy)
+
+        xf += dxf + ddx
+        yf += dyf + ddy
+        hit = (ddx != 0) | (ddy != 0)
+
+        for b, x, y, h in zip(batch, xf.tolist(), yf.tolist(), hit.tolist()):
+            b._batched_move = (x, y, h)
+        self._prepared = batch
+
+
+    def finish(self):
+        """
+        Throw away results that weren't used. Call after baddies.update().
+        """
+
+        for b in self._prepared:
+            b._batched_move = None
+        self._prepared = []
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
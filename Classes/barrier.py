@@ -0,0 +1,72 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pygame
+from pygame.locals import *
+
+class Barrier():
+    """
+    Base class for Walls and Platforms.
+
+    Don't instantiate this class; subclass it.
+
+    A Barrier is just a Rect. It isn't a pygame.sprite.Sprite, but it can
+    still be put in pygame.sprite.Groups (pygame allows any object with
+    add_internal() and remove_internal()), so Levels keep their barriers in
+    Groups as before. A Barrier doesn't keep track of the Groups it's in.
+
+    Barriers are only drawn for debugging (see Level.dbg_draw()), so image
+    isn't made until something draws the Barrier.
+
+    @param rect: Where the Barrier is
+
+    class variables:
+        color: Color of the Barrier when drawn
+    """
+
+    __slots__ = ("rect", "_image")
+
+    color = (255, 255, 255)
+
+    def __init__(self, rect):
+
+        self.rect = rect
+        self._image = None
+
+
+    @property
+    def image(self):
+        """
+        Surface of the Barrier filled with color (made on first use).
+        """
+
+        if self._image is None:
+            self._image = pygame.Surface(self.rect.size)
+            self._image.fill(self.color)
+        return self._image
+
+
+    def merged(self, other):
+        """
+        Make a new Barrier of the same class that covers this one and other.
+        """
+
+        barrier = object.__new__(type(self))
+        Barrier.__init__(barrier, self.rect.union(other.rect))
+        return barrier
+
+
+    def add_internal(self, group):
+        pass
+
+
+    def remove_internal(self, group):
+        pass
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
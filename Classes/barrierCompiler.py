@@ -0,0 +1,170 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pygame
+from pygame.locals import *
+
+class BarrierCompiler():
+    """
+    Tidies up a Level's barriers before they're indexed.
+
+    compile() changes the barrier Groups in place:
+        - Barriers in the same Group that lie on the same line and touch or
+          overlap are merged into one. Sprites stop in the same places as
+          before, but there are fewer barriers to test, and a Player walking
+          across a seam between two Platforms doesn't walk off the first
+          one.
+        - Barriers that don't touch play_area are dropped. Sprites can't
+          leave play_area, so they could only ever reach those barriers by
+          passing through another one in the same move.
+
+    It also finds pairs of barriers in the same Group that are parallel,
+    overlap, and are closer than min_gap pixels. A sprite that moves farther
+    than that in one frame can cross both at once and stop at the wrong one
+    (see PSprite._basic_obstacle_collision()).
+
+    Results of the last compile():
+        merged: Number of barriers merged away
+        dropped: List of barriers dropped
+        close: List of (group name, barrier, barrier, distance) of barriers
+               that are too close
+
+    @param play_area: Rect that sprites can't leave (None = don't drop any
+                      barriers)
+    @param min_gap: Report barriers closer than this (pixels)
+    """
+
+    def __init__(self, play_area=None, min_gap=0):
+
+        self.play_area = play_area
+        self.min_gap = min_gap
+
+        self.merged = 0
+        self.dropped = []
+        self.close = []
+
+
+    def compile(self, floors, l_walls, r_walls, ceilings):
+        """
+        Tidy up barrier Groups (see class docstring).
+        """
+
+        self.merged = 0
+        self.dropped = []
+        self.close = []
+
+        for name, group, horizontal in [("floors", floors, True),
+                                        ("l_walls", l_walls, False),
+                                        ("r_walls", r_walls, False),
+                                        ("ceilings", ceilings, True)]:
+            barriers = self._drop(group.sprites())
+            barriers = self._merge(barriers, horizontal)
+            if barriers != group.sprites():
+                group.empty()
+                group.add(barriers)
+            self._find_close(name, barriers, horizontal)
+
+
+    def report(self):
+        """
+        Describe the results of the last compile(). Returns a list of lines.
+        """
+
+        lines = ["Barriers merged: {}".format(self.merged),
+                 "Barriers dropped: {}".format(len(self.dropped))]
+        for barrier in self.dropped:
+            lines.append("  {}".format(barrier.rect))
+        lines.append("Barriers closer than {} pixels: {}".format(
+            self.min_gap, len(self.close)))
+        for name, a, b, distance in self.close:
+            lines.append("  {}: {} and {} ({} pixels apart)".format(
+                name, a.rect, b.rect, distance))
+
+        return lines
+
+
+    def _drop(self, barriers):
+        """
+        Get barriers without the ones outside play_area.
+        """
+
+        if self.play_area is None:
+            return barriers
+
+        kept = []
+        for barrier in barriers:
+            if barrier.rect.colliderect(self.play_area):
+                kept.append(barrier)
+            else:
+                self.dropped.append(barrier)
+
+        return kept
+
+
+    def _merge(self, barriers, horizontal):
+        """
+        Merge touching barriers on the same line.
+
+        A merged barrier takes the place (in Group order) of the first of the
+        barriers it was made from.
+        """
+
+        # Barriers on each line, by where they start along it
+        lines = {}
+        for order, barrier in enumerate(barriers):
+            key, lo, hi = self._extent(barrier, horizontal)
+            lines.setdefault(key, []).append((lo, hi, order, barrier))
+
+        # Order of the first barrier -> merged barrier
+        result = {}
+        for line in lines.values():
+            line.sort(key=lambda e: (e[0], e[2]))
+            _, hi, order, barrier = line[0]
+            for next_lo, next_hi, next_order, next_barrier in line[1:]:
+                if next_lo <= hi:
+                    barrier = barrier.merged(next_barrier)
+                    hi = max(hi, next_hi)
+                    order = min(order, next_order)
+                    self.merged += 1
+                else:
+                    result[order] = barrier
+                    hi = next_hi
+                    order = next_order
+                    barrier = next_barrier
+            result[order] = barrier
+
+        return [result[order] for order in sorted(result)]
+
+
+    def _find_close(self, name, barriers, horizontal):
+        """
+        Find parallel, overlapping barriers closer than min_gap.
+        """
+
+        entries = sorted(self._extent(b, horizontal) + (b,) for b in barriers)
+        for i, (key, lo, hi, barrier) in enumerate(entries):
+            for other_key, other_lo, other_hi, other in entries[i+1:]:
+                if other_key - key >= self.min_gap:
+                    break
+                if other_key != key and lo < other_hi and other_lo < hi:
+                    self.close.append((name, barrier, other, other_key - key))
+
+
+    @staticmethod
+    def _extent(barrier, horizontal):
+        """
+        Get (key, lo, hi) of a barrier, like BarrierIndex's entries.
+        """
+
+        r = barrier.rect
+        if horizontal:
+            return (r.top, r.left, r.right)
+        return (r.left, r.top, r.bottom)
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
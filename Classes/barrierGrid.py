@@ -0,0 +1,100 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import sys, os, pygame
+from pygame.locals import *
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.barrierIndex import BarrierIndex
+
+class BarrierGrid(BarrierIndex):
+    """
+    Uniform-grid broadphase for a Level's barriers.
+
+    The Level is divided into square cells, and every barrier is put in a
+    bucket for each cell it touches. A collision query only looks at the
+    buckets of the cells covered by a sprite's swept _c_rect, so the cost
+    doesn't depend on how many barriers are elsewhere in the Level.
+
+    Gives the same answers as BarrierIndex (see BarrierIndex.sweep()).
+
+    @param floors: pygame.sprite.Group of Platforms that block moving down
+    @param l_walls: pygame.sprite.Group of Walls that block moving right
+    @param r_walls: pygame.sprite.Group of Walls that block moving left
+    @param ceilings: pygame.sprite.Group of Platforms that block moving up
+    @param cell_size: Width and height of a grid cell (pixels)
+    """
+
+    def __init__(self, floors, l_walls, r_walls, ceilings, cell_size=64):
+
+        if cell_size <= 0:
+            raise ValueError("cell_size must be > 0")
+
+        self.cell_size = cell_size
+
+        BarrierIndex.__init__(self, floors, l_walls, r_walls, ceilings)
+
+
+    def _derive(self, floors, l_walls, r_walls, ceilings):
+        """
+        Make another grid with the same cell size from different barriers.
+        """
+
+        return BarrierGrid(floors, l_walls, r_walls, ceilings, self.cell_size)
+
+
+    def _build(self, group, horizontal):
+        """
+        Bucket the barriers of one direction by the cells they touch.
+
+        The structure is a dictionary from (column, row) to a list of entries.
+        Empty cells are not stored.
+        """
+
+        cs = self.cell_size
+        cells = {}
+        for entry in self._entries(group, horizontal):
+            key, lo, hi = entry[0], entry[1], entry[2]
+            # (A zero-length barrier still goes in the cell it sits in)
+            for i in range(lo // cs, max(hi - 1, lo) // cs + 1):
+                if horizontal:
+                    cell = (i, key // cs)
+                else:
+                    cell = (key // cs, i)
+                if cell in cells:
+                    cells[cell].append(entry)
+                else:
+                    cells[cell] = [entry]
+
+        return (horizontal, cells)
+
+
+    def _candidates(self, index, lo, hi, span_lo, span_hi):
+        """
+        Get entries from all cells covered by [lo, hi] x (span_lo, span_hi).
+        """
+
+        horizontal, cells = index
+        cs = self.cell_size
+
+        found = []
+        for k in range(lo // cs, hi // cs + 1):
+            for i in range(span_lo // cs, (span_hi - 1) // cs + 1):
+                if horizontal:
+                    cell = (i, k)
+                else:
+                    cell = (k, i)
+                if cell in cells:
+                    found.extend(cells[cell])
+
+        return found
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
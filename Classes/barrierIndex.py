@@ -0,0 +1,323 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import bisect, pygame
+from pygame.locals import *
+
+# NumPy is optional; it's only needed for sweep_all()
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class BarrierIndex():
+    """
+    Sorted-interval index of a Level's barriers for fast collision queries.
+
+    Walls are kept sorted by their x-coordinate along with their y-extents,
+    and Platforms are kept sorted by their y-coordinate along with their
+    x-extents. A collision query only has to look at the barriers whose
+    coordinate lies between where a sprite is and where it wants to go,
+    instead of every barrier in the Level.
+
+    The index is a snapshot: barriers added to the Groups after the index is
+    built are not seen by it.
+
+    @param floors: pygame.sprite.Group of Platforms that block moving down
+    @param l_walls: pygame.sprite.Group of Walls that block moving right
+    @param r_walls: pygame.sprite.Group of Walls that block moving left
+    @param ceilings: pygame.sprite.Group of Platforms that block moving up
+    """
+
+    def __init__(self, floors, l_walls, r_walls, ceilings):
+
+        self._groups = (floors, l_walls, r_walls, ceilings)
+
+        # Each direction gets a lookup structure of (key, lo, hi, order,
+        #   barrier) entries (see _build())
+        # order is the barrier's position in its Group, used to pick the same
+        #   barrier that a linear scan of the Group would have picked
+        self._floors = self._build(floors, True)
+        self._l_walls = self._build(l_walls, False)
+        self._r_walls = self._build(r_walls, False)
+        self._ceilings = self._build(ceilings, True)
+
+        # Variant where Platforms and Walls block from both sides (built on
+        #   demand for Projectiles)
+        self._two_way = None
+
+        # NumPy tables of the barriers for sweep_all() (built on demand)
+        self._tables = None
+
+
+    def sweep(self, c_rect, dx, dy):
+        """
+        Check if moving c_rect by (dx, dy) will take it into a barrier.
+
+        Same semantics as PSprite._basic_obstacle_collision(): returns
+        (ddx, ddy, obsx, obsy). dx and dy must be ints.
+
+        c_rect is swept along (dx, dy). In each direction, the barrier hit is
+        the nearest one that c_rect would cross (the first in Group order if
+        several are equally near), and a barrier only counts if c_rect
+        overlaps it at the point where c_rect would be right up against it.
+        So a fast sprite can't pass through one barrier to stop at another
+        one behind it.
+        """
+
+        ddx = 0
+        ddy = 0
+        obsx = None
+        obsy = None
+
+        # Moving right
+        if dx > 0:
+            edge = c_rect.right - 1
+            wall = self._nearest(self._l_walls, edge + 1, edge + dx, True,
+                                 c_rect.top, c_rect.bottom, dx, dy)
+            if wall is not None:
+                ddx = wall[0] - (edge + dx) - 1
+                obsx = wall[4]
+        # Moving left
+        elif dx < 0:
+            edge = c_rect.left
+            wall = self._nearest(self._r_walls, edge + dx, edge - 1, False,
+                                 c_rect.top, c_rect.bottom, dx, dy)
+            if wall is not None:
+                ddx = wall[0] - (edge + dx) + 1
+                obsx = wall[4]
+
+        # Moving up
+        if dy < 0:
+            edge = c_rect.top
+            platform = self._nearest(self._ceilings, edge + dy, edge - 1,
+                                     False, c_rect.left, c_rect.right, dy, dx)
+            if platform is not None:
+                ddy = platform[0] - (edge + dy) + 1
+                obsy = platform[4]
+        # Moving down
+        elif dy > 0:
+            edge = c_rect.bottom - 1
+            platform = self._nearest(self._floors, edge + 1, edge + dy, True,
+                                     c_rect.left, c_rect.right, dy, dx)
+            if platform is not None:
+                ddy = platform[0] - (edge + dy) - 1
+                obsy = platform[4]
+
+        return (ddx, ddy, obsx, obsy)
+
+
+    def sweep_all(self, left, top, right, bottom, dx, dy):
+        """
+        Do sweep() for many c_rects at once. Needs NumPy.
+
+        The c_rects are given as int arrays of their edges, and dx and dy as
+        int arrays of the same length. Returns (ddx, ddy, obsx, obsy) arrays
+        with the same meaning as sweep()'s results, one per c_rect. obsx and
+        obsy are object arrays (None where nothing was hit).
+        """
+
+        np = numpy
+        x_table, y_table = self._array_tables()
+
+        # Barrier keys crossed by each c_rect, as inclusive ranges (empty if
+        #   lo > hi). Moving right crosses (right-1, right-1+dx], and moving
+        #   left crosses [left+dx, left). Same for down and up.
+        fwd = dx > 0
+        keys, obsx = self._nearest_all(np.where(fwd, right, left + dx),
+                                       np.where(fwd, right - 1 + dx, left - 1),
+                                       fwd, top, bottom, dx, dy, x_table)
+        ddx = np.where(obsx == None, 0,
+                       keys - dx + np.where(fwd, -right, 1 - left))
+
+        fwd = dy > 0
+        keys, obsy = self._nearest_all(np.where(fwd, bottom, top + dy),
+                                       np.where(fwd, bottom - 1 + dy, top - 1),
+                                       fwd, left, right, dy, dx, y_table)
+        ddy = np.where(obsy == None, 0,
+                       keys - dy + np.where(fwd, -bottom, 1 - top))
+
+        return (ddx, ddy, obsx, obsy)
+
+
+    def two_way(self):
+        """
+        Get an index where all Platforms and all Walls block from both sides.
+
+        This is how Projectiles see barriers.
+        """
+
+        if self._two_way is None:
+            floors, l_walls, r_walls, ceilings = self._groups
+            platforms = pygame.sprite.Group(floors.sprites(),
+                                            ceilings.sprites())
+            walls = pygame.sprite.Group(l_walls.sprites(), r_walls.sprites())
+            self._two_way = self._derive(platforms, walls, walls, platforms)
+            self._two_way._two_way = self._two_way
+
+        return self._two_way
+
+
+    def _array_tables(self):
+        """
+        Get the barriers as NumPy tables for sweep_all(), one for the
+        x-direction (walls) and one for the y-direction (platforms).
+
+        A table is (keys, los, his, forward, barriers) arrays. The entries
+        for moving forward (l_walls, floors) come first, in Group order, then
+        those for moving back. forward tells them apart, or is None if both
+        directions have the same barriers. barriers has an extra None at the
+        end, for "nothing found".
+        """
+
+        if self._tables is None:
+            floors, l_walls, r_walls, ceilings = self._groups
+            floors = self._entries(floors, True)
+            l_walls = self._entries(l_walls, False)
+            r_walls = self._entries(r_walls, False)
+            ceilings = self._entries(ceilings, True)
+            tables = []
+            for fwd, back in [(l_walls, r_walls), (floors, ceilings)]:
+                if [e[4] for e in fwd] == [e[4] for e in back]:
+                    entries = fwd
+                    forward = None
+                else:
+                    entries = fwd + back
+                    forward = numpy.array([True] * len(fwd) +
+                                          [False] * len(back))
+                barriers = numpy.empty(len(entries) + 1, dtype=object)
+                barriers[:-1] = [e[4] for e in entries]
+                tables.append(tuple(numpy.array([e[i] for e in entries],
+                                                dtype=numpy.int64)
+                                    for i in range(3)) + (forward, barriers))
+            self._tables = tuple(tables)
+
+        return self._tables
+
+
+    def _nearest_all(self, lo, hi, forward, span_lo, span_hi, d, other_d,
+            table):
+        """
+        Like _nearest() for arrays of queries, each looking among the
+        barriers for its direction.
+
+        Returns (keys, barriers) arrays of what was found (barrier None and
+        key meaningless if nothing).
+        """
+
+        np = numpy
+        keys, los, his, fwd, barriers = table
+        if len(keys) == 0:
+            return (np.zeros(len(lo), dtype=np.int64),
+                    np.full(len(lo), None, dtype=object))
+
+        lo = lo[:, None]
+        hi = hi[:, None]
+        travel = np.where(forward[:, None], keys - lo, hi - keys)
+        d = np.abs(d)[:, None]
+        shift = other_d[:, None] * travel
+        m = (keys >= lo) & (keys <= hi) & \
+            (span_hi[:, None] * d + shift > los * d) & \
+            (span_lo[:, None] * d + shift < his * d)
+        if fwd is not None:
+            m &= fwd == forward[:, None]
+        nearest = np.where(m, travel, np.iinfo(np.int64).max).argmin(axis=1)
+        found = np.where(m.any(axis=1), nearest, -1)
+
+        return (keys[found], barriers[found])
+
+
+    def _derive(self, floors, l_walls, r_walls, ceilings):
+        """
+        Make another index of the same kind from different barriers.
+        """
+
+        return BarrierIndex(floors, l_walls, r_walls, ceilings)
+
+
+    def _build(self, group, horizontal):
+        """
+        Build the lookup structure for one direction.
+
+        Platforms (horizontal) are keyed by top and span left..right. Walls
+        are keyed by left and span top..bottom. Here, the structure is a
+        (keys, entries) pair sorted by key.
+        """
+
+        entries = self._entries(group, horizontal)
+        entries.sort(key=lambda e: (e[0], e[3]))
+        keys = [e[0] for e in entries]
+
+        return (keys, entries)
+
+
+    def _entries(self, group, horizontal):
+        """
+        Make a (key, lo, hi, order, barrier) entry for every barrier in group.
+        """
+
+        entries = []
+        for order, barrier in enumerate(group):
+            r = barrier.rect
+            if horizontal:
+                entries.append((r.top, r.left, r.right, order, barrier))
+            else:
+                entries.append((r.left, r.top, r.bottom, order, barrier))
+
+        return entries
+
+
+    def _candidates(self, index, lo, hi, span_lo, span_hi):
+        """
+        Get entries that might have a key in [lo, hi] and overlap the span.
+
+        Entries may be returned more than once. The caller does the exact
+        test.
+        """
+
+        keys, entries = index
+
+        return entries[bisect.bisect_left(keys, lo):
+                       bisect.bisect_right(keys, hi)]
+
+
+    def _nearest(self, index, lo, hi, forward, span_lo, span_hi, d, other_d):
+        """
+        Find the nearest matching barrier for sweep().
+
+        Looks at barriers whose key is in [lo, hi], moving forward (from lo)
+        or back (from hi) by d. While moving, the (span_lo, span_hi) extent
+        moves by other_d; it must overlap the barrier's extent once it's right
+        up against the barrier. Returns the barrier's entry, or None.
+        """
+
+        # Whole extent covered while moving
+        reach_lo = span_lo + min(0, other_d)
+        reach_hi = span_hi + max(0, other_d)
+        d = abs(d)
+
+        found = None
+        for entry in self._candidates(index, lo, hi, reach_lo, reach_hi):
+            key, b_lo, b_hi, order, barrier = entry
+            if key < lo or key > hi:
+                continue
+            # Distance moved before being up against the barrier, and how far
+            #   the extent has moved by then (times d, to stay in ints)
+            travel = key - lo if forward else hi - key
+            shift = other_d * travel
+            if span_hi * d + shift > b_lo * d and \
+                    span_lo * d + shift < b_hi * d:
+                if found is None or (travel, order) < found[0]:
+                    found = ((travel, order), entry)
+
+        if found is None:
+            return None
+        return found[1]
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -18,7 +18,8 @@ class Character(PSprite):
     Base class for all characters (player-controlled and NPC).
 
     kwargs must contain:
-        owner: The Level object that owns this Character
+        owner: The Level object that owns this Character (its rng is used
+               for anything random the Character does)
         centerx: Character spawn x-coordinate
         centery: Character spawn y-coordinate
         images["neutral"]: default image (see also PSprite)
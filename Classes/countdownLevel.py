@@ -5,7 +5,7 @@
 # This software comes with ABSOLUTELY NO WARRANTY.
 # See GPLv3.txt for details.
 
-import sys, os, random, pygame
+import sys, os, pygame
 from pygame.locals import *
 
 # Add parent directory to path so can get Classes
@@ -14,6 +14,7 @@ from Classes.level import Level
 from Classes.character import Character
 from Classes.heart import Heart
 from Classes.projectileBox import ProjectileBox
+from Classes.eventLog import event_log, INFO
 
 class CountdownLevel(Level):
     """
@@ -29,6 +30,7 @@ class CountdownLevel(Level):
     @param baddie_classes: A list of available baddies
     @param power_ups: Dictionary of power-ups available to the player
     @param player_projectile_group: Where all Players' fired Projectiles go
+                                    (a pygame.sprite.RenderUpdates)
     @param decoration_list: Where PSprites that need decorations go
     """
 
@@ -95,7 +97,7 @@ class CountdownLevel(Level):
         #   wasted.
         if self._pu_timer == 0:
             self._pu_timer = 600
-            if not self._pu_avail and random.randint(0,1) == 0:
+            if not self._pu_avail and self.rng.randint(0,1) == 0:
                 self._add_pu()
         else:
             self._pu_timer -= 1
@@ -110,15 +112,16 @@ class CountdownLevel(Level):
 
         # Schedule adding a new Baddie in a random number of frames
         if len(self.baddies) < self._max_baddies:
-            self._baddie_timer = random.randint(1, 100)
+            self._baddie_timer = self.rng.randint(1, 100)
 
     # Handle picking up power-ups
         # This type of level assumes there's only one power-up in play at a
         #   time. More complex logic is needed if there are more power-ups
         pu = pygame.sprite.spritecollide(self.player, self._power_ups, True)
         if len(pu) > 0:
-            print("Power-up caught")
             pu = pu[0]
+            event_log.log(INFO, "power_up_caught", type(pu).__name__,
+                          player=type(self.player).__name__)
             pu.disable_box()
             if isinstance(pu, Character):
                 self._push_player(pu)
@@ -154,11 +157,14 @@ class CountdownLevel(Level):
         Clear hurt timer display if present.
         """
 
+        dirty = Level.clear(self, screen)
+
         if pygame.font:
             if self._hurt_timer < 600:
-                screen.blit(self.backdrop, self._timer_rect, self._timer_rect)
+                dirty.append(screen.blit(self.backdrop, self._timer_rect,
+                                         self._timer_rect))
 
-        Level.clear(self, screen)
+        return dirty
 
 
     def draw(self, screen):
@@ -166,12 +172,17 @@ class CountdownLevel(Level):
         Draw hurt timer if needed.
         """
 
+        dirty = []
+
         if pygame.font:
             if self._hurt_timer < 600:
-                screen.blit(self._timer_nums[self._hurt_timer // 60],
-                            self._timer_rect)
+                dirty.append(screen.blit(
+                    self._timer_nums[self._hurt_timer // 60],
+                    self._timer_rect))
+
+        dirty.extend(Level.draw(self, screen))
 
-        Level.draw(self, screen)
+        return dirty
 
 
     def baddie_killed(self, baddie):
@@ -193,7 +204,7 @@ class CountdownLevel(Level):
         """
 
         # Which type of power-up to add
-        sel = random.randint(0, 2)
+        sel = self.rng.randint(0, 2)
 
         # Heart:
         # TODO: Update for multiple types of health boosts
@@ -207,7 +218,7 @@ class CountdownLevel(Level):
             length = len(self._power_up_dict['players'])
             if length == 0:
                 return
-            i = random.randint(0, length-1)
+            i = self.rng.randint(0, length-1)
             pu_kwargs = {"owner"             : self,
                          "centerx"           : self._pu_spawn_x,
                          "centery"           : self._pu_spawn_y,
@@ -215,8 +226,10 @@ class CountdownLevel(Level):
                          "l_walls"           : self.l_walls,
                          "r_walls"           : self.r_walls,
                          "ceilings"          : self.ceilings,
+                         "barrier_index"     : self.barrier_index(),
                          "targets"           : self.baddies,
                          "fired_projectiles" : self._player_projectile_group,
+                         "projectile_pools"  : self.projectile_pools,
                          "decoration_list"   : self._decoration_list}
             pu = self._power_up_dict['players'][i](pu_kwargs)
         # Projectile
@@ -224,12 +237,13 @@ class CountdownLevel(Level):
             length = len(self._power_up_dict['projectiles'])
             if length == 0:
                 return
-            i = random.randint(0, length-1)
+            i = self.rng.randint(0, length-1)
             pu_kwargs = {"owner"             : self.player,#NOTE: Updated later
                          "floors"            : self.floors,
                          "l_walls"           : self.l_walls,
                          "r_walls"           : self.r_walls,
                          "ceilings"          : self.ceilings,
+                         "barrier_index"     : self.barrier_index(),
                          "projectile_class"  : \
                             self._power_up_dict["projectiles"][i],
                          "fired_projectiles" : self._player_projectile_group,
@@ -238,10 +252,12 @@ class CountdownLevel(Level):
                          "targets"           : self.baddies,
                          "centerx"           : self._pu_spawn_x,
                          "centery"           : self._pu_spawn_y,
+                         "projectile_pools"  : self.projectile_pools,
                          "decoration_list"   : self._decoration_list}
             pu = ProjectileBox(pu_kwargs)
 
-        print("Power-up appeared")
+        event_log.log(INFO, "power_up_appeared", type(pu).__name__,
+                      centerx=pu.rect.centerx, centery=pu.rect.centery)
 
         self._power_ups.add(pu)
         self._pu_avail = True
@@ -0,0 +1,196 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import sys, os, collections, threading, json
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.animation import frame_clock
+
+# Levels of events. Events below an EventLog's level are thrown away
+DEBUG = 10
+INFO = 20
+WARNING = 30
+# Nothing is logged at OFF
+OFF = 100
+
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "off": OFF}
+_LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+
+class EventLog():
+    """
+    Things that happen in the game, written out without holding up frames.
+
+    log() only puts a record (frame number, level, event, entity, values) in
+    an in-memory ring buffer. Once start() has been called, a background
+    thread takes records out of the ring and writes them out every interval
+    seconds, so a slow terminal or a full pipe never stalls the game loop. If
+    the writer falls behind (or was never started) and the ring fills up, the
+    oldest records are dropped and counted in dropped.
+
+    Records are written one per line, either as text:
+        frame 812 INFO hit Fred damage=1 hp=2
+    or, to a file ending in .jsonl, as one JSON object per line:
+        {"frame": 812, "level": "info", "event": "hit", "entity": "Fred",
+         "damage": 1, "hp": 2}
+
+    @param capacity: Most records the ring holds
+    @param level: Least level of event that is logged (see LEVELS)
+    @param interval: Seconds between writes
+    """
+
+    def __init__(self, capacity=4096, level=INFO, interval=0.1):
+
+        if capacity <= 0:
+            raise ValueError("capacity must be > 0")
+
+        self.level = level
+        self.interval = interval
+        # Records thrown away because the ring was full
+        self.dropped = 0
+
+        # deque's append() and popleft() are thread-safe, so the game loop
+        #   and the writer thread don't need a lock
+        self._ring = collections.deque(maxlen=capacity)
+
+        self._out = None
+        self._close_out = False
+        self._json = False
+        self._thread = None
+        self._stop = threading.Event()
+
+
+    def log(self, level, event, entity, **values):
+        """
+        Log an event.
+
+        @param level: DEBUG, INFO, or WARNING
+        @param event: What happened, e.g., "hit"
+        @param entity: Who it happened to (a class name)
+        @param values: Any numbers or strings that go with the event
+        """
+
+        if level < self.level:
+            return
+
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            self.dropped += 1
+        ring.append((frame_clock.frame, level, event, entity, values))
+
+
+    def start(self, path="-"):
+        """
+        Start writing records to path ("-" for stdout) in the background.
+        """
+
+        if self._thread is not None:
+            return
+
+        if path == "-":
+            self._out = sys.stdout
+            self._close_out = False
+        else:
+            self._out = open(path, "w")
+            self._close_out = True
+        self._json = path.endswith(".jsonl")
+
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="EventLog",
+                                        daemon=True)
+        self._thread.start()
+
+
+    def stop(self):
+        """
+        Write out everything left in the ring and stop the writer thread.
+
+        If any records were dropped, an "events_dropped" warning with their
+        count is written last (whatever the level).
+        Safe to call more than once, or if start() was never called.
+        """
+
+        if self._thread is None:
+            return
+
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+        self._write()
+        if self.dropped > 0:
+            self._out.write(self.format((frame_clock.frame, WARNING,
+                "events_dropped", "EventLog", {"count": self.dropped})) + "\n")
+            self._out.flush()
+            self.dropped = 0
+        if self._close_out:
+            self._out.close()
+        self._out = None
+
+
+    def records(self):
+        """
+        Take all records out of the ring, oldest first.
+        """
+
+        records = []
+        ring = self._ring
+        while True:
+            try:
+                records.append(ring.popleft())
+            except IndexError:
+                return records
+
+
+    def format(self, record):
+        """
+        Get a record as one line of text (without a newline).
+        """
+
+        frame, level, event, entity, values = record
+        name = _LEVEL_NAMES.get(level, str(level))
+        if self._json:
+            row = {"frame": frame, "level": name, "event": event,
+                   "entity": entity}
+            row.update(values)
+            return json.dumps(row)
+
+        line = "frame %d %s %s %s" % (frame, name.upper(), event, entity)
+        for key, value in values.items():
+            line += " %s=%s" % (key, value)
+        return line
+
+
+    def _run(self):
+        """
+        The writer thread.
+        """
+
+        while not self._stop.wait(self.interval):
+            self._write()
+
+
+    def _write(self):
+        """
+        Write out the records in the ring.
+        """
+
+        records = self.records()
+        if len(records) == 0:
+            return
+
+        self._out.write("".join(self.format(r) + "\n" for r in records))
+        self._out.flush()
+
+
+# The log used by everything in the game
+event_log = EventLog()
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
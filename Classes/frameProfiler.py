@@ -0,0 +1,166 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import collections, time, json, csv
+
+class FrameProfiler():
+    """
+    Times the phases of each frame.
+
+    The game loop calls begin_frame() at the start of a frame, lap(phase)
+    at the end of each phase, and end_frame() when the frame is done (or
+    abandon_frame() if the frame shouldn't count, e.g., when paused). lap()
+    charges the time since the previous lap() (or begin_frame()) to phase, so
+    each phase costs only one clock read. A phase can be lapped more than once
+    in a frame; the times are added up.
+
+    The last window frames are kept for percentiles and dump(). Counts, means,
+    and maximums cover all frames.
+
+    @param window: Number of recent frames to keep
+    """
+
+    # Percentiles reported by summary()
+    PERCENTILES = (50, 90, 99)
+
+    def __init__(self, window=3600):
+
+        if window <= 0:
+            raise ValueError("window must be > 0")
+
+        # Phase names in the order they were first seen
+        self.phases = []
+        self._phase_set = set()
+        # Number of frames profiled
+        self.frames = 0
+
+        # Times of the current frame (phase -> seconds)
+        self._current = {}
+        self._last = None
+        self._frame_start = None
+
+        # Recent frames as (frame number, {phase: seconds}, total seconds)
+        self._window = collections.deque(maxlen=window)
+        # All-time totals and maximums per phase (and for "total")
+        self._sum = collections.defaultdict(float)
+        self._max = collections.defaultdict(float)
+
+
+    def begin_frame(self):
+        """
+        Start timing a frame.
+        """
+
+        self._current = {}
+        self._frame_start = self._last = time.perf_counter()
+
+
+    def lap(self, phase):
+        """
+        Charge the time since the last lap to phase.
+        """
+
+        now = time.perf_counter()
+        if phase in self._current:
+            self._current[phase] += now - self._last
+        else:
+            self._current[phase] = now - self._last
+            if phase not in self._phase_set:
+                self._phase_set.add(phase)
+                self.phases.append(phase)
+        self._last = now
+
+
+    def end_frame(self):
+        """
+        Finish timing a frame.
+
+        Time since the last lap isn't charged to any phase, but counts in the
+        frame's total.
+        """
+
+        total = time.perf_counter() - self._frame_start
+        self._window.append((self.frames, self._current, total))
+        self.frames += 1
+
+        for phase, t in self._current.items():
+            self._sum[phase] += t
+            if t > self._max[phase]:
+                self._max[phase] = t
+        self._sum["total"] += total
+        if total > self._max["total"]:
+            self._max["total"] = total
+
+
+    def abandon_frame(self):
+        """
+        Forget the frame being timed without counting it.
+        """
+
+        self._current = {}
+        self._frame_start = self._last = None
+
+
+    def summary(self):
+        """
+        Get timing statistics for each phase and for whole frames.
+
+        Returns {phase: {"mean": s, "max": s, "p50": s, ...}} in seconds.
+        Percentiles are over the recent window; a frame in which a phase
+        didn't happen counts as 0.0 for that phase.
+        """
+
+        stats = {}
+        for phase in self.phases + ["total"]:
+            if self.frames == 0:
+                break
+            if phase == "total":
+                times = sorted(f[2] for f in self._window)
+            else:
+                times = sorted(f[1].get(phase, 0.0) for f in self._window)
+            s = {"mean": self._sum[phase] / self.frames,
+                 "max": self._max[phase]}
+            for p in self.PERCENTILES:
+                # Nearest-rank percentile
+                i = max(0, -(-p * len(times) // 100) - 1)
+                s["p" + str(p)] = times[i]
+            stats[phase] = s
+
+        return stats
+
+
+    def dump(self, path):
+        """
+        Write recent frame times to path.
+
+        A file ending in .json gets the summary() and every recent frame. Any
+        other file gets CSV with one row per recent frame and one column per
+        phase. Times are in seconds.
+        """
+
+        if path.endswith(".json"):
+            frames = []
+            for frame, phases, total in self._window:
+                row = {"frame": frame, "total": total}
+                row.update(phases)
+                frames.append(row)
+            with open(path, "w") as f:
+                json.dump({"frames_profiled": self.frames,
+                           "summary": self.summary(),
+                           "frames": frames}, f, indent=1)
+        else:
+            with open(path, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame"] + self.phases + ["total"])
+                for frame, phases, total in self._window:
+                    writer.writerow([frame] +
+                                    [phases.get(p, 0.0) for p in self.phases] +
+                                    [total])
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
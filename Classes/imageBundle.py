@@ -0,0 +1,178 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import os, json, mmap, struct, pygame
+from pygame.locals import *
+
+class ImageBundle():
+    """
+    All the images in a directory, decoded and packed into one file.
+
+    build() decodes every PNG in a directory and writes the pixels, in the
+    32-bit BGRA layout that convert_alpha() gives on the usual displays, to
+    a bundle file along with an index. Loading an image from the bundle is
+    then just making a Surface from the mmap()'d pixels (no PNG decoding),
+    and converting it to the display's format is a plain copy.
+
+    The index has the mtime and size of each PNG it was built from. An image
+    whose PNG has changed since (or that isn't in the bundle) isn't loaded
+    from the bundle; load_image() loads the PNG instead.
+
+    File layout: magic, the length of the index (4 bytes, little-endian),
+    the index (JSON), then each image's pixels. The pixels and each image
+    start on 16-byte boundaries.
+
+    @param path: Bundle file (see build())
+    """
+
+    magic = b"PRJIMGS1"
+    # Pixel layout of the packed images
+    pixel_format = "BGRA"
+
+    def __init__(self, path):
+
+        self.path = path
+        self._image_dir = os.path.dirname(os.path.abspath(path))
+
+        with open(path, "rb") as f:
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        head = len(self.magic) + 4
+        if self._data[:len(self.magic)] != self.magic:
+            raise ValueError("{} is not an image bundle".format(path))
+        (index_len,) = struct.unpack("<I", self._data[len(self.magic):head])
+        # File name -> {"mtime", "size", "width", "height", "offset"}
+        self._index = json.loads(self._data[head:head+index_len].decode())
+        # Offsets in the index are from the start of the pixels
+        self._pixels_start = self._padded(head + index_len)
+
+
+    def __contains__(self, name):
+        return name in self._index
+
+
+    def __len__(self):
+        return len(self._index)
+
+
+    def load(self, img_path):
+        """
+        Get the image of file img_path, or None if it's not in the bundle or
+        the file has changed since the bundle was built.
+
+        The Surface uses the bundle's (read-only) memory; convert() or copy()
+        it before drawing on it.
+        """
+
+        img_path = os.path.abspath(img_path)
+        if os.path.dirname(img_path) != self._image_dir:
+            return None
+        entry = self._index.get(os.path.basename(img_path))
+        if entry is None:
+            return None
+
+        try:
+            stat = os.stat(img_path)
+        except OSError:
+            return None
+        if stat.st_mtime_ns != entry["mtime"] or stat.st_size != entry["size"]:
+            return None
+
+        size = (entry["width"], entry["height"])
+        start = self._pixels_start + entry["offset"]
+        end = start + size[0] * size[1] * 4
+        return pygame.image.frombuffer(memoryview(self._data)[start:end], size,
+                                       self.pixel_format)
+
+
+    @classmethod
+    def build(cls, image_dir, path):
+        """
+        Pack all the PNGs in image_dir into a bundle file at path.
+
+        Returns the number of images packed.
+        """
+
+        names = sorted(f for f in os.listdir(image_dir) if f.endswith(".png"))
+
+        index = {}
+        pixels = []
+        offset = 0
+        for name in names:
+            img_path = os.path.join(image_dir, name)
+            stat = os.stat(img_path)
+            img = pygame.image.load(img_path)
+            data = pygame.image.tobytes(img, cls.pixel_format)
+            index[name] = {"mtime"  : stat.st_mtime_ns,
+                           "size"   : stat.st_size,
+                           "width"  : img.get_width(),
+                           "height" : img.get_height(),
+                           "offset" : offset}
+            pixels.append(data)
+            offset += cls._padded(len(data))
+
+        index_bytes = json.dumps(index, sort_keys=True).encode()
+        pixels_start = cls._padded(len(cls.magic) + 4 + len(index_bytes))
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(cls.magic)
+            f.write(struct.pack("<I", len(index_bytes)))
+            f.write(index_bytes)
+            f.write(b"\0" * (pixels_start - f.tell()))
+            for data in pixels:
+                f.write(data)
+                f.write(b"\0" * (cls._padded(len(data)) - len(data)))
+        os.replace(tmp_path, path)
+
+        return len(names)
+
+
+    @staticmethod
+    def _padded(n):
+        """
+        Round n up to a multiple of 16.
+        """
+
+        return (n + 15) // 16 * 16
+
+
+# Where the game's bundle goes (next to the images it's built from)
+BUNDLE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "Images", "images.bundle")
+
+# The game's bundle, opened on first use (False = not opened yet, None = no
+#   usable bundle)
+_bundle = False
+
+def load_image(img_path):
+    """
+    Load the image in file img_path, from the game's bundle if it's there and
+    up to date, otherwise from the file.
+
+    Like pygame.image.load(), the image isn't converted to the display's
+    format, and pygame.error is raised if the file can't be loaded.
+    """
+
+    global _bundle
+    if _bundle is False:
+        try:
+            _bundle = ImageBundle(BUNDLE_PATH)
+        except (OSError, ValueError):
+            _bundle = None
+
+    if _bundle is not None:
+        img = _bundle.load(img_path)
+        if img is not None:
+            return img
+
+    return pygame.image.load(img_path)
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -0,0 +1,133 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import sys, os, collections, weakref, pygame
+from pygame.locals import *
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.imageBundle import load_image
+
+class ImageCache():
+    """
+    Cache of images loaded from disk, keyed by file name.
+
+    Images are loaded (from the image bundle if possible; see load_image())
+    and convert_alpha()'d once and then shared by every sprite that asks for
+    the same file. Flipped copies of cached images are cached as well. The
+    surfaces handed out are shared, so they must not be drawn on; copy() them
+    first.
+
+    When the cached surfaces take up more than max_bytes, the least recently
+    used ones are dropped from the cache. Sprites still using a dropped
+    surface keep it; it's just loaded again the next time it's asked for.
+
+    @param max_bytes: Maximum size of all cached pixel data
+    """
+
+    def __init__(self, max_bytes=16*1024*1024):
+
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+
+        self.max_bytes = max_bytes
+        self.n_bytes = 0
+
+        # (path, flip_x, flip_y) -> surface, in least-recently-used order
+        self._surfaces = collections.OrderedDict()
+        # surface -> (path, flip_x, flip_y) for surfaces handed out by the
+        #   cache (lets flip() find the cache key of a surface)
+        self._keys = weakref.WeakKeyDictionary()
+
+
+    def load(self, img_path):
+        """
+        Get the image in file img_path.
+
+        Raises pygame.error if the file can't be loaded.
+        """
+
+        key = (img_path, False, False)
+        if key in self._surfaces:
+            self._surfaces.move_to_end(key)
+            return self._surfaces[key]
+
+        img = load_image(img_path).convert_alpha()
+        self._add(key, img)
+
+        return img
+
+
+    def flip(self, img, flip_x, flip_y):
+        """
+        Get a flipped copy of img.
+
+        Cached if img came from this cache; otherwise works just like
+        pygame.transform.flip().
+        """
+
+        if img not in self._keys:
+            return pygame.transform.flip(img, flip_x, flip_y)
+
+        path, img_x, img_y = self._keys[img]
+        key = (path, img_x != flip_x, img_y != flip_y)
+        if key in self._surfaces:
+            self._surfaces.move_to_end(key)
+            return self._surfaces[key]
+
+        flipped = pygame.transform.flip(img, flip_x, flip_y)
+        self._add(key, flipped)
+
+        return flipped
+
+
+    def clear(self):
+        """
+        Drop all cached images.
+        """
+
+        self._surfaces.clear()
+        self._keys.clear()
+        self.n_bytes = 0
+
+
+    def __len__(self):
+        return len(self._surfaces)
+
+
+    def _add(self, key, img):
+        """
+        Put img in the cache and evict old images if over max_bytes.
+
+        The newest image is never evicted, even if it alone is too big.
+        """
+
+        self._surfaces[key] = img
+        self._keys[img] = key
+        self.n_bytes += self._size(img)
+
+        while self.n_bytes > self.max_bytes and len(self._surfaces) > 1:
+            _, old = self._surfaces.popitem(last=False)
+            self._keys.pop(old, None)
+            self.n_bytes -= self._size(old)
+
+
+    def _size(self, img):
+        """
+        Bytes of pixel data in img.
+        """
+
+        return img.get_width() * img.get_height() * img.get_bytesize()
+
+
+# The cache shared by everything in the game
+image_cache = ImageCache()
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -0,0 +1,191 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import collections, pygame
+from pygame.locals import *
+
+class InputState(collections.namedtuple("InputState",
+        ["left", "right", "up", "down", "jump", "fire", "pause"])):
+    """
+    What the player is doing in one frame.
+
+    left, right, up, down, and jump are True while the control is held down.
+    fire and pause are True only in the frame in which they were pressed.
+    """
+
+    __slots__ = ()
+
+
+# Nothing pressed
+InputState.NONE = InputState(False, False, False, False, False, False, False)
+
+
+class InputSource():
+    """
+    Base class for things that control a Player.
+
+    Once per frame, whoever runs the game loop calls next_frame(), and then
+    the Level and the active Player read state. A plain InputSource never
+    presses anything; subclasses override _read().
+
+    Attributes:
+    state: InputState for the current frame
+    frame: Number of frames read so far
+    finished: True if the source has run out of input (after which it
+              doesn't press anything)
+    """
+
+    def __init__(self):
+
+        self.state = InputState.NONE
+        self.frame = 0
+        self.finished = False
+
+
+    def next_frame(self):
+        """
+        Move on to the next frame and update state.
+        """
+
+        self.state = self._read()
+        self.frame += 1
+
+
+    def _read(self):
+        """
+        Get the InputState for the next frame.
+        """
+
+        return InputState.NONE
+
+
+class KeyboardInput(InputSource):
+    """
+    Input from the keyboard.
+
+    Held controls are read with pygame.key.get_pressed(). Fire and pause are
+    key presses, so the game loop has to pass KEYDOWN events to
+    handle_event().
+    """
+
+    def __init__(self):
+
+        InputSource.__init__(self)
+
+        self._fire = False
+        self._pause = False
+
+
+    def handle_event(self, event):
+        """
+        Look at a pygame event for fire and pause key presses.
+        """
+
+        if event.type == KEYDOWN:
+            if event.key == K_f:
+                self._fire = True
+            elif event.key == K_p:
+                self._pause = True
+
+
+    def _read(self):
+        """
+        Read the keyboard.
+        """
+
+        keys = pygame.key.get_pressed()
+        state = InputState(bool(keys[K_LEFT]), bool(keys[K_RIGHT]),
+                           bool(keys[K_UP]), bool(keys[K_DOWN]),
+                           bool(keys[K_SPACE]), self._fire, self._pause)
+        self._fire = False
+        self._pause = False
+
+        return state
+
+
+class ScriptedInput(InputSource):
+    """
+    Input from a fixed script.
+
+    @param script: List of (frames, InputState) pairs; each InputState is
+                   used for that many frames in a row. (A fire or pause in a
+                   pair is repeated for every one of its frames.)
+    @param repeat: Start the script again from the top when it runs out
+                   (otherwise the source is finished)
+    """
+
+    def __init__(self, script, repeat=False):
+
+        InputSource.__init__(self)
+
+        for frames, state in script:
+            if frames < 0:
+                raise ValueError("Number of frames must be >= 0")
+            if not isinstance(state, InputState):
+                raise TypeError("Script must contain InputStates")
+
+        if repeat and sum(frames for frames, _ in script) == 0:
+            raise ValueError("A repeating script can't be empty")
+
+        self._script = script
+        self._repeat = repeat
+        # Position in script
+        self._i = 0
+        self._left = script[0][0] if len(script) > 0 else 0
+
+
+    def _read(self):
+        """
+        Get the next InputState from the script.
+        """
+
+        while self._left == 0:
+            self._i += 1
+            if self._i >= len(self._script):
+                if not self._repeat:
+                    self.finished = True
+                    return InputState.NONE
+                self._i = 0
+            self._left = self._script[self._i][0]
+
+        self._left -= 1
+        return self._script[self._i][1]
+
+
+class ProgrammaticInput(InputSource):
+    """
+    Input from a function (e.g., a bot).
+
+    @param callback: Called as callback(frame) once per frame; returns the
+                     InputState for that frame, or None when it's done
+    """
+
+    def __init__(self, callback):
+
+        InputSource.__init__(self)
+
+        self._callback = callback
+
+
+    def _read(self):
+        """
+        Ask the callback for the next InputState.
+        """
+
+        if self.finished:
+            return InputState.NONE
+
+        state = self._callback(self.frame)
+        if state is None:
+            self.finished = True
+            return InputState.NONE
+
+        return state
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -13,6 +13,16 @@ sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
 
 from Classes.wall import Wall
 from Classes.platform import Platform
+from Classes.barrierIndex import BarrierIndex
+from Classes.barrierGrid import BarrierGrid
+from Classes.barrierCompiler import BarrierCompiler
+from Classes.inputSource import InputSource
+from Classes.targetGroup import TargetGroup
+from Classes.projectileEngine import ProjectileEngine
+from Classes.baddieBatch import BaddieBatch
+from Classes.imageBundle import load_image
+from Classes.animation import frame_clock
+from Classes.eventLog import event_log, WARNING
 
 class Level():
     """"
@@ -24,6 +34,8 @@ class Level():
     @param baddie_classes: List of available Baddies
     @param power_ups: Dictionary of power-ups available to the player
     @param player_projectile_group: Where all Players' fired Projectiles go
+                                    (a pygame.sprite.RenderUpdates, ideally
+                                    a ProjectileEngine)
     @param decoration_list: Where PSprites that need decorations go
 
     Barrier attributes:
@@ -34,16 +46,67 @@ class Level():
 
     Each type of barrier is kept in a pygame.sprite.RenderPlain. While barriers
     can be drawn to the screen, it's assumed that this will only be for
-    debugging purposes. The level backdrop should contain all the artwork to
-    show a player where barriers are so that the actual Wall and Platform
-    objects don't need to be drawn. The level subclass should .add() any
-    barriers it needs to floors, ceilings, l_walls, r_walls.
+    debugging purposes (see dbg_draw()), so barriers don't make their images
+    until they're drawn (see Barrier). The level backdrop should contain all
+    the artwork to show a player where barriers are so that the actual Wall
+    and Platform objects don't need to be drawn. The level subclass should
+    .add() any barriers it needs to floors, ceilings, l_walls, r_walls.
+
+    Barriers are compiled into a BarrierIndex that is shared by every
+    PSprite in the Level (see barrier_index()). The index is built once, the
+    first time it is asked for, so all barriers must be added in the level
+    subclass's __init__. By default, the index is a BarrierGrid with cells of
+    barrier_cell_size pixels; a subclass can change the class variable, or set
+    it to None to use a plain sorted BarrierIndex.
+
+    Before the index is built, a BarrierCompiler tidies up the barrier Groups
+    (in place): touching barriers on the same line are merged, and barriers
+    outside play_area (if a subclass sets one) are dropped, with a warning in
+    the event log. Barriers closer than min_barrier_gap are reported in
+    barrier_report (the BarrierCompiler). Only set play_area to an area
+    sprites really can't leave (e.g., the inside of the standard box around
+    the level area).
 
     Character-related attributes:
     player_spawn_x: Player spawn point (x center)
     player_spawn_y: Player spawn point (y center)
+
+    The player and the baddies are kept in TargetGroups, so Projectiles only
+    test the Characters near them for hits. update() invalidates each
+    TargetGroup's spatial hash before the Projectiles aimed at it move.
+    A Level whose class sets batch_baddies has a BaddieBatch work out where
+    its baddies all move to in one go, in frames with at least that many
+    baddies (only worth it for very large crowds). Baddies that have gone are
+    pooled by class and reset (see Baddie.reset()) when a Baddie of their
+    class is spawned again.
+
+    Randomness:
+    rng: random.Random used for everything random in the Level and the
+         Characters in it. Seed it (rng.seed()) before the first update() to
+         make a game repeatable.
+
+    Input:
+    input: InputSource that controls the active player (see set_input()).
+           Whoever runs the game loop must call input.next_frame() before
+           each update().
+
+    Profiling:
+    profiler: FrameProfiler that update() laps its phases on, or None. The
+              game loop is in charge of begin_frame() and end_frame().
     """
 
+    # Cell size of the Level's BarrierGrid (None = no grid)
+    barrier_cell_size = 64
+    # Area that sprites can't leave; barriers outside it are dropped (None =
+    #   keep all barriers)
+    play_area = None
+    # Batch Baddie movement when there are at least this many Baddies (None =
+    #   every Baddie always moves itself; see BaddieBatch)
+    batch_baddies = None
+    # Barriers closer than this can be crossed together by the fastest
+    #   Projectiles (e.g., Blaster)
+    min_barrier_gap = 16
+
     def __init__(self, backdrop, baddie_classes, power_ups=None,
             player_projectile_group=None, decoration_list=None):
 
@@ -55,7 +118,7 @@ class Level():
         backdrop_f = os.path.join(image_dir, backdrop)
 
         try:
-            self.backdrop = pygame.image.load(backdrop_f)
+            self.backdrop = load_image(backdrop_f)
         except pygame.error:
             print("Cannot load", backdrop_f)
             raise SystemExit
@@ -69,13 +132,18 @@ class Level():
         self.l_walls = pygame.sprite.RenderPlain((Wall(639, 0, 480)))
         self.r_walls = pygame.sprite.RenderPlain((Wall(0, 0, 480)))
         self.ceilings = pygame.sprite.RenderPlain((Platform(0, 0, 640)))
+        # Built by barrier_index() once the subclass has added its barriers
+        self._barrier_index = None
+        self.barrier_report = None
 
     # the player and a pygame.sprite.Group containing the Player
         # The group is given to Projectiles and updated by the Level as needed
-        self._player_group = pygame.sprite.Group()
+        self._player_group = TargetGroup()
         self.player = None
     # Contains Players not currently in play
         self._player_stack = []
+    # Controls for the active player (nothing pressed until set_input())
+        self.input = InputSource()
     # Group where all Player-fired Projectiles go
         self._player_projectile_group = player_projectile_group
     # Group where all sprite decorations go
@@ -88,18 +156,36 @@ class Level():
     # Whether level is over
         self.dead = False
 
+    # Every game's animations and logged events count frames from 0
+        frame_clock.reset()
+
+    # Source of all randomness in the Level (see class docstring)
+        self.rng = random.Random()
+
+    # Optional FrameProfiler (see class docstring)
+        self.profiler = None
+
     # Baddies
         # Possible baddies
         self._baddie_classes = baddie_classes
         # Baddies in this level
-        self.baddies = pygame.sprite.RenderPlain()
+        self.baddies = TargetGroup()
         # Projectiles fired by Baddies
-        self.baddie_projectiles = pygame.sprite.RenderPlain()
+        self.baddie_projectiles = ProjectileEngine()
+        # Moves the baddies (made with the barrier index, on the first
+        #   update())
+        self._baddie_batch = None
+        # Spare Projectiles, by class, shared by every ProjectileBox in the
+        #   Level (see ProjectilePool)
+        self.projectile_pools = {}
+        # Baddies that have gone, by class, to be reset and reused by
+        #   _spawn_random_baddie()
+        self._baddie_pools = {}
 
     # Power-ups
         self._power_up_dict = power_ups
         self._populate_power_up_dict()
-        self._power_ups = pygame.sprite.RenderPlain()
+        self._power_ups = pygame.sprite.RenderUpdates()
 
 
     def update(self):
@@ -107,10 +193,39 @@ class Level():
         Generic level logic.
         """
 
-        self.baddies.update()
+        prof = self.profiler
+
+        # Animations are timed in Level updates
+        frame_clock.tick()
+
+        if self.input.state.fire:
+            self.player.fire()
+        if prof is not None:
+            prof.lap("players")
+
+        if self.batch_baddies is None:
+            self.baddies.update()
+        else:
+            if self._baddie_batch is None:
+                self._baddie_batch = BaddieBatch(self.barrier_index(),
+                                                 self.batch_baddies)
+            self._baddie_batch.prepare(self.baddies)
+            self.baddies.update()
+            self._baddie_batch.finish()
+        if prof is not None:
+            prof.lap("baddies")
+        # Targets have moved since Projectiles last looked for them
+        self._player_group.invalidate()
         self.baddie_projectiles.update()
+        if prof is not None:
+            prof.lap("baddie_projectiles")
         self._player_group.update()
+        if prof is not None:
+            prof.lap("players")
+        self.baddies.invalidate()
         self._player_projectile_group.update()
+        if prof is not None:
+            prof.lap("player_projectiles")
         if (self.player.dead):
             if len(self._player_stack) > 0:
                 centerx = self.player.rect.centerx
@@ -127,6 +242,10 @@ class Level():
     def clear(self, screen):
         """
         Clear stuff.
+
+        Returns a list of Rects of the screen that were cleared. Areas
+        cleared for sprites in the Level's Groups aren't in the list; they're
+        returned by draw() (the Groups are pygame.sprite.RenderUpdates).
         """
 
         self.baddies.clear(screen, self.backdrop)
@@ -134,22 +253,32 @@ class Level():
         self._player_group.clear(screen, self.backdrop)
         self._player_projectile_group.clear(screen, self.backdrop)
         self._power_ups.clear(screen, self.backdrop)
+
+        dirty = []
         for s in self._decoration_list:
-            s.clear_decoration(screen, self.backdrop)
+            dirty.append(s.clear_decoration(screen, self.backdrop))
+
+        return dirty
 
 
     def draw(self, screen):
         """
         Draw stuff.
+
+        Returns a list of Rects of the screen that were changed since the
+        last draw(), including where sprites were cleared from.
         """
 
+        dirty = []
         for s in self._decoration_list:
-            s.draw_decoration(screen)
-        self._power_ups.draw(screen)
-        self.baddies.draw(screen)
-        self.baddie_projectiles.draw(screen)
-        self._player_group.draw(screen)
-        self._player_projectile_group.draw(screen)
+            dirty.append(s.draw_decoration(screen))
+        dirty.extend(self._power_ups.draw(screen))
+        dirty.extend(self.baddies.draw(screen))
+        dirty.extend(self.baddie_projectiles.draw(screen))
+        dirty.extend(self._player_group.draw(screen))
+        dirty.extend(self._player_projectile_group.draw(screen))
+
+        return dirty
 
 
     def dbg_draw(self, screen):
@@ -164,6 +293,33 @@ class Level():
         self.ceilings.draw(screen)
 
 
+    def barrier_index(self):
+        """
+        Get the BarrierIndex of this Level's barriers.
+
+        Built on the first call (after the barriers are compiled; see class
+        docstring); meant to be handed to PSprites as kwargs["barrier_index"].
+        """
+
+        if self._barrier_index is None:
+            self.barrier_report = BarrierCompiler(self.play_area,
+                                                  self.min_barrier_gap)
+            self.barrier_report.compile(self.floors, self.l_walls,
+                                        self.r_walls, self.ceilings)
+            if len(self.barrier_report.dropped) > 0:
+                event_log.log(WARNING, "barriers_dropped", type(self).__name__,
+                              count=len(self.barrier_report.dropped))
+            if self.barrier_cell_size is None:
+                self._barrier_index = BarrierIndex(self.floors, self.l_walls,
+                                                   self.r_walls, self.ceilings)
+            else:
+                self._barrier_index = BarrierGrid(self.floors, self.l_walls,
+                                                  self.r_walls, self.ceilings,
+                                                  self.barrier_cell_size)
+
+        return self._barrier_index
+
+
     def fire(self):
         """
         Tell the primary player to fire.
@@ -182,6 +338,18 @@ class Level():
 
         self._player_group.add(plr)
         self.player = plr
+        plr.set_input(self.input)
+
+
+    def set_input(self, source):
+        """
+        Make the InputSource source control the active player (and any
+        player that becomes active later).
+        """
+
+        self.input = source
+        if self.player is not None:
+            self.player.set_input(source)
 
 
     def baddie_killed(self, baddie):
@@ -198,10 +366,12 @@ class Level():
         """
         Signal that a baddie should be removed from play.
 
-        Called by the Baddie.
+        Called by the Baddie. The Baddie is kept in its class's pool to be
+        spawned again later.
         """
 
         self.baddies.remove(baddie)
+        self._baddie_pools.setdefault(type(baddie), []).append(baddie)
 
 
     def _populate_power_up_dict(self):
@@ -228,6 +398,7 @@ class Level():
         self._player_stack.append(t_plr)
         self._player_group.add(plr)
         self.player = plr
+        plr.set_input(self.input)
 
 
     def _pop_player(self):
@@ -242,18 +413,31 @@ class Level():
         b_plr.activate()
         self._player_group.add(b_plr)
         self.player = b_plr
+        b_plr.set_input(self.input)
 
 
     def _spawn_random_baddie(self, centerx, centery):
         """
         Spawn a random Baddie and add it to baddies.
+
+        A Baddie of the chosen class that has gone (see baddie_gone()) is
+        reset and reused if there is one whose Projectiles have all come
+        back; otherwise a new Baddie is made.
         """
 
         if len(self._baddie_classes) == 0:
             return
 
-        i = random.randint(0, len(self._baddie_classes)-1)
-        baddie = sorted(self._baddie_classes.keys())[i]
+        i = self.rng.randint(0, len(self._baddie_classes)-1)
+        baddie_class = self._baddie_classes[sorted(self._baddie_classes)[i]]
+
+        pool = self._baddie_pools.get(baddie_class, [])
+        for j, baddie in enumerate(pool):
+            if baddie._box.in_flight() == 0:
+                del pool[j]
+                baddie.reset(centerx, centery)
+                self.baddies.add(baddie)
+                return
 
         kwargs = {"owner"             : self,
                   "centerx"           : centerx,
@@ -262,11 +446,13 @@ class Level():
                   "l_walls"           : self.l_walls,
                   "r_walls"           : self.r_walls,
                   "ceilings"          : self.ceilings,
+                  "barrier_index"     : self.barrier_index(),
                   "fired_projectiles" : self.baddie_projectiles,
                   "targets"           : self._player_group,
+                  "projectile_pools"  : self.projectile_pools,
                   "decoration_list"   : self._decoration_list}
 
-        self.baddies.add(self._baddie_classes[baddie](kwargs))
+        self.baddies.add(baddie_class(kwargs))
 
 
 if __name__ == '__main__':
@@ -5,10 +5,15 @@
 # This software comes with ABSOLUTELY NO WARRANTY.
 # See GPLv3.txt for details.
 
-import pygame
+import sys, os, pygame
 from pygame.locals import *
 
-class Platform(pygame.sprite.Sprite):
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.barrier import Barrier
+
+class Platform(Barrier):
     """Horizontal barrier
 
     Platforms can be passed through from the sides and either the top or
@@ -21,11 +26,12 @@ class Platform(pygame.sprite.Sprite):
     (Platform height is always 1.)
     """
 
+    __slots__ = ()
+
+    color = (0, 255, 0)
+
     def __init__(self, left, top, width):
-        pygame.sprite.Sprite.__init__(self)
-        self.rect = pygame.Rect(left, top, width, 1)
-        self.image = pygame.Surface((self.rect[2], self.rect[3]))
-        self.image.fill((0, 255, 0))
+        Barrier.__init__(self, pygame.Rect(left, top, width, 1))
 
 
 if __name__ == '__main__':
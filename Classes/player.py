@@ -14,6 +14,9 @@ sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
 from Classes.character import Character
 from Classes.baddie import Baddie
 from Classes.projectileBox import ProjectileBox
+from Classes.imageCache import image_cache
+from Classes.inputSource import InputSource
+from Classes.eventLog import event_log, INFO
 
 class Player(Character):
     """
@@ -43,18 +46,21 @@ class Player(Character):
         targets: pygame.sprite.Group of Baddies this Player could hit
         fired_projectiles: pygame.sprite.Group where fired Projectiles go
         ... and whatever is required by Character
+
+    kwargs can contain:
+        projectile_pools: Passed on to the Player's ProjectileBox
+
+    A Player is controlled by an InputSource, which is set by the Level with
+    set_input() when the Player becomes the active player.
     """
 
     def __init__(self, kwargs):
 
         Character.__init__(self, kwargs)
 
-        self._populate_images()
-
-        # TODO: Move animation cycling to PSprite?
-        self._walk_ctr = 0 # Walk cycle counter
         self._fpi = kwargs["fpi"]
-        self._prev_image_series = "none" # Name of previous animation
+        self._compile_animation(self._fpi)
+        self.image = self._images['neutral']
 
         # Signal that this Player has died
         self.dead = False
@@ -85,6 +91,8 @@ class Player(Character):
         self._j_b = kwargs["jump_velocity"]
         self._j_t = None
         self._j_o = -self._j_b / self._j_a
+        # Where control input comes from (see set_input())
+        self._input = InputSource()
         # Vertical point direction ((-1, 0, 1) == (down, forward, up))
         self._point_v = 0
         # Horizontal point direction ((-1, 1) == (left, right))
@@ -114,6 +122,7 @@ class Player(Character):
                     "l_walls"           : kwargs["l_walls"],
                     "r_walls"           : kwargs["r_walls"],
                     "ceilings"          : kwargs["ceilings"],
+                    "barrier_index"     : self._barrier_index,
                     "projectile_class"  : kwargs["projectile_class"],
                     "fired_projectiles" : self.fired_projectiles,
                     "max_in_flight"     : kwargs["max_in_flight"],
@@ -122,6 +131,8 @@ class Player(Character):
                     "centerx"           : 0,
                     "centery"           : 0,
                     "decoration_list"   : kwargs["decoration_list"]}
+        if "projectile_pools" in kwargs:
+            b_kwargs["projectile_pools"] = kwargs["projectile_pools"]
         self._box = ProjectileBox(b_kwargs)
 
     # Stack of Boxes
@@ -266,16 +277,17 @@ class Player(Character):
         if self.hp <= 0:
             return
 
-        print("Character hit")
-
         if self._hit_counter == 0:
             self._decoration_list.append(self)
 
         self.hp -= projectile.damage
         self._hit_counter = 5
 
+        event_log.log(INFO, "hit", type(self).__name__,
+                      damage=projectile.damage, hp=self.hp)
+
         if self.hp <= 0:
-            print("Character died")
+            event_log.log(INFO, "died", type(self).__name__)
             # The following can only happen if something can damage an
             #   invincible Player
             #if self._invincible_counter > 0:
@@ -294,15 +306,16 @@ class Player(Character):
         if not self.active:
             return
 
-        print("Character hurt")
-
         self.hp -= hp
         if self._invincible_counter == 0 and self._hit_counter == 0:
             self._decoration_list.append(self)
         self._hit_counter = 5
 
+        event_log.log(INFO, "hurt", type(self).__name__, damage=hp,
+                      hp=self.hp)
+
         if self.hp <= 0:
-            print("Character died")
+            event_log.log(INFO, "died", type(self).__name__)
         else:
             self._invincible_counter = 60
 
@@ -409,13 +422,13 @@ class Player(Character):
         if self._hit_counter > 0:
             self._dec_hit_rect.centerx = self.rect.centerx
             self._dec_hit_rect.centery = self.rect.centery
-            screen.blit(self._dec_hit_surf, self._dec_hit_rect)
+            return screen.blit(self._dec_hit_surf, self._dec_hit_rect)
         elif self._invincible_counter > 0:
             self._dec_invinc_rect.centerx = self.rect.centerx
             self._dec_invinc_rect.centery = self.rect.centery
-            screen.blit(self._dec_invinc_surf, self._dec_invinc_rect)
+            return screen.blit(self._dec_invinc_surf, self._dec_invinc_rect)
         else:
-            Character.draw_decoration(self, screen)
+            return Character.draw_decoration(self, screen)
 
 
     def clear_decoration(self, screen, background):
@@ -424,12 +437,21 @@ class Player(Character):
         """
 
         if self._hit_counter > 0:
-            screen.blit(background, self._dec_hit_rect, self._dec_hit_rect)
+            return screen.blit(background, self._dec_hit_rect,
+                self._dec_hit_rect)
         elif self._invincible_counter > 0:
-            screen.blit(background, self._dec_invinc_rect,
+            return screen.blit(background, self._dec_invinc_rect,
                 self._dec_invinc_rect)
         else:
-            Character.clear_decoration(self, screen, background)
+            return Character.clear_decoration(self, screen, background)
+
+
+    def set_input(self, source):
+        """
+        Make the InputSource source control this Player.
+        """
+
+        self._input = source
 
 
     def activate(self):
@@ -456,7 +478,7 @@ class Player(Character):
 
     def _get_movement(self, mx):
         """
-        Read the keyboard and figure out maximum player movement.
+        Read the controls and figure out maximum player movement.
         """
 
         # Number of pixels to move player horizontally and vertically
@@ -464,7 +486,7 @@ class Player(Character):
         dy = 0.0
 
         # Get and handle input
-        keys = pygame.key.get_pressed()
+        keys = self._input.state
 
         # RIGHT and LEFT adjust momentum, not location, so player can skid
         # Horizontal pointing is always either left or right
@@ -472,14 +494,14 @@ class Player(Character):
         #   exactly 0.0 while the user is providing input. This prevents the
         #   sprite from going to 'stand' when the player is moving (bit of a
         #   hack).
-        if keys[K_RIGHT]:
+        if keys.right:
             mx += 1.0004
             self._point_h = 1
-        if keys[K_LEFT]:
+        if keys.left:
             mx -= 1.0005
             self._point_h = -1
         # If neither RIGHT NOR LEFT is pressed, reduce momentum toward 0.0
-        if not keys[K_RIGHT] and not keys[K_LEFT]:
+        if not keys.right and not keys.left:
             if mx >= 1.0:
                 mx -= 1.0
             elif mx <= -1.0:
@@ -487,15 +509,15 @@ class Player(Character):
             elif abs(mx) < 1.0:
                 mx = 0.0
 
-        if keys[K_UP]:
+        if keys.up:
             self._point_v = 1
-        elif keys[K_DOWN]:
+        elif keys.down:
             self._point_v = -1
         else:
             self._point_v = 0
 
         # Jumping logic
-        if keys[K_SPACE]:
+        if keys.jump:
             # If the player can jump and SPACE was not pressed during
             #   previous update()
             if self._jumps < self._j_multi and not self._k_space:
@@ -565,12 +587,46 @@ class Player(Character):
                 if len(self._images[pos]['left'][gaze]) == 0:
                     for img in self._images[pos]['right'][gaze]:
                         self._images[pos]['left'][gaze].append(
-                            pygame.transform.flip(img, True, False))
+                            image_cache.flip(img, True, False))
 
         if 'dead' not in self._images:
             self._images['dead'] = [self._images['neutral']]
 
 
+    # Animation state ids (see _animation_series()): a pose, plus _LEFT if
+    #   facing left, plus a gaze
+    _WALK = 0
+    _STAND = 6
+    _FLY = 12
+    _LEFT = 3
+    _UP = 0
+    _STRAIGHT = 1
+    _DOWN = 2
+    _DEAD = 18
+
+    def _animation_series(self):
+        """
+        Get the Player's animation states (see PSprite._compile_animation()).
+
+        Each state's id is made from the constants above (see
+        _update_image()).
+        """
+
+        series = [None] * (Player._DEAD + 1)
+        for pose, p_id in [('walk', Player._WALK), ('stand', Player._STAND),
+                           ('fly', Player._FLY)]:
+            for direction, d_id in [('right', 0), ('left', Player._LEFT)]:
+                for gaze, g_id in [('up', Player._UP),
+                                   ('straight', Player._STRAIGHT),
+                                   ('down', Player._DOWN)]:
+                    series[p_id + d_id + g_id] = \
+                        (self._images[pose][direction][gaze], True)
+        # Dying animation freezes on last frame for dramatic effect!!
+        series[Player._DEAD] = (self._images['dead'], False)
+
+        return series
+
+
     def _update_image(self):
         """
         Update image used for sprite based on state at the end of update().
@@ -578,42 +634,30 @@ class Player(Character):
 
         # Handle dying case
         if self.hp <= 0:
-            series = self._images['dead']
+            self._animate(Player._DEAD)
+            return
+
+        # Determine position (walking, standing, or flying)
+        if self._floor is None:
+            state = Player._FLY
+        elif self._mx != 0.0:
+            state = Player._WALK
         else:
-            # Determine position (flying, walking, or standing)
-            if self._floor is None:
-                series = self._images['fly']
-            elif self._mx != 0.0:
-                series = self._images['walk']
-            else:
-                series = self._images['stand']
-
-            # Determine direction (right or left)
-            if self._point_h == 1:
-                series = series['right']
-            else:
-                series = series['left']
-
-            # Determine gaze (up, straight, or down)
-            if self._point_v == 1:
-                series = series['up']
-            elif self._point_v == 0:
-                series = series['straight']
-            else:
-                series = series['down']
-
-        if series is not self._prev_image_series:
-            self._prev_image_series = series
-            self._walk_ctr = 0
-
-        self.image = series[self._walk_ctr // self._fpi]
+            state = Player._STAND
 
-        # Dying animation freezes on last frame for dramatic effect!!
-        if self.hp <= 0:
-            if len(series) * self._fpi - 1 > self._walk_ctr:
-                self._walk_ctr += 1
+        # Determine direction (right or left)
+        if self._point_h != 1:
+            state += Player._LEFT
+
+        # Determine gaze (up, straight, or down)
+        if self._point_v == 1:
+            state += Player._UP
+        elif self._point_v == -1:
+            state += Player._DOWN
         else:
-            self._walk_ctr = (self._walk_ctr + 1) % (len(series) * self._fpi)
+            state += Player._STRAIGHT
+
+        self._animate(state)
 
 
 if __name__ == '__main__':
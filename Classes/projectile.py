@@ -12,6 +12,7 @@ from pygame.locals import *
 sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
 
 from Classes.psprite import PSprite
+from Classes.targetGroup import TargetGroup
 
 class Projectile(PSprite):
     """
@@ -36,12 +37,16 @@ class Projectile(PSprite):
         walls: pygame.Group of Walls that are used as vertical obstacles
         speed: How fast this type of Projectile moves
         damage: How many HP damage this Projectile does
-        targets: Characters that this Projectile might hit
+        targets: Characters that this Projectile might hit (faster if
+                 it's a TargetGroup)
         ... and whatever is required by PSprite
 
     kwargs can contain:
         radius: How big the Projectile is when calculating target collisions
                 (inferred from image size if not given)
+        number: How many Projectiles of this class its ProjectilePool made
+                before this one (lets a class make its Projectiles a little
+                different from each other without any class state)
 
     class variables:
         default_max_in_flight: Suggested value for how many of these
@@ -53,6 +58,8 @@ class Projectile(PSprite):
                             (usually 1)
         icon: File of an icon image for the Projectile (Projectile image used
                 (if not given)
+        angle_step: Directions are rounded to this many degrees when picking
+                    a rotated image (the direction of travel isn't rounded)
 
     *Projectile Collisions*
 
@@ -72,6 +79,7 @@ class Projectile(PSprite):
     default_number_shots = 30
     default_multi_shot = 1
     icon = None
+    angle_step = 1
 
     def __init__(self, kwargs):
 
@@ -119,7 +127,6 @@ class Projectile(PSprite):
         I.e, 0=right, 90=down, 180=left, 270=up.
         """
 
-        self.image = self._images[0]
         # _dir is direction in range [0, 360) degrees, but stored in radians
         #   to avoid repeated conversion to radians later
         self._dir = math.radians(direction % 360)
@@ -127,11 +134,9 @@ class Projectile(PSprite):
         #       Projectiles that change direction mid-flight
         # If a Projectile adjusts _c_rect, then its reset() will need to make
         #   the adjustment after Projectile.reset() is called
-        # math.sin(), math.cos() are left-handed b/c pygame's y is flipped.
-        #   pygames' rotate is right-handed.
-        self.image = pygame.transform.rotate(self._images[0], -direction)
-        self.rect = self.image.get_rect()
-        self._c_rect = self.rect.copy()
+        self.image, size = self._rotated_image(direction)
+        self.rect.size = size
+        self._c_rect.size = size
         self._xf = centerx
         self._yf = centery
         self.rect.centerx = round(self._xf)
@@ -142,6 +147,30 @@ class Projectile(PSprite):
         self.has_collided = False
 
 
+    def _rotated_image(self, direction):
+        """
+        Get the image rotated to point in direction, and its size.
+
+        Rotated images are kept in a table shared by all Projectiles of the
+        same class, keyed by direction rounded to angle_step degrees. Each
+        entry is only made the first time it's needed.
+        """
+
+        cls = type(self)
+        # Each subclass needs its own table, not one inherited from a parent
+        if "_rotations" not in cls.__dict__:
+            cls._rotations = {}
+
+        angle = round(direction / cls.angle_step) * cls.angle_step % 360
+        if angle not in cls._rotations:
+            # math.sin(), math.cos() are left-handed b/c pygame's y is
+            #   flipped. pygames' rotate is right-handed.
+            img = pygame.transform.rotate(self._images[0], -angle)
+            cls._rotations[angle] = (img, img.get_size())
+
+        return cls._rotations[angle]
+
+
     def update(self):
         """
         Update Projectile location and do collision detection.
@@ -175,8 +204,12 @@ class Projectile(PSprite):
         self._c_rect.centerx = self.rect.centerx
         self._c_rect.centery = self.rect.centery
 
-        targets = pygame.sprite.spritecollide(self, self.targets, False,
-            pygame.sprite.collide_circle)
+        # A TargetGroup only tests the targets near this Projectile
+        if isinstance(self.targets, TargetGroup):
+            targets = self.targets.collide_circle(self)
+        else:
+            targets = pygame.sprite.spritecollide(self, self.targets, False,
+                pygame.sprite.collide_circle)
 
         # Hit first active target
         if len(targets) != 0:
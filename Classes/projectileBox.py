@@ -13,6 +13,7 @@ sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
 
 from Classes.psprite import PSprite
 from Classes.projectile import Projectile
+from Classes.projectilePool import ProjectilePool
 
 class ProjectileBox(PSprite):
     """
@@ -39,6 +40,12 @@ class ProjectileBox(PSprite):
         centerx: X-coordinate (only needed if Box is to be drawn)
         centery: Y-coordinate (only needed if Box is to be drawn)
         ... and whatever is required by PSprite
+
+    kwargs can contain:
+        projectile_pools: Dictionary of Projectile class -> ProjectilePool
+                          that the Box borrows its Projectiles from (a pool
+                          for projectile_class is added if missing). Without
+                          it, the Box has a pool of its own.
     """
 
     def __init__(self, kwargs):
@@ -75,19 +82,33 @@ class ProjectileBox(PSprite):
         # How many Projectiles fire() actually fires
         self._multi_shot = self.projectile_class.default_multi_shot
 
-    # Create Projectiles
+    # Where Projectiles come from
         self.fired_projectiles = kwargs["fired_projectiles"]
-        self.unused_projectiles = pygame.sprite.RenderPlain()
-
-        p_kwargs = {"owner"           : self,
-                    "platforms"       : pygame.sprite.Group(
-                                          kwargs["floors"].sprites(),
-                                          kwargs["ceilings"].sprites()),
-                    "walls"           : pygame.sprite.Group(
-                                          kwargs["l_walls"].sprites(),
-                                          kwargs["r_walls"].sprites()),
-                    "targets"         : kwargs["targets"],
-                    "decoration_list" : kwargs["decoration_list"]}
+
+        # Projectiles are given targets when they're fired
+        self._targets = kwargs["targets"]
+        if self._targets is None:
+            self._targets = pygame.sprite.RenderPlain()
+
+        if "projectile_pools" in kwargs:
+            pools = kwargs["projectile_pools"]
+        else:
+            pools = {}
+
+        if self.projectile_class not in pools:
+            p_kwargs = {"platforms"       : pygame.sprite.Group(
+                                              kwargs["floors"].sprites(),
+                                              kwargs["ceilings"].sprites()),
+                        "walls"           : pygame.sprite.Group(
+                                              kwargs["l_walls"].sprites(),
+                                              kwargs["r_walls"].sprites()),
+                        "decoration_list" : kwargs["decoration_list"]}
+            # Projectiles are stopped by barriers from both sides
+            if self._barrier_index is not None:
+                p_kwargs["barrier_index"] = self._barrier_index.two_way()
+            pools[self.projectile_class] = ProjectilePool(
+                self.projectile_class, p_kwargs)
+        self._pool = pools[self.projectile_class]
 
         if "max_in_flight" not in kwargs:
             self.max_in_flight = 5
@@ -97,16 +118,16 @@ class ProjectileBox(PSprite):
             self.max_in_flight = kwargs["max_in_flight"]
 
         self.max_in_flight *= self._multi_shot
-
-        while len(self.unused_projectiles) < self.max_in_flight:
-            self.unused_projectiles.add(self.projectile_class(p_kwargs))
+        # Number of this Box's Projectiles in flight (max_in_flight is a quota
+        #   on borrowing from the pool)
+        self._in_flight = 0
 
     # Fill in Sprite stuff
         # If no icon given, copy a Projectile's image
         # _has_icon is if the Projectile has defined an icon image
         if self._images is None:
             self._has_icon = False
-            self.image = self.unused_projectiles.sprites()[0].image.copy()
+            self.image = self._pool.image().copy()
         else:
             self._has_icon = True
             self.image = self._images
@@ -132,18 +153,21 @@ class ProjectileBox(PSprite):
 
         Returns the Projectiles fired so the caller can reset() them.
 
-        Caller must ensure num Projectiles are available (e.g., with
-        avail_projectiles()).
+        No more than avail_projectiles() are fired, however big num is.
         """
 
+        num = min(num, self.avail_projectiles())
+        if num <= 0:
+            return []
+
         self._shots_fired += num
 
         # self._shots_fired > self._max_shots shouldn't actually happen
         if self._max_shots > 0 and self._shots_fired >= self._max_shots:
             self.owner.box_empty(self)
 
-        prs = self.unused_projectiles.sprites()[0:num*self._multi_shot]
-        self.unused_projectiles.remove(prs)
+        prs = self._pool.borrow(num*self._multi_shot, self, self._targets)
+        self._in_flight += len(prs)
         self.fired_projectiles.add(prs)
 
         return prs
@@ -153,26 +177,30 @@ class ProjectileBox(PSprite):
         """
         Signal that a Projectile owned by this Box has hit a target.
 
-        Moves the Projectile back to the unused group and signals the Box's
-        owner.
+        Gives the Projectile back to the pool and signals the Box's owner.
 
         This function is called by the Projectile.
         """
 
-        self.fired_projectiles.remove(projectile)
-        self.unused_projectiles.add(projectile)
+        self.recycle(projectile)
         self.owner.hit_a_target(projectile, target)
 
 
     def recycle(self, projectile):
         """
-        Move the projectile from the fired to the unused group.
+        Take the Projectile out of the fired group and give it back to the
+        pool.
 
         Gets rid of a Projectile without it hitting something.
         """
 
+        # Already back (e.g., it hit a barrier and a target at once)
+        if not self.fired_projectiles.has(projectile):
+            return
+
         self.fired_projectiles.remove(projectile)
-        self.unused_projectiles.add(projectile)
+        self._in_flight -= 1
+        self._pool.give_back(projectile)
 
 
     def avail_projectiles(self):
@@ -180,11 +208,32 @@ class ProjectileBox(PSprite):
         Check how many Projectiles are available to be fired.
         """
 
+        avail = (self.max_in_flight - self._in_flight) // self._multi_shot
+
         if self._max_shots < 0:
-            return len(self.unused_projectiles) // self._multi_shot
+            return avail
         else:
-            return min(len(self.unused_projectiles) // self._multi_shot,
-                       self._max_shots-self._shots_fired)
+            return min(avail, self._max_shots-self._shots_fired)
+
+
+    def in_flight(self):
+        """
+        Check how many of this Box's Projectiles have been fired and not come
+        back yet.
+        """
+
+        if self.projectile_class is None:
+            return 0
+
+        return self._in_flight
+
+
+    def projectile_image(self):
+        """
+        Get the (unrotated) image of this Box's Projectiles.
+        """
+
+        return self._pool.image()
 
 
     def enable_box(self):
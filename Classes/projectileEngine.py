@@ -0,0 +1,302 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import sys, os, math, pygame
+
+# NumPy is optional; without it, a ProjectileEngine is a plain RenderUpdates
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.projectile import Projectile
+
+class ProjectileEngine(pygame.sprite.RenderUpdates):
+    """
+    A Group of in-flight Projectiles that moves them all at once.
+
+    Use it as the fired_projectiles Group of ProjectileBoxes. ProjectileBox
+    fire() and recycle() add and remove Projectiles as usual, and update()
+    works like it does for any Group, so Characters don't know the
+    difference.
+
+    Inside, update() keeps the positions, velocities, and sizes of the
+    Projectiles in NumPy arrays (structure of arrays), advances them all in
+    one step, and tests them against barriers and targets in bulk. Only the
+    Projectiles that hit something are dealt with one at a time, in Group
+    order, so the results are exactly those of calling every Projectile's
+    update().
+
+    While the engine is running, a Projectile's _xf, _yf, rect, and _c_rect
+    aren't kept up to date. draw() brings them up to date first; anything
+    else that wants them should call sync(). A Projectile that hits something
+    is brought up to date before anybody is told about it, and so is a
+    Projectile removed from the Group.
+
+    update() falls back to calling each Projectile's update() if:
+        - NumPy isn't installed or enabled is False
+        - there are fewer than min_projectiles Projectiles (the overhead of
+          setting up the arrays isn't worth it)
+        - a Projectile overrides Projectile.update()
+        - the Projectiles don't all share one barrier index and one targets
+          Group
+    """
+
+    # Set to False to never use the engine
+    enabled = True
+    # Smallest number of Projectiles worth using the engine for
+    min_projectiles = 24
+
+    def __init__(self):
+
+        pygame.sprite.RenderUpdates.__init__(self)
+
+        # Projectile -> slot in the arrays
+        self._slots = {}
+        # Unused slots
+        self._free = []
+        # Arrays by name, all the same length (see _grow())
+        self._arrays = {}
+        # Barrier index and targets that the loaded Projectiles share
+        self._index = None
+        self._targets = None
+
+
+    def update(self):
+        """
+        Update all Projectiles (see class docstring).
+        """
+
+        if not self._can_run():
+            self._unload()
+            pygame.sprite.RenderUpdates.update(self)
+            return
+
+        sprites = self.sprites()
+        slots = []
+        for pr in sprites:
+            if pr in self._slots:
+                slots.append(self._slots[pr])
+            else:
+                slots.append(self._load(pr))
+
+        self._step(sprites, slots)
+
+
+    def draw(self, surface):
+        """
+        Bring Projectiles up to date and draw them.
+        """
+
+        self.sync()
+        return pygame.sprite.RenderUpdates.draw(self, surface)
+
+
+    def sync(self):
+        """
+        Bring the positions of all Projectiles up to date.
+        """
+
+        for pr, slot in self._slots.items():
+            self._store(pr, slot)
+
+
+    def remove_internal(self, sprite):
+        pygame.sprite.RenderUpdates.remove_internal(self, sprite)
+        slot = self._slots.pop(sprite, None)
+        if slot is not None:
+            self._store(sprite, slot)
+            self._free.append(slot)
+
+
+    def _can_run(self):
+        """
+        Check whether update() can use the engine.
+        """
+
+        if numpy is None or not self.enabled or \
+                len(self) < self.min_projectiles:
+            return False
+
+        for pr in self.spritedict:
+            if pr in self._slots:
+                continue
+            if type(pr).update is not Projectile.update or \
+                    pr._barrier_index is None:
+                return False
+            if len(self._slots) == 0 and self._index is None:
+                self._index = pr._barrier_index
+                self._targets = pr.targets
+            elif pr._barrier_index is not self._index or \
+                    pr.targets is not self._targets:
+                return False
+
+        return True
+
+
+    def _unload(self):
+        """
+        Hand all Projectiles back to their own update().
+        """
+
+        if len(self._slots) > 0:
+            self.sync()
+            self._slots = {}
+            self._free = list(range(len(self._arrays["xf"])))
+        self._index = None
+        self._targets = None
+
+
+    def _load(self, pr):
+        """
+        Copy a Projectile's state into a free slot. Returns the slot.
+        """
+
+        if len(self._free) == 0:
+            self._grow()
+        slot = self._free.pop()
+        self._slots[pr] = slot
+
+        a = self._arrays
+        a["xf"][slot] = pr._xf
+        a["yf"][slot] = pr._yf
+        # Same arithmetic as Projectile.update()
+        a["vx"][slot] = math.cos(pr._dir) * pr._speed
+        a["vy"][slot] = math.sin(pr._dir) * pr._speed
+        a["w"][slot] = pr._c_rect.width
+        a["h"][slot] = pr._c_rect.height
+        a["radius"][slot] = pr.radius
+
+        return slot
+
+
+    def _store(self, pr, slot):
+        """
+        Copy a Projectile's position from the arrays back to the Projectile.
+        """
+
+        pr._xf = float(self._arrays["xf"][slot])
+        pr._yf = float(self._arrays["yf"][slot])
+        pr.rect.centerx = round(pr._xf)
+        pr.rect.centery = round(pr._yf)
+        pr._c_rect.centerx = pr.rect.centerx
+        pr._c_rect.centery = pr.rect.centery
+
+
+    def _grow(self):
+        """
+        Make room for more Projectiles.
+        """
+
+        old = len(self._arrays["xf"]) if len(self._arrays) > 0 else 0
+        new = max(64, old * 2)
+        for name in ["xf", "yf", "vx", "vy", "radius"]:
+            array = numpy.zeros(new, dtype=numpy.float64)
+            if old > 0:
+                array[:old] = self._arrays[name]
+            self._arrays[name] = array
+        for name in ["w", "h"]:
+            array = numpy.zeros(new, dtype=numpy.int64)
+            if old > 0:
+                array[:old] = self._arrays[name]
+            self._arrays[name] = array
+        self._free.extend(range(new - 1, old - 1, -1))
+
+
+    def _step(self, sprites, slots):
+        """
+        Move the Projectiles in sprites (with their slots) and deal with the
+        ones that hit something.
+        """
+
+        np = numpy
+        a = self._arrays
+        idx = np.array(slots, dtype=numpy.intp)
+        n = len(slots)
+
+        xf = a["xf"][idx]
+        yf = a["yf"][idx]
+        vx = a["vx"][idx]
+        vy = a["vy"][idx]
+        w = a["w"][idx]
+        h = a["h"][idx]
+
+    # Barriers, before moving (see Projectile.update() and
+    #   BarrierIndex.sweep())
+        cx = np.rint(xf).astype(np.int64)
+        cy = np.rint(yf).astype(np.int64)
+        dx = np.rint(vx + xf - cx).astype(np.int64)
+        dy = np.rint(vy + yf - cy).astype(np.int64)
+        left = cx - w // 2
+        top = cy - h // 2
+        _, _, obsx, obsy = self._index.sweep_all(left, top, left + w,
+                                                 top + h, dx, dy)
+
+    # Move
+        xf += vx
+        yf += vy
+        a["xf"][idx] = xf
+        a["yf"][idx] = yf
+
+    # Targets, after moving
+        targets = self._targets.sprites()
+        if len(targets) > 0:
+            tx = np.array([t.rect.centerx for t in targets], dtype=np.int64)
+            ty = np.array([t.rect.centery for t in targets], dtype=np.int64)
+            tr = np.array([self._radius(t) for t in targets],
+                          dtype=np.float64)
+            cx = np.rint(xf).astype(np.int64)
+            cy = np.rint(yf).astype(np.int64)
+            ddx = cx[:, None] - tx[None, :]
+            ddy = cy[:, None] - ty[None, :]
+            reach = a["radius"][idx][:, None] + tr[None, :]
+            hits = ddx * ddx + ddy * ddy <= reach * reach
+            any_hit = hits.any(axis=1)
+        else:
+            any_hit = np.zeros(n, dtype=bool)
+
+    # Deal with Projectiles that hit something, one at a time, in order
+        for i in np.nonzero((obsx != None) | (obsy != None) | any_hit)[0]:
+            pr = sprites[i]
+            self._store(pr, slots[i])
+            if obsx[i] is not None:
+                pr._owner.hit_a_target(pr, obsx[i])
+                pr.has_collided = True
+            elif obsy[i] is not None:
+                pr._owner.hit_a_target(pr, obsy[i])
+                pr.has_collided = True
+
+            if any_hit[i]:
+                # Hit first active target
+                for j in np.nonzero(hits[i])[0]:
+                    target = targets[j]
+                    if target.active:
+                        target.got_hit(pr, pr._owner)
+                        pr._owner.hit_a_target(pr, target)
+                        pr.has_collided = True
+                        break
+
+
+    @staticmethod
+    def _radius(sprite):
+        """
+        Collision radius of a target, like pygame.sprite.collide_circle().
+        """
+
+        try:
+            return sprite.radius
+        except AttributeError:
+            rect = sprite.rect
+            sprite.radius = 0.5 * ((rect.width**2 + rect.height**2) ** 0.5)
+            return sprite.radius
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
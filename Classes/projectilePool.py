@@ -0,0 +1,95 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import collections
+
+class ProjectilePool():
+    """
+    Spare Projectiles of one class, shared by ProjectileBoxes.
+
+    A ProjectileBox borrows Projectiles when it fires and gives them back
+    when they hit something or are recycled. New Projectiles are only made
+    when there are no spares, so a pool ends up with as many Projectiles as
+    were ever in flight at once, rather than every Box keeping max_in_flight
+    of its own. Spares are handed out oldest first (Projectiles of a class
+    aren't always all alike; e.g., Blaster pulses have different speeds).
+    Each pool counts the Projectiles it makes, so they come out the same in
+    every game.
+
+    A Projectile's owner (its Box) and targets are set each time it's
+    borrowed. Everything else a Projectile is made with (barriers, etc.)
+    comes from kwargs, so all Boxes sharing a pool must be in the same Level.
+    A Level keeps its pools in a dict of Projectile class -> ProjectilePool
+    (see Level.projectile_pools).
+
+    @param projectile_class: The Projectile class in the pool
+    @param kwargs: kwargs for making a Projectile (see ProjectileBox); owner
+                   and targets are replaced when it's borrowed
+    """
+
+    def __init__(self, projectile_class, kwargs):
+
+        self.projectile_class = projectile_class
+        self._kwargs = kwargs
+        # Oldest first
+        self._spare = collections.deque()
+        # Number of Projectiles made (see Projectile's kwargs["number"])
+        self.made = 0
+
+
+    def __len__(self):
+        """
+        Number of spare Projectiles.
+        """
+
+        return len(self._spare)
+
+
+    def borrow(self, num, owner, targets):
+        """
+        Get num Projectiles for owner to fire at targets.
+        """
+
+        prs = []
+        while len(prs) < num:
+            if len(self._spare) > 0:
+                pr = self._spare.popleft()
+                pr._owner = owner
+                pr.targets = targets
+            else:
+                kwargs = dict(self._kwargs)
+                kwargs["owner"] = owner
+                kwargs["targets"] = targets
+                kwargs["number"] = self.made
+                pr = self.projectile_class(kwargs)
+                self.made += 1
+            prs.append(pr)
+
+        return prs
+
+
+    def give_back(self, projectile):
+        """
+        Put a Projectile that's no longer in flight back in the pool.
+        """
+
+        self._spare.append(projectile)
+
+
+    def image(self):
+        """
+        Get the (unrotated) image of this pool's Projectiles.
+        """
+
+        if len(self._spare) == 0:
+            self._spare.extend(self.borrow(1, None, None))
+
+        return self._spare[0]._images[0]
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -8,6 +8,14 @@
 import sys, os, inspect, pygame
 from pygame.locals import *
 
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.barrierIndex import BarrierIndex
+from Classes.imageCache import image_cache
+from Classes.textureAtlas import TextureAtlas
+from Classes.animation import Animation, frame_clock
+
 class PSprite(pygame.sprite.Sprite):
     """
     Base class for all sprites in the game.
@@ -21,6 +29,11 @@ class PSprite(pygame.sprite.Sprite):
         r_walls: pygame.Group of Walls that block the sprite moving left
         ceilings: pygame.Group of Platforms that the sprite is stuck under
         decoration_list: list where any decorations go
+
+    kwargs can contain:
+        barrier_index: BarrierIndex of the barriers above, usually shared
+                       through the Level (built from the barrier Groups on
+                       first use if not given)
     """
 
     def __init__(self, kwargs):
@@ -33,7 +46,12 @@ class PSprite(pygame.sprite.Sprite):
             class_path = os.path.split(os.path.abspath(__file__))[0]
             self._image_dir = os.path.join(os.path.dirname(class_path),
                 "Images")
-            self._images = self._string_to_image(kwargs["images"])
+            # Animated classes only set up their images once (see
+            #   _compile_animation())
+            if "_animation" in type(self).__dict__:
+                self._images = type(self)._animation.images
+            else:
+                self._images = self._string_to_image(kwargs["images"])
         else:
             self._images = None
 
@@ -70,10 +88,20 @@ class PSprite(pygame.sprite.Sprite):
         if not isinstance(self.ceilings, pygame.sprite.Group):
             raise TypeError("ceilings must be a pygame.sprite.Group")
 
+    # Index used for collision queries
+        if "barrier_index" in kwargs:
+            self._barrier_index = kwargs["barrier_index"]
+        else:
+            self._barrier_index = None
+
 
     def _string_to_image(self, obj):
         """
         Replace file name strings with pygame images in a tree-like object.
+
+        Images come from the shared image_cache, so the same file is only
+        loaded once no matter how many sprites use it. The images must not be
+        drawn on.
         """
 
         if isinstance(obj, str):
@@ -82,11 +110,10 @@ class PSprite(pygame.sprite.Sprite):
                 print(img_path, "does not exist")
                 raise SystemExit
             try:
-                temp_img = pygame.image.load(img_path)
+                obj = image_cache.load(img_path)
             except pygame.error:
                 print("Cannot load", img_path)
                 raise SystemExit
-            obj = temp_img.convert_alpha()
 
         elif isinstance(obj, list):
             for i in range(len(obj)):
@@ -99,6 +126,108 @@ class PSprite(pygame.sprite.Sprite):
         return obj
 
 
+    def _compile_animation(self, fpi):
+        """
+        Set up this sprite's animation (see Animation and _animate()).
+
+        The first sprite of a class fills in its images (with
+        _populate_images()), packs them into the class's TextureAtlas, and
+        compiles its states into an Animation shared by the whole class.
+        Later sprites of the class just use it (PSprite.__init__() doesn't
+        even load their images), so every sprite of a class must have the
+        same images and fpi.
+
+        A class that calls this must have an _animation_series() method that
+        returns a list of (list of images, loops) by state id (see Player and
+        Baddie).
+        """
+
+        cls = type(self)
+        # Each subclass needs its own Animation, not one inherited from a
+        #   parent
+        if "_animation" not in cls.__dict__:
+            self._populate_images()
+            self._pack_images()
+            cls._animation = Animation(self._images,
+                                       self._animation_series(), fpi)
+        self._images = cls._animation.images
+
+        # Current state id and the frame it started on
+        self._anim_state = None
+        self._anim_start = 0
+
+
+    def _populate_images(self):
+        """
+        Fill in any images missing from self._images before the Animation is
+        compiled (nothing to do here).
+        """
+
+        pass
+
+
+    def _animate(self, state):
+        """
+        Show the image of state for the current frame.
+
+        The animation starts over when the state changes.
+        """
+
+        if state != self._anim_state:
+            self._anim_state = state
+            self._anim_start = frame_clock.frame
+        self.image = self._animation.image(state, self._anim_start)
+
+
+    def _pack_images(self):
+        """
+        Replace the images in self._images with subsurfaces of a new
+        TextureAtlas for this sprite's class (see _compile_animation()).
+        """
+
+        images = []
+        self._find_images(self._images, images)
+
+        atlas = TextureAtlas(images)
+        type(self)._atlas = atlas
+
+        self._images = self._replace_images(self._images, atlas)
+
+
+    def _find_images(self, obj, images):
+        """
+        Add all the images in a tree-like object to the list images.
+        """
+
+        if isinstance(obj, pygame.Surface):
+            images.append(obj)
+        elif isinstance(obj, list):
+            for item in obj:
+                self._find_images(item, images)
+        elif isinstance(obj, dict):
+            for item in obj.values():
+                self._find_images(item, images)
+
+
+    def _replace_images(self, obj, atlas):
+        """
+        Replace images with their atlas subsurfaces in a tree-like object.
+        """
+
+        if isinstance(obj, pygame.Surface):
+            obj = atlas.get(obj)
+
+        elif isinstance(obj, list):
+            for i in range(len(obj)):
+                obj[i] = self._replace_images(obj[i], atlas)
+
+        elif isinstance(obj, dict):
+            for key in obj.keys():
+                obj[key] = self._replace_images(obj[key], atlas)
+
+        return obj
+
+
     def _basic_obstacle_collision(self, dx, dy):
         """
         Check if dx or dy will take this sprite into an obstacle.
@@ -108,15 +237,15 @@ class PSprite(pygame.sprite.Sprite):
         obsx and obsy are the obstacles the sprite has collided with in the X
         and Y directions.
 
-        Limitations:
-        * There is no guaranteed order to barriers, so if barriers are very
-        close together, a PSprite might appear to teleport through one to get
-        stuck behind the other. This can only happen to very fast-moving
-        PSprites and very closely spaced barriers.
+        The sprite's _c_rect is swept along (dx, dy), and in each direction
+        the nearest obstacle in the way is the one hit (see
+        BarrierIndex.sweep()), so even very fast PSprites can't pass through
+        one barrier to get stuck behind another.
 
-        * Collisions in the X and Y directions are calculated independently,
-        which can potentially lead to strange results for fast-moving,
-        diagonally-moving PSprites.
+        Limitations:
+        * Collisions in the X and Y directions still give separate results:
+        a sprite that hits a Wall keeps sliding along it in the Y direction
+        (and vice versa).
 
         The function rounds dx and dy to integers.
         """
@@ -126,54 +255,11 @@ class PSprite(pygame.sprite.Sprite):
         if isinstance(dy, float):
             dy = round(dy)
 
-        ddx = 0
-        ddy = 0
-        obsx = None
-        obsy = None
-
-        # If the sprite is moving right
-        if dx > 0:
-            for wall in self.l_walls:
-                if self._c_rect.right - 1 < wall.rect.left and \
-                        self._c_rect.right - 1 + dx >= wall.rect.left and \
-                        self._c_rect.bottom > wall.rect.top and \
-                        self._c_rect.top < wall.rect.bottom:
-                    ddx = wall.rect.left - (self._c_rect.right - 1 + dx) - 1
-                    obsx = wall
-                    break
-        # If the sprite is moving left
-        elif dx < 0:
-            for wall in self.r_walls:
-                if self._c_rect.left > wall.rect.left and \
-                        self._c_rect.left + dx <= wall.rect.left and \
-                        self._c_rect.bottom > wall.rect.top and \
-                        self._c_rect.top < wall.rect.bottom:
-                    ddx = wall.rect.left - (self._c_rect.left + dx) + 1
-                    obsx = wall
-                    break
-
-        # If the sprite is moving up
-        if dy < 0:
-            for platform in self.ceilings:
-                if self._c_rect.top > platform.rect.top and \
-                        self._c_rect.top + dy <= platform.rect.top and \
-                        self._c_rect.right > platform.rect.left and \
-                        self._c_rect.left < platform.rect.right:
-                    ddy = platform.rect.top - (self._c_rect.top + dy) + 1
-                    obsy = platform
-                    break
-        # If the sprite is moving down
-        elif dy > 0:
-            for platform in self.floors:
-                if self._c_rect.bottom - 1 < platform.rect.top and \
-                        self._c_rect.bottom - 1 + dy >= platform.rect.top and \
-                        self._c_rect.right > platform.rect.left and \
-                        self._c_rect.left < platform.rect.right:
-                    ddy = platform.rect.top - (self._c_rect.bottom - 1 + dy) - 1
-                    obsy = platform
-                    break
-
-        return (ddx, ddy, obsx, obsy)
+        if self._barrier_index is None:
+            self._barrier_index = BarrierIndex(self.floors, self.l_walls,
+                                               self.r_walls, self.ceilings)
+
+        return self._barrier_index.sweep(self._c_rect, dx, dy)
 
 
     def clear(self, screen, background):
@@ -181,17 +267,21 @@ class PSprite(pygame.sprite.Sprite):
         Clear the sprite.
 
         Feels like pygame should already implement something like this...
+
+        Returns the Rect of the screen that was cleared.
         """
 
-        screen.blit(background, self.rect, self.rect)
+        return screen.blit(background, self.rect, self.rect)
 
 
     def draw(self, screen):
         """
         Blit sprite to screen.
+
+        Returns the Rect of the screen that was drawn on.
         """
 
-        screen.blit(self.image, self.rect)
+        return screen.blit(self.image, self.rect)
 
 
     def enable_box(self):
@@ -223,11 +313,14 @@ class PSprite(pygame.sprite.Sprite):
     def draw_decoration(self, screen):
         """
         Draw this sprite's box.
+
+        Returns the Rect of the screen that was drawn on (as do all
+        draw_decoration() and clear_decoration() methods).
         """
 
         self._dec_box_rect.centerx = self.rect.centerx
         self._dec_box_rect.centery = self.rect.centery
-        screen.blit(self._dec_box_surf, self._dec_box_rect)
+        return screen.blit(self._dec_box_surf, self._dec_box_rect)
 
 
     def clear_decoration(self, screen, background):
@@ -235,7 +328,7 @@ class PSprite(pygame.sprite.Sprite):
         Clear box.
         """
 
-        screen.blit(background, self._dec_box_rect, self._dec_box_rect)
+        return screen.blit(background, self._dec_box_rect, self._dec_box_rect)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,256 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import sys, os, struct
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.inputSource import InputSource, InputState
+
+class Replay():
+    """
+    A recorded game: everything needed to play the same game again.
+
+    Since the game is deterministic for a given seed (see Level.rng), a game
+    is fully described by its seed, level, player, excluded assets, and the
+    InputState of every frame.
+
+    Inputs rarely change from frame to frame, so they're stored as runs of
+    identical frames. In a file, each InputState is packed into one byte,
+    and each run is the byte plus a variable-length frame count.
+
+    File layout (little-endian):
+        magic "PJRP", version (1 byte), seed (8 bytes),
+        level, player (strings), number of excluded assets (2 bytes),
+        excluded assets (strings), number of frames (4 bytes),
+        runs until the end of the file
+    A string is its UTF-8 length (2 bytes) followed by the UTF-8 bytes.
+
+    @param seed: Seed the game was played with
+    @param level: Name of the Level class
+    @param player: Name of the primary Player class
+    @param exclude: Names of assets excluded from the game
+    """
+
+    MAGIC = b"PJRP"
+    VERSION = 1
+
+    def __init__(self, seed, level, player, exclude=()):
+
+        self.seed = seed
+        self.level = level
+        self.player = player
+        self.exclude = list(exclude)
+
+        # List of [frames, InputState] runs
+        self.runs = []
+        self.frames = 0
+
+
+    def record(self, state):
+        """
+        Add one frame with InputState state.
+        """
+
+        if len(self.runs) > 0 and self.runs[-1][1] == state:
+            self.runs[-1][0] += 1
+        else:
+            self.runs.append([1, state])
+        self.frames += 1
+
+
+    def save(self, path):
+        """
+        Write this Replay to file path.
+        """
+
+        data = bytearray(self.MAGIC)
+        data += struct.pack("<BQ", self.VERSION, self.seed)
+        for s in [self.level, self.player]:
+            data += self._pack_str(s)
+        data += struct.pack("<H", len(self.exclude))
+        for s in self.exclude:
+            data += self._pack_str(s)
+        data += struct.pack("<I", self.frames)
+
+        for frames, state in self.runs:
+            data.append(self._state_to_byte(state))
+            # Frame count as a varint: 7 bits per byte, high bit set on all
+            #   but the last byte
+            while frames >= 0x80:
+                data.append((frames & 0x7f) | 0x80)
+                frames >>= 7
+            data.append(frames)
+
+        with open(path, "wb") as f:
+            f.write(data)
+
+
+    @classmethod
+    def load(cls, path):
+        """
+        Read a Replay from file path.
+
+        Raises ValueError if the file isn't a valid replay.
+        """
+
+        with open(path, "rb") as f:
+            data = f.read()
+
+        if data[0:4] != cls.MAGIC:
+            raise ValueError(path + " is not a replay file")
+
+        try:
+            version, seed = struct.unpack_from("<BQ", data, 4)
+            if version != cls.VERSION:
+                raise ValueError("Unknown replay version " + str(version))
+            pos = 13
+            level, pos = cls._unpack_str(data, pos)
+            player, pos = cls._unpack_str(data, pos)
+            n_exclude, = struct.unpack_from("<H", data, pos)
+            pos += 2
+            exclude = []
+            for i in range(n_exclude):
+                s, pos = cls._unpack_str(data, pos)
+                exclude.append(s)
+            frames, = struct.unpack_from("<I", data, pos)
+            pos += 4
+
+            replay = cls(seed, level, player, exclude)
+            while pos < len(data):
+                state = cls._byte_to_state(data[pos])
+                pos += 1
+                n = 0
+                shift = 0
+                while True:
+                    b = data[pos]
+                    pos += 1
+                    n |= (b & 0x7f) << shift
+                    shift += 7
+                    if b < 0x80:
+                        break
+                replay.runs.append([n, state])
+                replay.frames += n
+        except (struct.error, IndexError, UnicodeDecodeError):
+            raise ValueError(path + " is truncated or corrupt")
+
+        if replay.frames != frames:
+            raise ValueError(path + " is truncated or corrupt")
+
+        return replay
+
+
+    @staticmethod
+    def _state_to_byte(state):
+        """
+        Pack an InputState into one byte (one bit per field, in order).
+        """
+
+        b = 0
+        for i, pressed in enumerate(state):
+            if pressed:
+                b |= 1 << i
+        return b
+
+
+    @staticmethod
+    def _byte_to_state(b):
+        """
+        Unpack a byte made by _state_to_byte().
+        """
+
+        return InputState(*[bool(b & (1 << i))
+                            for i in range(len(InputState._fields))])
+
+
+    @staticmethod
+    def _pack_str(s):
+        """
+        Pack a string as its length and UTF-8 bytes.
+        """
+
+        b = s.encode("utf-8")
+        return struct.pack("<H", len(b)) + b
+
+
+    @staticmethod
+    def _unpack_str(data, pos):
+        """
+        Unpack a string made by _pack_str(). Returns (string, new pos).
+        """
+
+        n, = struct.unpack_from("<H", data, pos)
+        pos += 2
+        if pos + n > len(data):
+            raise IndexError
+        return (data[pos:pos+n].decode("utf-8"), pos + n)
+
+
+class RecordingInput(InputSource):
+    """
+    Pass input through from another InputSource and record it in a Replay.
+
+    @param source: The InputSource actually controlling the game
+    @param replay: Replay to record to
+    """
+
+    def __init__(self, source, replay):
+
+        InputSource.__init__(self)
+
+        self.source = source
+        self.replay = replay
+
+
+    def _read(self):
+        """
+        Read the wrapped source and record what it says.
+        """
+
+        self.source.next_frame()
+        self.finished = self.source.finished
+        self.replay.record(self.source.state)
+
+        return self.source.state
+
+
+class ReplayInput(InputSource):
+    """
+    Input played back from a Replay.
+
+    @param replay: The Replay to play
+    """
+
+    def __init__(self, replay):
+
+        InputSource.__init__(self)
+
+        self._runs = replay.runs
+        # Position in runs
+        self._i = 0
+        self._left = self._runs[0][0] if len(self._runs) > 0 else 0
+
+
+    def _read(self):
+        """
+        Get the next recorded InputState.
+        """
+
+        while self._left == 0:
+            self._i += 1
+            if self._i >= len(self._runs):
+                self.finished = True
+                return InputState.NONE
+            self._left = self._runs[self._i][0]
+
+        self._left -= 1
+        return self._runs[self._i][1]
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
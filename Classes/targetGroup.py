@@ -0,0 +1,143 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pygame
+
+class TargetGroup(pygame.sprite.RenderUpdates):
+    """
+    A RenderUpdates of Characters that Projectiles can hit quickly.
+
+    collide_circle(sprite) gives the same list as
+    pygame.sprite.spritecollide(sprite, group, False,
+    pygame.sprite.collide_circle), in the same (Group) order, but only tests
+    the targets near sprite. To find them, the Group keeps a spatial hash: a
+    grid of cell_size pixel cells, with each target in every cell that its
+    collision circle's bounding box overlaps.
+
+    The hash is built on the first collide_circle() after the Group has
+    changed. Adding and removing sprites is noticed automatically, but
+    moving them isn't: whoever moves the targets must call invalidate()
+    before Projectiles test against them again. (Level does this once per
+    frame, before each group of Projectiles is updated.)
+
+    The rebuild is lazy on purpose. In most frames the hash is built at most
+    once, and not at all if no Projectile tests against the Group. It's only
+    built again within a frame if a target is added or removed (a Baddie
+    spawns or dies), which is rare, and the hash must then change anyway so
+    that a removed target can't be hit. Building it eagerly in
+    Level.update() would cost a build every frame and still need the
+    rebuild on changes.
+
+    Groups with only a few targets (up to linear_limit) are just scanned.
+
+    @param cell_size: Grid cell size in pixels
+    """
+
+    # Up to this many targets aren't worth hashing
+    linear_limit = 4
+
+    def __init__(self, cell_size=64):
+
+        pygame.sprite.RenderUpdates.__init__(self)
+
+        if cell_size <= 0:
+            raise ValueError("cell_size must be > 0")
+        self._cell_size = cell_size
+
+        # (col, row) -> list of (order, target); None when stale
+        self._cells = None
+
+
+    def invalidate(self):
+        """
+        Signal that targets have moved, so the hash needs to be rebuilt.
+        """
+
+        self._cells = None
+
+
+    def add_internal(self, sprite, layer=None):
+        pygame.sprite.RenderUpdates.add_internal(self, sprite, layer)
+        self._cells = None
+
+
+    def remove_internal(self, sprite):
+        pygame.sprite.RenderUpdates.remove_internal(self, sprite)
+        self._cells = None
+
+
+    def collide_circle(self, sprite):
+        """
+        Get the targets whose collision circles overlap sprite's.
+        """
+
+        if len(self) <= self.linear_limit:
+            return pygame.sprite.spritecollide(sprite, self, False,
+                                               pygame.sprite.collide_circle)
+
+        if self._cells is None:
+            self._build()
+
+        cells = self._cells
+        hits = []
+        seen = set()
+        for cell in self._cells_of(sprite):
+            if cell not in cells:
+                continue
+            for entry in cells[cell]:
+                if entry[0] in seen:
+                    continue
+                seen.add(entry[0])
+                if pygame.sprite.collide_circle(sprite, entry[1]):
+                    hits.append(entry)
+
+        # Same order as the Group, so "first target hit" doesn't change
+        hits.sort(key=lambda entry: entry[0])
+        return [entry[1] for entry in hits]
+
+
+    def _build(self):
+        """
+        Build the spatial hash.
+        """
+
+        cells = {}
+        for order, target in enumerate(self.sprites()):
+            for cell in self._cells_of(target):
+                if cell in cells:
+                    cells[cell].append((order, target))
+                else:
+                    cells[cell] = [(order, target)]
+
+        self._cells = cells
+
+
+    def _cells_of(self, sprite):
+        """
+        Get the cells overlapped by the bounding box of sprite's collision
+        circle (the circle used by pygame.sprite.collide_circle()).
+        """
+
+        try:
+            radius = sprite.radius
+        except AttributeError:
+            rect = sprite.rect
+            radius = 0.5 * ((rect.width**2 + rect.height**2) ** 0.5)
+
+        x = sprite.rect.centerx
+        y = sprite.rect.centery
+        size = self._cell_size
+
+        return [(col, row)
+                for col in range(int((x - radius) // size),
+                                 int((x + radius) // size) + 1)
+                for row in range(int((y - radius) // size),
+                                 int((y + radius) // size) + 1)]
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -0,0 +1,88 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pygame
+from pygame.locals import *
+
+class TextureAtlas():
+    """
+    Many small images packed into one Surface.
+
+    Each image is copied into the atlas once, and get() hands out a
+    subsurface of the atlas in its place. The subsurfaces look and blit just
+    like the images they replace, but they share one block of pixels, so a
+    sprite's animation frames are all drawn from the same Surface.
+
+    Images are packed in rows (tallest first), each row as wide as will fit
+    in max_width.
+
+    @param images: Surfaces to pack (duplicates are packed once)
+    @param max_width: Widest the atlas can be (unless an image is wider)
+    """
+
+    def __init__(self, images, max_width=512):
+
+        unique = []
+        seen = set()
+        for img in images:
+            if img not in seen:
+                seen.add(img)
+                unique.append(img)
+
+    # Work out where everything goes
+        width = max([max_width] + [img.get_width() for img in unique])
+        order = sorted(range(len(unique)),
+                       key=lambda i: (-unique[i].get_height(), i))
+        places = {}
+        x = 0
+        y = 0
+        row_height = 0
+        used_width = 0
+        for i in order:
+            w, h = unique[i].get_size()
+            if x + w > width:
+                x = 0
+                y += row_height
+                row_height = 0
+            places[i] = (x, y)
+            x += w
+            used_width = max(used_width, x)
+            row_height = max(row_height, h)
+
+    # Copy the images in
+        self.surface = pygame.Surface((max(used_width, 1),
+                                       max(y + row_height, 1)),
+                                      flags=SRCALPHA).convert_alpha()
+        self.surface.fill((0, 0, 0, 0))
+        # Original image -> subsurface
+        self._subsurfaces = {}
+        for i, img in enumerate(unique):
+            # The atlas is all zeros, so max() copies the pixels (alpha
+            #   included) exactly, where a normal blit would blend them
+            self.surface.blit(img, places[i], special_flags=BLEND_RGBA_MAX)
+            self._subsurfaces[img] = self.surface.subsurface(
+                Rect(places[i], img.get_size()))
+
+
+    def __contains__(self, img):
+        return img in self._subsurfaces
+
+
+    def __len__(self):
+        return len(self._subsurfaces)
+
+
+    def get(self, img):
+        """
+        Get the subsurface that replaces img.
+        """
+
+        return self._subsurfaces[img]
+
+
+if __name__ == '__main__':
+    print("Don't run me. Run projectile-game.py")
@@ -5,10 +5,15 @@
 # This software comes with ABSOLUTELY NO WARRANTY.
 # See GPLv3.txt for details.
 
-import pygame
+import sys, os, pygame
 from pygame.locals import *
 
-class Wall(pygame.sprite.Sprite):
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+from Classes.barrier import Barrier
+
+class Wall(Barrier):
     """Vertical barrier
 
     Walls can be passed through from the top, bottom, and one of the sides.
@@ -20,11 +25,12 @@ class Wall(pygame.sprite.Sprite):
     (Wall width is always 1.)
     """
 
+    __slots__ = ()
+
+    color = (255, 0, 255)
+
     def __init__(self, left, top, height):
-        pygame.sprite.Sprite.__init__(self)
-        self.rect = pygame.Rect(left, top, 1, height)
-        self.image = pygame.Surface((self.rect[2], self.rect[3]))
-        self.image.fill((255, 0, 255))
+        Barrier.__init__(self, pygame.Rect(left, top, 1, height))
 
 
 if __name__ == '__main__':
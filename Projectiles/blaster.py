@@ -28,23 +28,26 @@ class Blaster(Projectile):
     default_number_shots = 3
     default_multi_shot = 5
     # Individual laser pulses are initialized with slightly different speeds
-    #   so the pulses spread out
-    speed = 15.0
+    #   so the pulses spread out (the nth pulse a pool makes gets speeds[n %
+    #   len(speeds)]). These are 15.0 plus 0.3 at a time, down to the last
+    #   bit, as the pulses have always had
+    speeds = (15.0, 15.3, 15.600000000000001, 15.900000000000002,
+              16.200000000000003)
     icon = "Blaster_icon.png"
 
     def __init__(self, kwargs):
 
         images = ["Blaster.png"]
 
+        number = 0
+        if "number" in kwargs:
+            number = kwargs["number"]
+
         kwargs["images"]        = images
-        kwargs["speed"]         = Blaster.speed
+        kwargs["speed"]         = Blaster.speeds[number % len(Blaster.speeds)]
         kwargs["damage"]        = 10
         kwargs["radius"]        = 8
 
-        Blaster.speed += 0.3
-        if Blaster.speed >= 16.5:
-            Blaster.speed = 15.0
-
         Projectile.__init__(self, kwargs)
 
 
@@ -0,0 +1,103 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for Animation.
+"""
+
+def counter_images(series, loops, fpi, frames):
+    """
+    Images of a state shown over frames, counted the way sprites used to
+    count them (a counter of their own, starting at 0).
+    """
+
+    shown = []
+    ctr = 0
+    for frame in range(frames):
+        shown.append(series[ctr // fpi])
+        if loops:
+            ctr = (ctr + 1) % (len(series) * fpi)
+        elif len(series) * fpi - 1 > ctr:
+            ctr += 1
+
+    return shown
+
+
+@pytest.mark.parametrize("fpi", [1, 4])
+def test_same_as_counter(fpi):
+    import sys, os
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+    from Classes.animation import Animation, frame_clock
+
+    move = ["m0", "m1", "m2"]
+    dead = ["d0", "d1"]
+    anim = Animation(None, [(move, True), (dead, False)], fpi)
+
+    for state, series, loops in [(0, move, True), (1, dead, False)]:
+        start = frame_clock.frame
+        shown = []
+        for frame in range(30):
+            shown.append(anim.image(state, start))
+            frame_clock.tick()
+        assert shown == counter_images(series, loops, fpi, 30)
+
+
+def test_shared_by_class():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Levels.zero import Zero
+    from Baddies.XOR import XOR
+    from Classes.animation import frame_clock
+
+    a_level = Zero({"XOR": XOR}, None, pygame.sprite.RenderUpdates(), [])
+    a_level._spawn_random_baddie(100, 100)
+    a_level._spawn_random_baddie(200, 200)
+    a, b = a_level.baddies.sprites()
+
+    assert a._images is b._images is XOR._animation.images
+    assert a.image is b.image
+
+    # Started moving later, so out of step
+    for frame in range(4):
+        frame_clock.tick()
+        for baddie in (a, b):
+            baddie._update_image()
+    a_level._spawn_random_baddie(300, 300)
+    c = [s for s in a_level.baddies if s is not a and s is not b][0]
+    for frame in range(4):
+        frame_clock.tick()
+        for baddie in (a, b, c):
+            baddie._update_image()
+    assert c.image is not a.image
+    assert a.image is b.image
+
+
+def test_clock_restarts_with_level():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Levels.zero import Zero
+    from Classes.animation import frame_clock
+
+    for frame in range(5):
+        frame_clock.tick()
+    Zero({}, None, pygame.sprite.RenderUpdates(), [])
+    assert frame_clock.frame == 0
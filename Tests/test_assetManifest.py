@@ -0,0 +1,111 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for AssetManifest.
+"""
+
+BASE = """
+class Thing():
+    pass
+"""
+
+ASSET = """
+import sys, os
+sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+from Stuff.base import Thing
+
+class {0}(Thing):
+    pass
+
+class {0}Helper():
+    pass
+"""
+
+SUB_ASSET = """
+from Things.{0} import {1}
+
+class {2}({1}):
+    pass
+"""
+
+@pytest.fixture
+def game_dir(tmp_path):
+    import sys
+
+    (tmp_path / "Stuff").mkdir()
+    (tmp_path / "Stuff" / "base.py").write_text(BASE)
+    (tmp_path / "Things").mkdir()
+    (tmp_path / "Things" / "lamp.py").write_text(ASSET.format("Lamp"))
+    (tmp_path / "Things" / "chair.py").write_text(ASSET.format("Chair"))
+    (tmp_path / "Things" / "armchair.py").write_text(
+        SUB_ASSET.format("chair", "Chair", "Armchair"))
+
+    sys.path.insert(0, str(tmp_path))
+    yield tmp_path
+    sys.path.remove(str(tmp_path))
+    for name in list(sys.modules):
+        if name.split(".")[0] in ("Stuff", "Things"):
+            del sys.modules[name]
+
+
+def test_find_without_import(game_dir):
+    import sys, os
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+    from Classes.assetManifest import AssetManifest
+    from Stuff.base import Thing
+
+    classes = AssetManifest(str(game_dir)).find("Things", Thing)
+
+    assert sorted(classes) == ["Armchair", "Chair", "Lamp"]
+    assert "Things.lamp" not in sys.modules
+
+    path = list(sys.path)
+    lamp = classes["Lamp"]
+    assert lamp.__name__ == "Lamp" and issubclass(lamp, Thing)
+    assert "Things.lamp" in sys.modules
+    assert "Things.chair" not in sys.modules
+    # The module's sys.path.append() didn't stick
+    assert sys.path == path
+
+    assert issubclass(classes["Armchair"], classes["Chair"])
+
+    del classes["Chair"]
+    assert sorted(classes) == ["Armchair", "Lamp"]
+
+
+def test_manifest_cache(game_dir):
+    import sys, os
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+    from Classes.assetManifest import AssetManifest
+    from Stuff.base import Thing
+
+    manifest = AssetManifest(str(game_dir))
+    manifest.find("Things", Thing)
+    assert (game_dir / "Things" / "__pycache__" / "manifest.json").exists()
+
+    scanned = []
+    scan = AssetManifest._scan
+    def counting_scan(filename):
+        scanned.append(os.path.basename(filename))
+        return scan(filename)
+    manifest._scan = counting_scan
+
+    # Nothing changed, nothing read
+    assert sorted(manifest.find("Things", Thing)) == \
+        ["Armchair", "Chair", "Lamp"]
+    assert scanned == []
+
+    # Only changed modules are read again
+    (game_dir / "Things" / "lamp.py").write_text(ASSET.format("Lantern"))
+    (game_dir / "Things" / "armchair.py").unlink()
+    assert sorted(manifest.find("Things", Thing)) == ["Chair", "Lantern"]
+    assert scanned == ["lamp.py"]
@@ -0,0 +1,86 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for BaddieBatch.
+
+Moving the Baddies in a batch must give exactly the same game as letting
+every Baddie move itself.
+"""
+
+numpy = pytest.importorskip("numpy")
+
+def run(name, batch_baddies, frames=300):
+    """
+    Run a crowd of Baddies for a while and record where they are after every
+    frame.
+    """
+
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Benchmarks import scenarios
+
+    scenario = scenarios.SCENARIOS[name]._replace(count=30)
+
+    trace = []
+    a_level = scenarios.setup_scenario(scenario, 2)
+    a_level.batch_baddies = batch_baddies
+    for frame in range(frames):
+        a_level.input.next_frame()
+        a_level.update()
+        a_level.baddie_projectiles.sync()
+        trace.append([(b.rect.center, b._xf, b._yf, b._dir)
+                      for b in a_level.baddies])
+        trace.append(sorted(pr.rect.center
+                            for pr in a_level.baddie_projectiles))
+
+    return trace
+
+
+@pytest.mark.parametrize("name", ["kreutzwald_crowd", "xor_swarm"])
+def test_same_as_update(name):
+    assert run(name, 1) == run(name, None)
+
+
+def test_threshold():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Levels.zero import Zero
+    from Baddies.kreutzwald import Kreutzwald
+    from Classes.baddieBatch import BaddieBatch
+
+    a_level = Zero({"Kreutzwald": Kreutzwald}, None,
+                   pygame.sprite.RenderUpdates(), [])
+    for i in range(3):
+        a_level._spawn_random_baddie(100 + 100 * i, 100)
+
+    below = BaddieBatch(a_level.barrier_index(), 4)
+    below.prepare(a_level.baddies)
+    assert all(b._batched_move is None for b in a_level.baddies)
+
+    at = BaddieBatch(a_level.barrier_index(), 3)
+    at.prepare(a_level.baddies)
+    assert all(b._batched_move is not None for b in a_level.baddies)
+    at.finish()
+    assert all(b._batched_move is None for b in a_level.baddies)
+
+    # Levels don't batch unless they ask to
+    assert Zero.batch_baddies is None
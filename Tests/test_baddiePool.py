@@ -0,0 +1,104 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for the Level's pools of Baddies.
+
+A Baddie that has gone and is spawned again must be the same as a new one.
+"""
+
+@pytest.fixture
+def a_level():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Levels.zero import Zero
+    from Baddies.XOR import XOR
+    from Baddies.kreutzwald import Kreutzwald
+
+    return Zero({"XOR": XOR, "Kreutzwald": Kreutzwald}, None,
+                pygame.sprite.RenderUpdates(), [])
+
+
+def state(baddie):
+    """
+    Everything about a Baddie that reset() should set.
+    """
+
+    return (type(baddie), baddie.hp, baddie.active, tuple(baddie.rect),
+            tuple(baddie._c_rect), baddie._xf, baddie._yf, baddie._dir,
+            baddie.image, baddie._anim_state, baddie._hit_counter,
+            baddie._dead_ctr, getattr(baddie, "_stop_timer", None),
+            getattr(baddie, "_firing", None), baddie._box.in_flight())
+
+
+def kill(baddie):
+    """
+    Hit a Baddie until it dies, then let its dead animation run out.
+    """
+
+    class Hit():
+        damage = 1
+
+    while baddie.active:
+        baddie.got_hit(Hit(), None)
+    while baddie.alive():
+        baddie.update()
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2, 3])
+def test_reused_like_new(a_level, seed):
+    a_level.rng.seed(seed)
+    a_level._spawn_random_baddie(100, 100)
+    old = a_level.baddies.sprites()[0]
+    for i in range(50):
+        old.update()
+    kill(old)
+    assert len(a_level.baddies) == 0
+
+    a_level.rng.seed(seed + 10)
+    a_level._spawn_random_baddie(320, 240)
+    reused = a_level.baddies.sprites()[0]
+    a_level.baddies.empty()
+
+    # Same draws, but nothing in the pool
+    a_level._baddie_pools = {}
+    a_level.rng.seed(seed + 10)
+    a_level._spawn_random_baddie(320, 240)
+    new = a_level.baddies.sprites()[0]
+
+    if type(reused) is type(old):
+        assert reused is old
+    assert new is not reused
+    assert state(reused) == state(new)
+
+
+def test_not_reused_while_firing(a_level):
+    from Baddies.XOR import XOR
+
+    a_level._baddie_classes = {"XOR": XOR}
+    a_level._spawn_random_baddie(320, 240)
+    old = a_level.baddies.sprites()[0]
+    old._fire()
+    kill(old)
+
+    # Its BBs are still flying
+    a_level._spawn_random_baddie(320, 240)
+    assert a_level.baddies.sprites()[0] is not old
+
+    for pr in a_level.baddie_projectiles.sprites():
+        pr._owner.recycle(pr)
+    a_level.baddies.empty()
+    a_level._spawn_random_baddie(320, 240)
+    assert a_level.baddies.sprites()[0] is old
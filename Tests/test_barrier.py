@@ -0,0 +1,49 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for Barrier (Walls and Platforms).
+"""
+
+@pytest.fixture
+def barriers():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.wall import Wall
+    from Classes.platform import Platform
+
+    return pygame.sprite.RenderPlain(Wall(10, 5, 20), Platform(2, 30, 15))
+
+
+def test_in_groups(barriers):
+    import pygame
+
+    wall, platform = barriers.sprites()
+    assert wall.rect == pygame.Rect(10, 5, 1, 20)
+    assert platform.rect == pygame.Rect(2, 30, 15, 1)
+
+    others = pygame.sprite.Group(barriers.sprites())
+    barriers.remove(wall)
+    assert barriers.sprites() == [platform]
+    assert others.sprites() == [wall, platform]
+
+
+def test_drawn_lazily(barriers):
+    import pygame
+
+    wall, platform = barriers.sprites()
+    assert wall._image is None and platform._image is None
+
+    screen = pygame.Surface((40, 40))
+    barriers.draw(screen)
+    assert screen.get_at((10, 10)) == pygame.Color(255, 0, 255)
+    assert screen.get_at((5, 30)) == pygame.Color(0, 255, 0)
+    assert screen.get_at((20, 20)) == pygame.Color(0, 0, 0)
@@ -0,0 +1,141 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+from pygame.locals import *
+
+"""
+pytest unit tests for BarrierCompiler.
+"""
+
+@pytest.fixture
+def groups():
+    """
+    Barriers on a few lines, many of them touching or overlapping.
+    """
+
+    import sys, os, random, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.wall import Wall
+    from Classes.platform import Platform
+
+    rng = random.Random(6)
+    groups = []
+    for cls in [Platform, Wall, Wall, Platform]:
+        group = pygame.sprite.Group()
+        for i in range(80):
+            group.add(cls(rng.randint(0, 600), rng.choice([40, 200, 300, 410]),
+                          rng.randint(1, 60)))
+        groups.append(group)
+
+    return groups
+
+
+def test_merge_keeps_collisions(groups):
+    import random
+    from Classes.barrierIndex import BarrierIndex
+    from Classes.barrierCompiler import BarrierCompiler
+
+    before = BarrierIndex(*groups)
+    counts = [len(g) for g in groups]
+    compiler = BarrierCompiler()
+    compiler.compile(*groups)
+    after = BarrierIndex(*groups)
+
+    assert compiler.merged > 0
+    assert sum(counts) - sum(len(g) for g in groups) == compiler.merged
+
+    rng = random.Random(7)
+    for i in range(2000):
+        c_rect = Rect(rng.randint(0, 640), rng.randint(0, 480),
+                      rng.randint(1, 30), rng.randint(1, 30))
+        dx = rng.randint(-20, 20)
+        dy = rng.randint(-20, 20)
+        assert before.sweep(c_rect, dx, dy)[:2] == \
+            after.sweep(c_rect, dx, dy)[:2]
+
+
+def test_merge():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.platform import Platform
+    from Classes.barrierCompiler import BarrierCompiler
+
+    a = Platform(0, 10, 10)
+    b = Platform(30, 10, 10)
+    c = Platform(10, 10, 5)
+    d = Platform(12, 20, 10)
+    floors = pygame.sprite.Group(a, b, c, d)
+    empty = pygame.sprite.Group()
+
+    BarrierCompiler().compile(floors, empty, empty, empty)
+
+    merged, second, third = floors.sprites()
+    assert merged.rect == pygame.Rect(0, 10, 15, 1)
+    assert isinstance(merged, Platform)
+    assert second is b and third is d
+
+
+def test_drop_and_close():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.wall import Wall
+    from Classes.barrierCompiler import BarrierCompiler
+
+    inside = Wall(100, 0, 100)
+    near = Wall(105, 50, 100)
+    far = Wall(200, 50, 100)
+    outside = Wall(700, 0, 100)
+    walls = pygame.sprite.Group(inside, near, far, outside)
+    empty = pygame.sprite.Group()
+
+    compiler = BarrierCompiler(pygame.Rect(0, 0, 640, 480), 16)
+    compiler.compile(empty, walls, empty, empty)
+
+    assert walls.sprites() == [inside, near, far]
+    assert compiler.dropped == [outside]
+    assert compiler.close == [("l_walls", inside, near, 5)]
+
+
+def test_level_drops_only_if_asked():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Classes.wall import Wall
+    from Classes.eventLog import event_log, WARNING
+    from Levels.zero import Zero
+
+    class Boxed(Zero):
+        play_area = pygame.Rect(0, 0, 640, 480)
+
+    event_log.records()
+    for level_class in (Zero, Boxed):
+        a_level = level_class({}, None, pygame.sprite.RenderUpdates(), [])
+        outside = Wall(700, 0, 100)
+        a_level.l_walls.add(outside)
+        a_level.barrier_index()
+
+        if level_class is Zero:
+            assert outside in a_level.l_walls
+            assert event_log.records() == []
+        else:
+            assert outside not in a_level.l_walls
+            records = event_log.records()
+            assert [r[1:4] for r in records] == \
+                [(WARNING, "barriers_dropped", "Boxed")]
+            assert records[0][4] == {"count": 1}
@@ -0,0 +1,235 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+from pygame.locals import *
+
+"""
+pytest unit tests for BarrierIndex.
+"""
+
+def scan(c_rect, dx, dy, floors, l_walls, r_walls, ceilings):
+    """
+    Reference linear scan (how collisions were originally calculated: the
+    first barrier in Group order that c_rect would cross, checked against
+    where c_rect starts).
+    """
+
+    ddx = 0
+    ddy = 0
+    obsx = None
+    obsy = None
+
+    if dx > 0:
+        for wall in l_walls:
+            if c_rect.right - 1 < wall.rect.left and \
+                    c_rect.right - 1 + dx >= wall.rect.left and \
+                    c_rect.bottom > wall.rect.top and \
+                    c_rect.top < wall.rect.bottom:
+                ddx = wall.rect.left - (c_rect.right - 1 + dx) - 1
+                obsx = wall
+                break
+    elif dx < 0:
+        for wall in r_walls:
+            if c_rect.left > wall.rect.left and \
+                    c_rect.left + dx <= wall.rect.left and \
+                    c_rect.bottom > wall.rect.top and \
+                    c_rect.top < wall.rect.bottom:
+                ddx = wall.rect.left - (c_rect.left + dx) + 1
+                obsx = wall
+                break
+
+    if dy < 0:
+        for platform in ceilings:
+            if c_rect.top > platform.rect.top and \
+                    c_rect.top + dy <= platform.rect.top and \
+                    c_rect.right > platform.rect.left and \
+                    c_rect.left < platform.rect.right:
+                ddy = platform.rect.top - (c_rect.top + dy) + 1
+                obsy = platform
+                break
+    elif dy > 0:
+        for platform in floors:
+            if c_rect.bottom - 1 < platform.rect.top and \
+                    c_rect.bottom - 1 + dy >= platform.rect.top and \
+                    c_rect.right > platform.rect.left and \
+                    c_rect.left < platform.rect.right:
+                ddy = platform.rect.top - (c_rect.bottom - 1 + dy) - 1
+                obsy = platform
+                break
+
+    return (ddx, ddy, obsx, obsy)
+
+
+def sweep_scan(c_rect, dx, dy, floors, l_walls, r_walls, ceilings):
+    """
+    Reference swept collision: step c_rect along (dx, dy) one pixel at a
+    time (in the direction being tested, keeping the other direction's
+    position exact as a fraction) and stop at the first step into a barrier.
+    """
+
+    from fractions import Fraction
+
+    def first_hit(d, other_d, group, horizontal, start, span_lo, span_hi):
+        step = 1 if d > 0 else -1
+        for travel in range(abs(d)):
+            edge = start + step * (travel + 1)
+            shift = Fraction(other_d * travel, abs(d))
+            for barrier in group:
+                r = barrier.rect
+                key, lo, hi = (r.top, r.left, r.right) if horizontal else \
+                              (r.left, r.top, r.bottom)
+                if key == edge and span_hi + shift > lo and \
+                        span_lo + shift < hi:
+                    return (travel, barrier)
+        return None
+
+    ddx = 0
+    ddy = 0
+    obsx = None
+    obsy = None
+
+    if dx != 0:
+        if dx > 0:
+            hit = first_hit(dx, dy, l_walls, False, c_rect.right - 1,
+                            c_rect.top, c_rect.bottom)
+        else:
+            hit = first_hit(dx, dy, r_walls, False, c_rect.left,
+                            c_rect.top, c_rect.bottom)
+        if hit is not None:
+            ddx = (hit[0] - abs(dx)) * (1 if dx > 0 else -1)
+            obsx = hit[1]
+
+    if dy != 0:
+        if dy > 0:
+            hit = first_hit(dy, dx, floors, True, c_rect.bottom - 1,
+                            c_rect.left, c_rect.right)
+        else:
+            hit = first_hit(dy, dx, ceilings, True, c_rect.top,
+                            c_rect.left, c_rect.right)
+        if hit is not None:
+            ddy = (hit[0] - abs(dy)) * (1 if dy > 0 else -1)
+            obsy = hit[1]
+
+    return (ddx, ddy, obsx, obsy)
+
+
+@pytest.fixture
+def random_barriers():
+    """
+    Lots of randomly placed, often overlapping barriers.
+    """
+
+    import sys, os, random, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.wall import Wall
+    from Classes.platform import Platform
+
+    rng = random.Random(1)
+    groups = []
+    for cls in [Platform, Wall, Wall, Platform]:
+        group = pygame.sprite.Group()
+        for i in range(60):
+            group.add(cls(rng.randint(0, 640), rng.randint(0, 480),
+                          rng.randint(1, 120)))
+        groups.append(group)
+
+    return groups
+
+
+def test_sweep_all_matches_sweep(random_barriers):
+    import random
+    numpy = pytest.importorskip("numpy")
+    from Classes.barrierIndex import BarrierIndex
+
+    rng = random.Random(5)
+    c_rects = [Rect(rng.randint(0, 640), rng.randint(0, 480),
+                    rng.randint(1, 30), rng.randint(1, 30))
+               for i in range(1000)]
+    dx = numpy.array([rng.randint(-20, 20) for r in c_rects])
+    dy = numpy.array([rng.randint(-20, 20) for r in c_rects])
+    left, top, width, height = numpy.array(c_rects).T
+
+    index = BarrierIndex(*random_barriers)
+    for index in [index, index.two_way()]:
+        results = index.sweep_all(left, top, left + width, top + height,
+                                  dx, dy)
+        for i, c_rect in enumerate(c_rects):
+            assert tuple(r[i] for r in results) == \
+                index.sweep(c_rect, int(dx[i]), int(dy[i]))
+
+
+@pytest.mark.parametrize("cell_size", [None, 1, 16, 64, 1000])
+def test_sweep_matches_scan(random_barriers, cell_size):
+    import random, pygame
+    from Classes.barrierIndex import BarrierIndex
+    from Classes.barrierGrid import BarrierGrid
+
+    floors, l_walls, r_walls, ceilings = random_barriers
+    platforms = pygame.sprite.Group(floors.sprites(), ceilings.sprites())
+    walls = pygame.sprite.Group(l_walls.sprites(), r_walls.sprites())
+
+    if cell_size is None:
+        index = BarrierIndex(*random_barriers)
+    else:
+        index = BarrierGrid(*random_barriers, cell_size=cell_size)
+    rng = random.Random(8)
+    for i in range(1000):
+        c_rect = Rect(rng.randint(-20, 640), rng.randint(-20, 480),
+                      rng.randint(1, 30), rng.randint(1, 30))
+        dx = rng.randint(-20, 20)
+        dy = rng.randint(-20, 20)
+        assert index.sweep(c_rect, dx, dy) == \
+            sweep_scan(c_rect, dx, dy, *random_barriers)
+        assert index.two_way().sweep(c_rect, dx, dy) == \
+            sweep_scan(c_rect, dx, dy, platforms, walls, walls, platforms)
+
+
+def test_sweep_nearest():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.barrierIndex import BarrierIndex
+    from Classes.wall import Wall
+
+    # The far Wall comes first in Group order, but the near one is in the way
+    far = Wall(110, 0, 100)
+    near = Wall(104, 0, 100)
+    index = BarrierIndex(pygame.sprite.Group(), pygame.sprite.Group(far, near),
+                         pygame.sprite.Group(), pygame.sprite.Group())
+    c_rect = Rect(90, 40, 10, 10)
+
+    assert scan(c_rect, 16, 0, *index._groups) == (-6, 0, far, None)
+    assert index.sweep(c_rect, 16, 0) == (-12, 0, near, None)
+
+
+@pytest.mark.parametrize("cell_size", [1, 16, 64])
+def test_grid_zero_length(cell_size):
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.barrierIndex import BarrierIndex
+    from Classes.barrierGrid import BarrierGrid
+    from Classes.platform import Platform
+
+    dot = Platform(100, 200, 0)
+    groups = [pygame.sprite.Group(dot), pygame.sprite.Group(),
+              pygame.sprite.Group(), pygame.sprite.Group()]
+    index = BarrierIndex(*groups)
+    grid = BarrierGrid(*groups, cell_size=cell_size)
+
+    # Falling onto it, straddling its x
+    c_rect = Rect(90, 170, 20, 20)
+    assert index.sweep(c_rect, 0, 20)[3] is dot
+    assert grid.sweep(c_rect, 0, 20) == index.sweep(c_rect, 0, 20)
+    for x in range(60, 140, 3):
+        c_rect = Rect(x, 170, 20, 20)
+        assert grid.sweep(c_rect, 0, 20) == index.sweep(c_rect, 0, 20)
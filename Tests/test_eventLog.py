@@ -0,0 +1,92 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for EventLog.
+"""
+
+@pytest.fixture
+def log():
+    import sys, os
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.eventLog import EventLog
+
+    return EventLog(capacity=4)
+
+
+def test_levels(log):
+    from Classes.eventLog import DEBUG, INFO, WARNING, OFF
+
+    log.log(DEBUG, "a", "X")
+    log.log(INFO, "b", "X")
+    log.log(WARNING, "c", "X")
+    assert [r[2] for r in log.records()] == ["b", "c"]
+
+    log.level = OFF
+    log.log(WARNING, "d", "X")
+    assert log.records() == []
+
+
+def test_ring_drops_oldest(log):
+    from Classes.eventLog import INFO
+    from Classes.animation import frame_clock
+
+    for i in range(6):
+        log.log(INFO, "e", "X", i=i)
+    assert log.dropped == 2
+    records = log.records()
+    assert [r[4]["i"] for r in records] == [2, 3, 4, 5]
+    assert records[0][0] == frame_clock.frame
+    assert log.records() == []
+
+
+@pytest.mark.parametrize("name", ["events.log", "events.jsonl"])
+def test_written_in_background(log, tmp_path, name):
+    import json
+    from Classes.eventLog import INFO
+    from Classes.animation import frame_clock
+
+    path = str(tmp_path / name)
+    log.start(path)
+    log.log(INFO, "hit", "Fred", damage=1, hp=2)
+    log.stop()
+    log.stop()
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 1
+    if name.endswith(".jsonl"):
+        assert json.loads(lines[0]) == {"frame": frame_clock.frame,
+                                        "level": "info", "event": "hit",
+                                        "entity": "Fred", "damage": 1,
+                                        "hp": 2}
+    else:
+        assert lines[0] == "frame %d INFO hit Fred damage=1 hp=2" % \
+            frame_clock.frame
+
+
+def test_dropped_reported(log, tmp_path):
+    from Classes.eventLog import INFO
+    from Classes.animation import frame_clock
+
+    for i in range(6):
+        log.log(INFO, "e", "X", i=i)
+
+    path = str(tmp_path / "events.log")
+    log.start(path)
+    log.stop()
+
+    with open(path) as f:
+        lines = f.read().splitlines()
+    assert len(lines) == 5
+    assert lines[-1] == "frame %d WARNING events_dropped EventLog count=2" % \
+        frame_clock.frame
+    assert log.dropped == 0
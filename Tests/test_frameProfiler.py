@@ -0,0 +1,88 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for FrameProfiler.
+"""
+
+@pytest.fixture
+def profiler():
+    """
+    A FrameProfiler that has timed 10 frames.
+    """
+
+    import sys, os
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.frameProfiler import FrameProfiler
+
+    prof = FrameProfiler(window=4)
+    for i in range(10):
+        prof.begin_frame()
+        prof.lap("a")
+        if i % 2 == 0:
+            prof.lap("b")
+        prof.lap("a")
+        prof.end_frame()
+
+    return prof
+
+
+def test_phases(profiler):
+    assert profiler.phases == ["a", "b"]
+    assert profiler.frames == 10
+
+    stats = profiler.summary()
+    assert set(stats) == {"a", "b", "total"}
+    for s in stats.values():
+        assert s["p50"] <= s["p90"] <= s["p99"] <= s["max"]
+    assert stats["a"]["mean"] + stats["b"]["mean"] <= stats["total"]["mean"]
+
+
+def test_dump_csv(profiler, tmpdir):
+    path = str(tmpdir.join("frames.csv"))
+    profiler.dump(path)
+    with open(path) as f:
+        lines = f.read().splitlines()
+
+    assert lines[0] == "frame,a,b,total"
+    # Only the last window frames are kept
+    assert [l.split(",")[0] for l in lines[1:]] == ["6", "7", "8", "9"]
+
+
+def test_dump_json(profiler, tmpdir):
+    import json
+
+    path = str(tmpdir.join("frames.json"))
+    profiler.dump(path)
+    with open(path) as f:
+        data = json.load(f)
+
+    assert data["frames_profiled"] == 10
+    assert len(data["frames"]) == 4
+    assert "b" not in data["frames"][1]
+
+
+def test_unfinished_frames(profiler):
+    # E.g., paused frames that were begun but never ended
+    for i in range(3):
+        profiler.begin_frame()
+        profiler.lap("c")
+    profiler.begin_frame()
+    profiler.lap("c")
+    profiler.abandon_frame()
+
+    profiler.begin_frame()
+    profiler.lap("c")
+    profiler.end_frame()
+
+    assert profiler.phases == ["a", "b", "c"]
+    assert profiler.frames == 11
+    assert set(profiler.summary()) == {"a", "b", "c", "total"}
@@ -0,0 +1,81 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for ImageBundle.
+"""
+
+NAMES = ["XOR_move_00.png", "BB.png", "heart_3.png", "icon.png"]
+
+@pytest.fixture
+def image_dir(tmp_path):
+    import sys, os, shutil, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    game_images = os.path.join(
+        os.path.dirname(os.path.split(os.path.abspath(__file__))[0]), "Images")
+    for name in NAMES:
+        shutil.copy2(os.path.join(game_images, name), str(tmp_path))
+
+    return tmp_path
+
+
+def pixels(img):
+    import pygame
+
+    return (img.get_size(),
+            pygame.image.tobytes(img.convert_alpha(), "RGBA"))
+
+
+def test_same_as_png(image_dir):
+    import pygame
+    from Classes.imageBundle import ImageBundle
+
+    path = str(image_dir / "images.bundle")
+    assert ImageBundle.build(str(image_dir), path) == len(NAMES)
+
+    bundle = ImageBundle(path)
+    assert len(bundle) == len(NAMES)
+    for name in NAMES:
+        img_path = str(image_dir / name)
+        img = bundle.load(img_path)
+        assert img is not None
+        assert pixels(img) == pixels(pygame.image.load(img_path))
+
+
+def test_stale(image_dir):
+    import os, shutil
+    from Classes.imageBundle import ImageBundle
+
+    path = str(image_dir / "images.bundle")
+    ImageBundle.build(str(image_dir), path)
+    bundle = ImageBundle(path)
+
+    # Changed since the bundle was built
+    shutil.copy2(str(image_dir / "BB.png"), str(image_dir / "icon.png"))
+    assert bundle.load(str(image_dir / "icon.png")) is None
+    assert bundle.load(str(image_dir / "BB.png")) is not None
+
+    # Not in the bundle, or not in its directory
+    assert bundle.load(str(image_dir / "new.png")) is None
+    os.mkdir(str(image_dir / "sub"))
+    shutil.copy2(str(image_dir / "BB.png"), str(image_dir / "sub"))
+    assert bundle.load(str(image_dir / "sub" / "BB.png")) is None
+
+
+def test_not_a_bundle(image_dir):
+    from Classes.imageBundle import ImageBundle
+
+    with pytest.raises(ValueError):
+        ImageBundle(str(image_dir / "BB.png"))
@@ -0,0 +1,66 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for ImageCache.
+"""
+
+@pytest.fixture
+def image_dir():
+    """
+    Path to Images/ with a (dummy) display set up for convert_alpha().
+    """
+
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))
+
+    return os.path.join(os.path.dirname(os.path.split(
+        os.path.abspath(__file__))[0]), "Images")
+
+
+def test_loaded_once(image_dir):
+    import os
+    from Classes.imageCache import ImageCache
+
+    cache = ImageCache()
+    a = cache.load(os.path.join(image_dir, "BB.png"))
+    b = cache.load(os.path.join(image_dir, "BB.png"))
+    assert a is b
+    assert len(cache) == 1
+
+
+def test_flip_cached(image_dir):
+    import os
+    from Classes.imageCache import ImageCache
+
+    cache = ImageCache()
+    img = cache.load(os.path.join(image_dir, "Fred_walk_00.png"))
+    flipped = cache.flip(img, True, False)
+    assert flipped is cache.flip(img, True, False)
+    # Flipping back gives the original
+    assert cache.flip(flipped, True, False) is img
+
+
+def test_eviction(image_dir):
+    import os
+    from Classes.imageCache import ImageCache
+
+    cache = ImageCache()
+    a = cache.load(os.path.join(image_dir, "Fred_walk_00.png"))
+    cache.max_bytes = cache.n_bytes
+    b = cache.load(os.path.join(image_dir, "Fred_walk_02.png"))
+    assert len(cache) == 1
+    assert cache.n_bytes <= cache.max_bytes
+    # Least recently used image was dropped
+    assert cache.load(os.path.join(image_dir, "Fred_walk_00.png")) is not a
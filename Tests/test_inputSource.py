@@ -0,0 +1,67 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for InputSources.
+"""
+
+@pytest.fixture
+def fire():
+    """
+    An InputState with only fire pressed.
+    """
+
+    import sys, os
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.inputSource import InputState
+
+    return InputState.NONE._replace(fire=True)
+
+
+def test_scripted(fire):
+    from Classes.inputSource import ScriptedInput, InputState
+
+    source = ScriptedInput([(2, fire), (0, fire), (1, InputState.NONE)])
+    states = []
+    for i in range(5):
+        source.next_frame()
+        states.append(source.state)
+
+    assert states == [fire, fire, InputState.NONE, InputState.NONE,
+                      InputState.NONE]
+    assert source.finished
+    assert source.frame == 5
+
+
+def test_scripted_repeat(fire):
+    from Classes.inputSource import ScriptedInput, InputState
+
+    source = ScriptedInput([(1, fire), (1, InputState.NONE)], repeat=True)
+    states = []
+    for i in range(4):
+        source.next_frame()
+        states.append(source.state)
+
+    assert states == [fire, InputState.NONE, fire, InputState.NONE]
+    assert not source.finished
+
+
+def test_programmatic(fire):
+    from Classes.inputSource import ProgrammaticInput, InputState
+
+    source = ProgrammaticInput(lambda frame: fire if frame < 2 else None)
+    states = []
+    for i in range(3):
+        source.next_frame()
+        states.append(source.state)
+
+    assert states == [fire, fire, InputState.NONE]
+    assert source.finished
@@ -0,0 +1,96 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for ProjectileEngine.
+
+The engine must give exactly the same results as updating every Projectile
+on its own.
+"""
+
+numpy = pytest.importorskip("numpy")
+
+def run(engine, frames=60):
+    """
+    Fire lots of BBs around Zero, with some XORs to hit, and record where
+    everything is after every frame.
+    """
+
+    import sys, os, random, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Classes.projectileBox import ProjectileBox
+    from Classes.projectileEngine import ProjectileEngine
+    from Levels.zero import Zero
+    from Baddies.XOR import XOR
+    from Characters.fred import Fred
+    from Projectiles.bb import BB
+
+    a_level = Zero({"XOR": XOR}, None, pygame.sprite.RenderUpdates(), [])
+    a_level.rng.seed(3)
+    kwargs = {"owner"             : a_level,
+              "centerx"           : a_level.player_spawn_x,
+              "centery"           : a_level.player_spawn_y,
+              "floors"            : a_level.floors,
+              "l_walls"           : a_level.l_walls,
+              "r_walls"           : a_level.r_walls,
+              "ceilings"          : a_level.ceilings,
+              "barrier_index"     : a_level.barrier_index(),
+              "targets"           : a_level.baddies,
+              "fired_projectiles" : pygame.sprite.RenderUpdates(),
+              "decoration_list"   : []}
+    a_level.set_player(Fred(kwargs))
+
+    rng = random.Random(5)
+    for i in range(20):
+        a_level._spawn_random_baddie(rng.randint(40, 600),
+                                     rng.randint(40, 440))
+
+    if engine:
+        fired = ProjectileEngine()
+    else:
+        fired = pygame.sprite.RenderUpdates()
+    kwargs["owner"] = a_level.player
+    kwargs["projectile_class"] = BB
+    kwargs["fired_projectiles"] = fired
+    kwargs["max_in_flight"] = 200
+    kwargs["centerx"] = 0
+    kwargs["centery"] = 0
+    box = ProjectileBox(kwargs)
+
+    trace = []
+    for frame in range(frames):
+        # Keep the number in flight changing
+        for pr in box.fire(min(box.avail_projectiles(), rng.randint(0, 20))):
+            pr.reset(rng.randint(0, 640), rng.randint(0, 480),
+                     rng.randint(0, 3) * 90)
+        fired.update()
+        if engine:
+            fired.sync()
+        trace.append(sorted((pr.rect.center, pr._xf, pr._yf)
+                            for pr in fired))
+        trace.append([(b.hp, b.active) for b in a_level.baddies])
+
+    return trace
+
+
+def test_same_as_update():
+    from Classes.projectileEngine import ProjectileEngine
+
+    min_projectiles = ProjectileEngine.min_projectiles
+    ProjectileEngine.min_projectiles = 1
+    try:
+        assert run(True) == run(False)
+    finally:
+        ProjectileEngine.min_projectiles = min_projectiles
@@ -0,0 +1,148 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for ProjectilePool.
+"""
+
+@pytest.fixture
+def a_level():
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Levels.zero import Zero
+
+    return Zero({}, None, pygame.sprite.RenderUpdates(), [])
+
+
+def make_box(a_level, max_in_flight, pools=True, targets=None,
+             projectile_class=None):
+    import pygame
+    from Classes.projectileBox import ProjectileBox
+    from Projectiles.bb import BB
+
+    if projectile_class is None:
+        projectile_class = BB
+
+    kwargs = {"owner"             : None,
+              "floors"            : a_level.floors,
+              "l_walls"           : a_level.l_walls,
+              "r_walls"           : a_level.r_walls,
+              "ceilings"          : a_level.ceilings,
+              "barrier_index"     : a_level.barrier_index(),
+              "projectile_class"  : projectile_class,
+              "fired_projectiles" : a_level.baddie_projectiles,
+              "max_in_flight"     : max_in_flight,
+              "targets"           : targets,
+              "centerx"           : 0,
+              "centery"           : 0,
+              "decoration_list"   : []}
+    if pools:
+        kwargs["projectile_pools"] = a_level.projectile_pools
+
+    return ProjectileBox(kwargs)
+
+
+def test_shared(a_level):
+    import pygame
+    from Projectiles.bb import BB
+
+    targets = pygame.sprite.Group()
+    a = make_box(a_level, 3)
+    b = make_box(a_level, 5, targets=targets)
+    pool = a_level.projectile_pools[BB]
+
+    # Nothing is made until it's fired
+    assert len(pool) == 0
+
+    fired_a = a.fire(3)
+    assert a.avail_projectiles() == 0
+    assert a.in_flight() == 3
+    assert b.avail_projectiles() == 5
+    for pr in fired_a:
+        a.recycle(pr)
+    assert len(pool) == 3
+    assert a.avail_projectiles() == 3
+
+    # b reuses a's Projectiles before making more
+    fired_b = b.fire(4)
+    assert fired_b[0:3] == fired_a
+    assert len(pool) == 0
+    for pr in fired_b:
+        assert pr._owner is b
+        assert pr.targets is targets
+    assert b.avail_projectiles() == 1
+
+    b.recycle(fired_b[0])
+    assert b.in_flight() == 3
+    assert fired_b[0] not in a_level.baddie_projectiles
+    assert len(pool) == 1
+
+
+def test_own_pool(a_level):
+    from Projectiles.bb import BB
+
+    a = make_box(a_level, 2, pools=False)
+    b = make_box(a_level, 2, pools=False)
+
+    pr = a.fire(1)[0]
+    a.recycle(pr)
+    assert BB not in a_level.projectile_pools
+    assert pr not in b.fire(2)
+
+
+def test_recycle_twice(a_level):
+    from Projectiles.bb import BB
+
+    a = make_box(a_level, 2)
+    pr = a.fire(1)[0]
+    # E.g., hit a barrier and a target in the same update()
+    a.recycle(pr)
+    a.recycle(pr)
+    assert a.in_flight() == 0
+    assert len(a_level.projectile_pools[BB]) == 1
+
+
+def test_fire_past_quota(a_level):
+    from Projectiles.bb import BB
+
+    a = make_box(a_level, 3)
+    assert len(a.fire(2)) == 2
+    assert len(a.fire(5)) == 1
+    assert a.fire(1) == []
+    assert a.in_flight() == 3
+    assert len(a_level.baddie_projectiles) == 3
+
+    # The pool only made as many as the quota allows
+    for pr in a_level.baddie_projectiles.sprites():
+        a.recycle(pr)
+    assert len(a_level.projectile_pools[BB]) == 3
+
+
+def test_same_in_every_game(a_level):
+    import pygame
+    from Levels.zero import Zero
+    from Projectiles.blaster import Blaster
+
+    speeds = []
+    for game in range(2):
+        if game > 0:
+            a_level = Zero({}, None, pygame.sprite.RenderUpdates(), [])
+        box = make_box(a_level, 1, projectile_class=Blaster)
+        # All the pulses of one shot
+        prs = box.fire(1)
+        speeds.append([pr._speed for pr in prs])
+
+    assert speeds[0] == speeds[1]
+    assert len(set(speeds[0])) == len(speeds[0])
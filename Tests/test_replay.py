@@ -0,0 +1,84 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for Replay.
+"""
+
+@pytest.fixture
+def recorded():
+    """
+    A Replay recorded from a ScriptedInput, and the states it recorded.
+    """
+
+    import sys, os
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.inputSource import ScriptedInput, InputState
+    from Classes.replay import Replay, RecordingInput
+
+    none = InputState.NONE
+    script = [(3, none), (1, none._replace(fire=True)),
+              (300, none._replace(right=True, jump=True)),
+              (2, none._replace(pause=True)), (1, none)]
+    replay = Replay(2**40 + 5, "Zero", "Fred", ["XOR"])
+    source = RecordingInput(ScriptedInput(script), replay)
+    states = []
+    for i in range(307):
+        source.next_frame()
+        states.append(source.state)
+
+    return (replay, states)
+
+
+def test_run_length(recorded):
+    replay, states = recorded
+    assert replay.frames == 307
+    assert len(replay.runs) == 5
+
+
+def test_round_trip(recorded, tmpdir):
+    from Classes.replay import Replay, ReplayInput
+
+    replay, states = recorded
+    path = str(tmpdir.join("game.rep"))
+    replay.save(path)
+    loaded = Replay.load(path)
+
+    assert loaded.seed == replay.seed
+    assert loaded.level == "Zero"
+    assert loaded.player == "Fred"
+    assert loaded.exclude == ["XOR"]
+    assert loaded.frames == 307
+
+    source = ReplayInput(loaded)
+    played = []
+    for i in range(307):
+        source.next_frame()
+        played.append(source.state)
+    assert played == states
+    assert not source.finished
+    source.next_frame()
+    assert source.finished
+
+
+def test_corrupt(recorded, tmpdir):
+    from Classes.replay import Replay
+
+    replay, _ = recorded
+    path = str(tmpdir.join("game.rep"))
+    replay.save(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-1])
+
+    with pytest.raises(ValueError):
+        Replay.load(path)
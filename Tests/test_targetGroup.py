@@ -0,0 +1,95 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for TargetGroup.
+
+TargetGroup.collide_circle() must agree exactly (including order) with
+pygame.sprite.spritecollide() using collide_circle.
+"""
+
+@pytest.fixture
+def targets():
+    """
+    A TargetGroup of randomly placed sprites, some with a radius and some
+    without.
+    """
+
+    import sys, os, random, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    from Classes.targetGroup import TargetGroup
+
+    rng = random.Random(7)
+    group = TargetGroup(cell_size=32)
+    for i in range(60):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rng.randint(-50, 650), rng.randint(-50, 500),
+                                  rng.randint(1, 60), rng.randint(1, 60))
+        if i % 2 == 0:
+            sprite.radius = rng.randint(1, 20)
+        group.add(sprite)
+
+    return group
+
+
+def probes(seed):
+    """
+    Randomly placed sprites to test for hits.
+    """
+
+    import random, pygame
+
+    rng = random.Random(seed)
+    sprites = []
+    for i in range(500):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rng.randint(-50, 650), rng.randint(-50, 500),
+                                  rng.randint(1, 20), rng.randint(1, 20))
+        sprite.radius = rng.choice([0, 1, 2.5, 8, 30])
+        sprites.append(sprite)
+    return sprites
+
+
+def check(group, seed):
+    import pygame
+
+    hits = 0
+    for probe in probes(seed):
+        expected = pygame.sprite.spritecollide(probe, group, False,
+                                               pygame.sprite.collide_circle)
+        assert group.collide_circle(probe) == expected
+        hits += len(expected)
+    return hits
+
+
+def test_matches_spritecollide(targets):
+    # Make sure the test actually tests something
+    assert check(targets, 1) > 0
+
+
+def test_add_remove(targets):
+    import pygame
+
+    check(targets, 2)
+    for sprite in targets.sprites()[::3]:
+        targets.remove(sprite)
+    sprite = pygame.sprite.Sprite()
+    sprite.rect = pygame.Rect(300, 200, 40, 40)
+    targets.add(sprite)
+    check(targets, 3)
+
+
+def test_moved_targets(targets):
+    check(targets, 4)
+    for sprite in targets:
+        sprite.rect.move_ip(37, -21)
+    targets.invalidate()
+    check(targets, 5)
@@ -0,0 +1,85 @@
+# Copyright (C) 2018
+# Author: Erik Tomusk
+#
+# This is free software, distributed under the GNU GPL version 3.
+# This software comes with ABSOLUTELY NO WARRANTY.
+# See GPLv3.txt for details.
+
+import pytest
+
+"""
+pytest unit tests for TextureAtlas.
+"""
+
+@pytest.fixture
+def images():
+    """
+    Some of the game's images, with a (dummy) display set up.
+    """
+
+    import sys, os, pygame
+    # Add parent directory to path so can get Classes
+    sys.path.append(os.path.dirname(os.path.split(os.path.abspath(__file__))[0]))
+
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    pygame.display.set_mode((640, 480))
+
+    from Classes.imageCache import image_cache
+
+    image_dir = os.path.join(os.path.dirname(os.path.split(
+        os.path.abspath(__file__))[0]), "Images")
+    return [image_cache.load(os.path.join(image_dir, name))
+            for name in ["XOR_move_00.png", "Fred_stand.png", "BB.png",
+                         "Kreutzwald_dead_01.png", "heart_3.png"]]
+
+
+def test_same_pixels(images):
+    import pygame
+    from Classes.textureAtlas import TextureAtlas
+
+    atlas = TextureAtlas(images + images[0:2], max_width=100)
+    assert len(atlas) == len(images)
+
+    for img in images:
+        sub = atlas.get(img)
+        assert sub.get_parent() is atlas.surface
+        assert sub.get_size() == img.get_size()
+        assert pygame.image.tobytes(sub, "RGBA") == \
+            pygame.image.tobytes(img, "RGBA")
+
+    # Nothing overlaps
+    rects = [atlas.get(img).get_abs_offset() + atlas.get(img).get_size()
+             for img in images]
+    rects = [pygame.Rect(r) for r in rects]
+    for i, r in enumerate(rects):
+        assert r.collidelist(rects[i+1:]) == -1
+        assert atlas.surface.get_rect().contains(r)
+
+
+def test_characters_share_atlas(images):
+    import pygame
+    from Levels.zero import Zero
+    from Characters.fred import Fred
+
+    a_level = Zero({}, None, pygame.sprite.RenderUpdates(), [])
+    kwargs = {"owner"             : a_level,
+              "centerx"           : 100,
+              "centery"           : 100,
+              "floors"            : a_level.floors,
+              "l_walls"           : a_level.l_walls,
+              "r_walls"           : a_level.r_walls,
+              "ceilings"          : a_level.ceilings,
+              "targets"           : a_level.baddies,
+              "fired_projectiles" : pygame.sprite.RenderUpdates(),
+              "decoration_list"   : []}
+    a = Fred(dict(kwargs))
+    b = Fred(dict(kwargs))
+
+    # Including the flipped, left-facing images
+    for fred in (a, b):
+        for img in [fred.image, fred._images["walk"]["left"]["up"][1],
+                    fred._images["dead"][3]]:
+            assert img.get_parent() is Fred._atlas.surface
+    assert a._images["walk"]["left"]["up"][1] is \
+        b._images["walk"]["left"]["up"][1]
@@ -16,7 +16,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
-import sys, os, inspect, importlib, time, random
+import sys, os, time, random, atexit
 import pygame
 from optparse import OptionParser
 from pygame.locals import *
@@ -25,8 +25,14 @@ from Classes.player import Player
 from Classes.baddie import Baddie
 from Classes.countdownLevel import CountdownLevel
 from Classes.heart import Heart
-from Levels.zero import Zero
 from Classes.projectile import Projectile
+from Classes.inputSource import InputSource, KeyboardInput
+from Classes.replay import Replay, RecordingInput, ReplayInput
+from Classes.frameProfiler import FrameProfiler
+from Classes.projectileEngine import ProjectileEngine
+from Classes.assetManifest import AssetManifest
+from Classes.imageBundle import ImageBundle, BUNDLE_PATH, load_image
+from Classes.eventLog import event_log, LEVELS, OFF
 
 # Some global variables for the game
 GAME_DIR = os.path.split(os.path.abspath(__file__))[0]
@@ -35,6 +41,27 @@ def main():
 # User input
     OPT = get_options()
 
+# Just pack the images (see ImageBundle)
+    if OPT.bundle_images:
+        n = ImageBundle.build(os.path.join(GAME_DIR, "Images"), BUNDLE_PATH)
+        print("Packed", n, "images into", BUNDLE_PATH)
+        return
+
+# A replay decides what game is played
+    replay = None
+    if OPT.replay is not None:
+        try:
+            replay = Replay.load(OPT.replay)
+        except (OSError, ValueError) as e:
+            print("ERROR: Cannot load replay:", e)
+            raise SystemExit
+        OPT.seed = replay.seed
+        OPT.level = replay.level
+        OPT.player = replay.player
+        OPT.exclude = replay.exclude
+        OPT.headless = True
+        OPT.frames = replay.frames
+
 # Find and load game assets
     player_classes = get_subclasses("Characters", Player)
     baddie_classes = get_subclasses("Baddies", Baddie)
@@ -43,6 +70,12 @@ def main():
     #   available
     level_classes = get_subclasses("Levels", CountdownLevel)
 
+# All random choices come from one seed so games can be repeated
+    seed = OPT.seed
+    if seed is None:
+        seed = random.randrange(2**32)
+    rng = random.Random(seed)
+
 # Determine the main player character
     # Happens before asset exclusion below to allow complete configuration to
     #   be printed
@@ -57,7 +90,7 @@ def main():
             if len(players) == 0:
                 print("ERROR: No players available")
                 raise SystemExit
-            i = random.randint(0, len(players)-1)
+            i = rng.randint(0, len(players)-1)
             primary_player_classname = players[i]
         else:
             primary_player_classname = "Fred"
@@ -97,13 +130,16 @@ def main():
         else:
             print("+ " + level)
 
+    print("Seed:", seed)
+
 # Print quick instructions
-    print("\nControls:")
-    print("Arrows: Move")
-    print("Space:  Jump")
-    print("f:      Fire")
-    print("p:      Pause")
-    print("q:      Quit\n")
+    if not OPT.headless:
+        print("\nControls:")
+        print("Arrows: Move")
+        print("Space:  Jump")
+        print("f:      Fire")
+        print("p:      Pause")
+        print("q:      Quit\n")
 
 # Remove excluded assets
     for item in OPT.exclude:
@@ -118,27 +154,33 @@ def main():
         raise SystemExit
 
 # Dictionary of available power-ups that a Level can use
+    # (Sorted so the same seed gives the same power-ups on any machine)
     power_ups = {'players': [],
-                 'projectiles': list(projectile_classes.values()),
+                 'projectiles': [projectile_classes[pr]
+                                 for pr in sorted(projectile_classes.keys())],
                  'health': [Heart]}
     for player in sorted(player_classes.keys()):
         if player != primary_player_classname:
             power_ups['players'].append(player_classes[player])
 
 # Initialize pygame
+    # In headless mode there's no window, but images still need a display
+    #   surface to be converted to, so use SDL's dummy video driver
+    if OPT.headless:
+        os.environ["SDL_VIDEODRIVER"] = "dummy"
     pygame.init()
     screen = pygame.display.set_mode((640, 480))
     pygame.display.set_caption("Projectile")
     pygame.mouse.set_visible(0)
     try:
-        icon = pygame.image.load(os.path.join(GAME_DIR, "Images", "icon.png"))
+        icon = load_image(os.path.join(GAME_DIR, "Images", "icon.png"))
     except pygame.error:
         print("Cannot load icon.png")
         raise SystemExit
     pygame.display.set_icon(icon)
 
     # All Projectiles fired by all players end up here
-    player_projectile_group = pygame.sprite.RenderPlain()
+    player_projectile_group = ProjectileEngine()
     # PSprites that want decorations place themselves here
     decoration_list = []
 
@@ -146,7 +188,7 @@ def main():
     # Most everything happens through the Level
     level_name = OPT.level
     if level_name is None:
-        i = random.randint(0, len(level_classes)-1)
+        i = rng.randint(0, len(level_classes)-1)
         level_name = sorted(level_classes.keys())[i]
 
     if level_name not in level_classes:
@@ -158,6 +200,7 @@ def main():
         power_ups,
         player_projectile_group,
         decoration_list)
+    a_level.rng.seed(seed)
     screen.blit(a_level.backdrop, (0, 0))
 
     # The main Player object
@@ -169,13 +212,62 @@ def main():
                 "l_walls"           : a_level.l_walls,
                 "r_walls"           : a_level.r_walls,
                 "ceilings"          : a_level.ceilings,
+                "barrier_index"     : a_level.barrier_index(),
                 "targets"           : a_level.baddies,
                 "fired_projectiles" : player_projectile_group,
+                "projectile_pools"  : a_level.projectile_pools,
                 "decoration_list"   : decoration_list}
     a_dude = player_classes[primary_player_classname](p_kwargs)
 
     a_level.set_player(a_dude)
 
+    if OPT.check_barriers:
+        print("Barriers of " + level_name + ":")
+        for line in a_level.barrier_report.report():
+            print(line)
+
+# Where the player's input comes from
+    if replay is not None:
+        source = ReplayInput(replay)
+    elif OPT.headless:
+        # Nobody at the keyboard
+        source = InputSource()
+    else:
+        source = KeyboardInput()
+
+    if OPT.record is not None:
+        recording = Replay(seed, level_name, primary_player_classname,
+                           OPT.exclude)
+        # The game can be quit from lots of places, so save on exit
+        atexit.register(recording.save, OPT.record)
+        a_level.set_input(RecordingInput(source, recording))
+    else:
+        a_level.set_input(source)
+
+# Frame timing
+    prof = None
+    if OPT.profile_frames is not None:
+        prof = FrameProfiler()
+        a_level.profiler = prof
+        atexit.register(prof.dump, OPT.profile_frames)
+
+# Game events are written out in the background (see EventLog)
+    event_log.level = LEVELS[OPT.log_level]
+    if event_log.level < OFF:
+        event_log.start(OPT.log)
+        atexit.register(event_log.stop)
+
+# Headless games only run the simulation, as fast as possible
+    if OPT.headless:
+        frames, seconds = run_headless(a_level, OPT.frames)
+        # Write out the last events before the results
+        event_log.stop()
+        print("\nFrames:", frames)
+        print("Final score:", a_level.points)
+        if seconds > 0.0:
+            print("Frames per second: %.1f" % (frames / seconds))
+        return
+
     clock = pygame.time.Clock()
 
 # Score display
@@ -194,7 +286,7 @@ def main():
 
     for name in ["heart_1.png", "heart_2.png", "heart_3.png", "heart_4.png"]:
         try:
-            heart = pygame.image.load(os.path.join(GAME_DIR, "Images", name))
+            heart = load_image(os.path.join(GAME_DIR, "Images", name))
         except pygame.error:
             print("Cannot load", name)
             raise SystemExit
@@ -249,38 +341,59 @@ def main():
         pause.blit(pause_text, pause_rect)
 
 # Main game loop
+    # Only the parts of the screen that changed are pushed to the display,
+    #   except when full_update is set (e.g., when the window is exposed)
+    full_update = False
+    # pygame 1.9 only has VIDEOEXPOSE
+    window_exposed = getattr(pygame, "WINDOWEXPOSED", None)
+
     while 1:
         clock.tick(60)
+        if prof is not None:
+            prof.begin_frame()
 
         prev_pause_flag = pause_flag
 
         for event in pygame.event.get():
             if event.type == QUIT:
                 sys.exit()
+            if event.type == VIDEOEXPOSE or event.type == window_exposed:
+                full_update = True
             if event.type == KEYDOWN:
-                if event.key == K_f:
-                    a_level.fire()
-                elif (event.key == K_ESCAPE or event.key == K_q):
+                if (event.key == K_ESCAPE or event.key == K_q):
                     sys.exit()
-                elif event.key == K_p:
-                    pause_flag = not pause_flag
+            source.handle_event(event)
+
+        a_level.input.next_frame()
+        if a_level.input.state.pause:
+            pause_flag = not pause_flag
+        if prof is not None:
+            prof.lap("events")
 
     # Game pausing
         if pause_flag:
             if not prev_pause_flag:
                 screen.blit(pause, (0, 0))
                 pygame.display.flip()
+            if prof is not None:
+                prof.abandon_frame()
             continue
         if not pause_flag and prev_pause_flag:
             screen.blit(a_level.backdrop, (0, 0))
+            full_update = True
 
     # Clear and update
-        a_level.clear(screen)
+        # dirty collects every Rect of the screen changed in this frame
+        dirty = a_level.clear(screen)
+        if prof is not None:
+            prof.lap("clear")
         a_level.update()
+        if prof is not None:
+            prof.lap("level")
 
     # Clear health area if needed
         if health != a_level.player.hp:
-            screen.blit(a_level.backdrop, heart_area, heart_area)
+            dirty.append(screen.blit(a_level.backdrop, heart_area, heart_area))
             health = a_level.player.hp
 
     # Draw various text
@@ -288,12 +401,13 @@ def main():
 
     # Draw score
             if a_level.points != score:
-                screen.blit(a_level.backdrop, score_rect, score_rect)
+                dirty.append(screen.blit(a_level.backdrop, score_rect,
+                                         score_rect))
                 score = a_level.points
                 score_text = font.render(str(score), False, (0, 0, 0))
                 score_rect = score_text.get_rect(top=2, right=598)
 
-            screen.blit(score_text, score_rect)
+            dirty.append(screen.blit(score_text, score_rect))
 
     # Draw ammo count
             if a_level.player._box._max_shots == -1:
@@ -305,44 +419,59 @@ def main():
             ammo_class = a_level.player._box.projectile_class
             if ammo_class is not prev_ammo_class:
                 prev_ammo_class = ammo_class
-                ammo_img_surf = a_level.player._box.unused_projectiles.\
-                    sprites()[0].image.copy()
+                ammo_img_surf = \
+                    a_level.player._box.projectile_image().copy()
                 ammo_img_rect = ammo_img_surf.get_rect(centerx=611, centery=8)
-                screen.blit(a_level.backdrop, ammo_img_area, ammo_img_area)
+                dirty.append(screen.blit(a_level.backdrop, ammo_img_area,
+                                         ammo_img_area))
 
             if ammo_count != prev_ammo_count:
-                screen.blit(a_level.backdrop, ammo_count_area, ammo_count_area)
+                dirty.append(screen.blit(a_level.backdrop, ammo_count_area,
+                                         ammo_count_area))
                 prev_ammo_count = ammo_count
 
-            screen.blit(ammo_count_text[ammo_count], ammo_count_area)
-            screen.blit(ammo_img_surf, ammo_img_rect)
+            dirty.append(screen.blit(ammo_count_text[ammo_count],
+                                     ammo_count_area))
+            dirty.append(screen.blit(ammo_img_surf, ammo_img_rect))
 
     # Draw FPS
             if OPT.fps:
-                screen.blit(a_level.backdrop, fps_rect, fps_rect)
+                dirty.append(screen.blit(a_level.backdrop, fps_rect, fps_rect))
                 fps = int(clock.get_fps())
                 fps_text = font.render(str(fps), False, (0, 0, 0))
                 fps_rect = fps_text.get_rect(bottom=478, right=637)
-                screen.blit(fps_text, fps_rect)
+                dirty.append(screen.blit(fps_text, fps_rect))
 
     # Draw health
         full_hearts = health // 4
         frac_hearts = health % 4
 
         for i in range(full_hearts):
-            screen.blit(hearts[3], (i*18+3, 2))
+            dirty.append(screen.blit(hearts[3], (i*18+3, 2)))
         if frac_hearts == 1:
-            screen.blit(hearts[0], (full_hearts*18+3, 2))
+            dirty.append(screen.blit(hearts[0], (full_hearts*18+3, 2)))
         elif frac_hearts == 2:
-            screen.blit(hearts[1], (full_hearts*18+3, 2))
+            dirty.append(screen.blit(hearts[1], (full_hearts*18+3, 2)))
         elif frac_hearts == 3:
-            screen.blit(hearts[2], (full_hearts*18+3, 2))
+            dirty.append(screen.blit(hearts[2], (full_hearts*18+3, 2)))
 
-    # Draw everything else
-        a_level.draw(screen)
+        if prof is not None:
+            prof.lap("hud")
 
-    # Flip
-        pygame.display.flip()
+    # Draw everything else
+        dirty.extend(a_level.draw(screen))
+        if prof is not None:
+            prof.lap("draw")
+
+    # Push changes to the display
+        if full_update:
+            pygame.display.flip()
+            full_update = False
+        else:
+            pygame.display.update(dirty)
+        if prof is not None:
+            prof.lap("display")
+            prof.end_frame()
 
     # On death:
         if a_level.dead:
@@ -371,6 +500,56 @@ def main():
                     sys.exit()
 
 
+def run_headless(a_level, max_frames=None):
+    """
+    Run a_level without drawing anything or waiting between frames.
+
+    Runs for max_frames frames (None = no limit) or until the Level is dead.
+    Only the simulation is run; Level.clear(), Level.draw(), and the display
+    are never touched.
+
+    The player is controlled by a_level.input. Pausing works like in the
+    normal game loop: frames pass, but the Level isn't updated. If the game
+    is paused when the input runs out, it's never going to be unpaused, so
+    the run ends.
+
+    Frames are timed if a_level.profiler is set (paused frames aren't).
+
+    Returns (number of frames run, wall-clock seconds taken).
+    """
+
+    frames = 0
+    paused = False
+    prof = a_level.profiler
+    start = time.perf_counter()
+
+    while max_frames is None or frames < max_frames:
+        if prof is not None:
+            prof.begin_frame()
+        # Keep SDL happy; there's nobody to send events anyway
+        pygame.event.pump()
+        a_level.input.next_frame()
+        frames += 1
+        if a_level.input.state.pause:
+            paused = not paused
+        if paused:
+            if prof is not None:
+                prof.abandon_frame()
+            if a_level.input.finished:
+                break
+            continue
+        if prof is not None:
+            prof.lap("events")
+        a_level.update()
+        if prof is not None:
+            prof.lap("level")
+            prof.end_frame()
+        if a_level.dead:
+            break
+
+    return (frames, time.perf_counter() - start)
+
+
 def get_subclasses(directory, base):
     """
     Get subclasses of a base class from all Python files in a directory.
@@ -379,32 +558,16 @@ def get_subclasses(directory, base):
     built-in issubclass() function thinks).
     directory is assumed to be in GAME_DIR. Further nesting is not supported.
 
-    Inspired in part by https://code.activestate.com/recipes/553262-list-
-    classes-methods-and-functions-in-a-module/.
+    The modules aren't imported to find the classes (see AssetManifest).
+    Returns a dictionary of class name -> class where each class is only
+    imported when it's first looked up.
     """
 
     if not os.path.isdir(os.path.join(GAME_DIR, directory)):
         print(directory, "does not exist")
         raise SystemExit
 
-    # Get list of python modules
-    pys = []
-    for f in os.listdir(directory):
-        if f.endswith(".py"):
-            pys.append(directory + "." + f.replace(".py", ""))
-
-    # Import all the modules and find the correct classes
-    classes = {}
-    for py in pys:
-        t_mod = importlib.import_module(py)
-        for item in dir(t_mod):
-            obj = getattr(t_mod, item)
-            if inspect.isclass(obj) and \
-                    issubclass(obj, base) and \
-                    obj is not base:
-                classes[obj.__name__] = obj
-
-    return classes
+    return AssetManifest(GAME_DIR).find(directory, base)
 
 
 def get_options():
@@ -427,6 +590,54 @@ def get_options():
     parser.add_option("--fps", action="store_true", dest="fps", default=False,
         help="Show game's FPS")
 
+    parser.add_option("--seed", action="store", type="int", dest="seed",
+        default=None,
+        help="Seed for random numbers (same seed and same input give the "
+             "same game)")
+
+    parser.add_option("--headless", action="store_true", dest="headless",
+        default=False,
+        help="Run the game without a window or frame rate limit")
+
+    parser.add_option("--profile-frames", action="store", type="string",
+        dest="profile_frames", default=None,
+        help="Time each phase of every frame and write the times to a file "
+             "on exit (JSON if the name ends in .json, otherwise CSV)")
+
+    parser.add_option("--check-barriers", action="store_true",
+        dest="check_barriers", default=False,
+        help="Print what was done to the level's barriers when it was "
+             "loaded, and any barriers that are too close together")
+
+    parser.add_option("--record", action="store", type="string",
+        dest="record", default=None,
+        help="Record the game to a replay file")
+
+    parser.add_option("--replay", action="store", type="string",
+        dest="replay", default=None,
+        help="Play back a replay file (headless)")
+
+    parser.add_option("--log", action="store", type="string", dest="log",
+        default="-",
+        help="Write game events to a file instead of stdout (JSON lines if "
+             "the name ends in .jsonl)")
+
+    parser.add_option("--log-level", action="store", type="choice",
+        dest="log_level", default="info", choices=sorted(LEVELS.keys()),
+        help="Least level of game events to log: debug, info, warning, or "
+             "off (default: info)")
+
+    parser.add_option("--bundle-images", action="store_true",
+        dest="bundle_images", default=False,
+        help="Pack Images/ into one pre-decoded bundle that loads faster, "
+             "and exit (run again after changing images; changed images are "
+             "loaded from their PNGs until then)")
+
+    parser.add_option("--frames", action="store", type="int", dest="frames",
+        default=None,
+        help="Number of frames to run in headless mode (default: until "
+             "game over)")
+
     (OPT, _) = parser.parse_args()
 
     if OPT.player in OPT.exclude:
@@ -435,6 +646,26 @@ def get_options():
     if OPT.level in OPT.exclude:
         parser.error("Level given with --level then excluded with --not")
 
+    if OPT.replay is not None:
+        if OPT.record is not None:
+            parser.error("Can't --record while playing a --replay")
+        if OPT.seed is not None or OPT.level is not None or \
+                OPT.player is not None or len(OPT.exclude) > 0 or \
+                OPT.frames is not None:
+            parser.error("--replay can't be used with --seed, --level, "
+                         "--player, --not, or --frames")
+        OPT.headless = True
+
+    if OPT.frames is not None and not OPT.headless:
+        parser.error("--frames only works with --headless")
+
+    if OPT.frames is not None and OPT.frames < 0:
+        parser.error("--frames must be >= 0")
+
+    # Replays store the seed in 8 bytes (see Replay)
+    if OPT.seed is not None and not 0 <= OPT.seed < 2**64:
+        parser.error("--seed must be >= 0 and < 2**64")
+
     return OPT
 
 